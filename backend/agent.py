@@ -1,13 +1,19 @@
 """Agent orchestrator.
 
-Provides `run_agents(state)` which sequentially calls all agents in `/agents`
-and returns a combined analysis dictionary.
+Provides `run_agents(state)` which calls all agents in `/agents` and returns
+a combined analysis dictionary. The communication and confidence agents are
+independent and run concurrently; personality runs once both are done.
+With `mode="fused"` (or AGENT_MODE=fused) one LLM call produces all three
+analyses, falling back to the per-agent path if its response is malformed.
 """
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from agents.communication_agent import communication_agent
 from agents.confidence_agent import confidence_agent
 from agents.personality_agent import personality_agent
+from agents.fused_agent import fused_agent
+from llm1.llm_config import AGENT_MODE
 
 # Import evaluation module
 try:
@@ -20,13 +26,15 @@ except ImportError:
     def refine_with_evaluations(*args, **kwargs): return {}
 
 
-def run_agents(state, run_evals: bool = False, refine_outputs: bool = False):
-    """Run communication, confidence, and personality agents in sequence.
+def run_agents(state, run_evals: bool = False, refine_outputs: bool = False, mode: str = None):
+    """Run the communication and confidence agents concurrently, then personality.
 
     Args:
         state (dict): Pipeline output with `transcript` and `audio_features` keys.
         run_evals (bool): Whether to run LangChain evaluations on agent outputs.
         refine_outputs (bool): Whether to refine outputs based on evaluations.
+        mode (str): "separate" (one call per agent) or "fused" (one call for
+              all three). Defaults to AGENT_MODE.
 
     Returns:
         dict: Combined results with keys `communication_analysis`,
@@ -36,11 +44,23 @@ def run_agents(state, run_evals: bool = False, refine_outputs: bool = False):
     """
     try:
         evaluations = {} if run_evals and EVALS_AVAILABLE else None
-        
-        # Communication analysis (needs transcript + audio features)
-        comm_res = communication_agent(state)
+        fused = fused_agent(state) if (mode or AGENT_MODE) == "fused" else None
+
+        if fused is not None:
+            comm_res = {"communication_analysis": fused["communication_analysis"]}
+            conf_res = {"confidence_emotion_analysis": fused["confidence_emotion_analysis"]}
+        else:
+            # Communication (transcript + audio features) and confidence (audio
+            # features only) don't depend on each other: one LLM round trip
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="agent") as pool:
+                comm_future = pool.submit(communication_agent, state)
+                conf_future = pool.submit(confidence_agent, state)
+                comm_res = comm_future.result()
+                conf_res = conf_future.result()
+
         comm = comm_res.get("communication_analysis") if isinstance(comm_res, dict) else None
-        
+        conf = conf_res.get("confidence_emotion_analysis") if isinstance(conf_res, dict) else None
+
         if evaluations is not None and comm:
             evaluations["communication"] = evaluate_agent(
                 comm, "communication",
@@ -48,15 +68,6 @@ def run_agents(state, run_evals: bool = False, refine_outputs: bool = False):
                  "speech_rate": state.get("audio_features", {}).get("speech_rate")}
             )
 
-        # Attach intermediate result for downstream agents
-        state_with_comm = dict(state)
-        if comm is not None:
-            state_with_comm["communication_analysis"] = comm
-
-        # Confidence & emotion analysis
-        conf_res = confidence_agent(state_with_comm)
-        conf = conf_res.get("confidence_emotion_analysis") if isinstance(conf_res, dict) else None
-        
         if evaluations is not None and conf:
             evaluations["confidence"] = evaluate_agent(
                 conf, "confidence",
@@ -64,13 +75,21 @@ def run_agents(state, run_evals: bool = False, refine_outputs: bool = False):
                  "energy_level": state.get("audio_features", {}).get("energy_level")}
             )
 
+        # Attach intermediate results for the personality agent
+        state_with_comm = dict(state)
+        if comm is not None:
+            state_with_comm["communication_analysis"] = comm
+
         # Attach confidence for personality agent
         state_with_comm_conf = dict(state_with_comm)
         if conf is not None:
             state_with_comm_conf["confidence_emotion_analysis"] = conf
 
         # Personality mapping
-        person_res = personality_agent(state_with_comm_conf)
+        if fused is not None:
+            person_res = {"personality_analysis": fused["personality_analysis"]}
+        else:
+            person_res = personality_agent(state_with_comm_conf)
         person = person_res.get("personality_analysis") if isinstance(person_res, dict) else None
         
         if evaluations is not None and person:
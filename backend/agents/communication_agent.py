@@ -37,7 +37,11 @@ def communication_agent(state):
         rag_context=f"EXPERT KNOWLEDGE:\n{rag_context}\n" if rag_context else "",
         transcript=transcript[:500],
         speech_rate=f.get("speech_rate"),
+        articulation_rate=f.get("articulation_rate", "N/A"),
         pause_ratio=f.get("pause_ratio"),
+        pause_count=f.get("pause_count", "N/A"),
+        mid_sentence_pauses=f.get("mid_sentence_pauses", "N/A"),
+        longest_pause=f.get("longest_pause", "N/A"),
         communication_score=score
     )
 
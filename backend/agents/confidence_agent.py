@@ -1,5 +1,6 @@
 from llm_helper import llm
 from llm1.prompt_templates import CONFIDENCE_PROMPT
+from agents.output_cache import cached_agent_output
 from utils.parser import safe_parse
 from utils.feature_scoring import confidence_score
 
@@ -25,21 +26,43 @@ def _get_confidence_context(state):
         return ""
 
 
+def _confidence_inputs(f, score):
+    """The inputs the confidence analysis (and its bucket cache) depends on."""
+    return {
+        "pitch_variance": f.get("pitch_variance"),
+        "energy_level": f.get("energy_level"),
+        "pause_ratio": f.get("pause_ratio"),
+        "confidence_score": score,
+    }
+
+
 def confidence_agent(state):
     f = state.get("audio_features", {})
     score = confidence_score(f)
-    rag_context = _get_confidence_context(state)
+    inputs = _confidence_inputs(f, score)
+
+    def _generate():
+        rag_context = _get_confidence_context(state)
+
+        prompt = CONFIDENCE_PROMPT.format(
+            rag_context=f"EXPERT KNOWLEDGE:\n{rag_context}\n" if rag_context else "",
+            **inputs
+        )
+
+        # Only outputs the provider produced (not the stub) are worth reusing
+        response = llm.invoke_provider(prompt)
+        from_provider = response is not None
+        if not from_provider:
+            response = llm.fallback.invoke(prompt)
 
-    prompt = CONFIDENCE_PROMPT.format(
-        rag_context=f"EXPERT KNOWLEDGE:\n{rag_context}\n" if rag_context else "",
-        pitch_variance=f.get("pitch_variance"),
-        energy_level=f.get("energy_level"),
-        pause_ratio=f.get("pause_ratio"),
-        confidence_score=score
-    )
+        parsed = safe_parse(response)
+        validated = validate_agent_response(parsed, "confidence_agent")
+        cacheable = from_provider and isinstance(validated, dict) and "error" not in validated
+        return validated, cacheable
 
-    response = llm.invoke(prompt)
-    parsed = safe_parse(response)
-    validated = validate_agent_response(parsed, "confidence_agent")
+    result = cached_agent_output("confidence", inputs, _generate)
+    if isinstance(result, dict) and "confidence_score" in result:
+        # Outputs are shared within a bucket; the score is this recording's own
+        result["confidence_score"] = score
 
-    return {"confidence_emotion_analysis": validated}
+    return {"confidence_emotion_analysis": result}
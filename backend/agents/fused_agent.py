@@ -0,0 +1,99 @@
+from llm_helper import llm
+from llm1.prompt_templates import FUSED_AGENT_PROMPT
+from utils.parser import safe_parse
+from utils.feature_scoring import communication_score, confidence_score
+from agents.communication_agent import _get_communication_context
+from agents.confidence_agent import _get_confidence_context, _confidence_inputs
+from agents.output_cache import cached_agent_output
+
+try:
+    from guardrails_config import validate_agent_response
+except ImportError:
+    def validate_agent_response(x, _): return x
+
+
+# Sections of the fused response: result key -> (agent name, required keys),
+# the same keys the single-agent prompts ask for
+FUSED_SCHEMAS = {
+    "communication_analysis": ("communication_agent", (
+        "communication_score", "clarity_level", "fluency_level", "speech_pacing",
+        "key_observations", "communication_strengths", "communication_gaps",
+        "improvement_suggestions",
+    )),
+    "confidence_emotion_analysis": ("confidence_agent", (
+        "confidence_score", "confidence_level", "emotional_tone", "vocal_energy_assessment",
+        "confidence_indicators", "possible_challenges", "confidence_enhancement_tips",
+    )),
+    "personality_analysis": ("personality_agent", (
+        "personality_type", "interaction_style", "professional_presence",
+        "key_personality_traits", "strengths_in_interaction", "growth_opportunities",
+        "overall_summary",
+    )),
+}
+
+
+def fused_agent(state):
+    """
+    Communication, confidence and personality analyses from one LLM call.
+
+    Returns the three sections keyed like `run_agents` results, or None when
+    the response is missing a section or a required key (the caller then
+    falls back to the per-agent path). The confidence section goes through
+    the confidence agent's bucket cache, so both modes share its entries.
+    """
+    transcript = state.get("transcript", "").strip()
+    f = state.get("audio_features", {})
+    comm_score = communication_score(f)
+    conf_score = confidence_score(f)
+
+    rag_context = "\n".join(
+        context for context in (_get_communication_context(state), _get_confidence_context(state))
+        if context
+    )
+
+    prompt = FUSED_AGENT_PROMPT.format(
+        rag_context=f"EXPERT KNOWLEDGE:\n{rag_context}\n" if rag_context else "",
+        transcript=transcript[:500],
+        speech_rate=f.get("speech_rate"),
+        articulation_rate=f.get("articulation_rate", "N/A"),
+        pause_ratio=f.get("pause_ratio"),
+        pause_count=f.get("pause_count", "N/A"),
+        mid_sentence_pauses=f.get("mid_sentence_pauses", "N/A"),
+        longest_pause=f.get("longest_pause", "N/A"),
+        pitch_variance=f.get("pitch_variance"),
+        energy_level=f.get("energy_level"),
+        communication_score=comm_score,
+        confidence_score=conf_score
+    )
+
+    response = llm.invoke_provider(prompt)
+    from_provider = response is not None
+    if not from_provider:
+        response = llm.fallback.invoke(prompt)
+
+    parsed = safe_parse(response)
+    if not isinstance(parsed, dict):
+        return None
+
+    results = {}
+    for section, (agent_name, required) in FUSED_SCHEMAS.items():
+        output = parsed.get(section)
+        if not isinstance(output, dict) or any(key not in output for key in required):
+            return None
+        results[section] = validate_agent_response(output, agent_name)
+
+    # A cached confidence analysis for this bucket wins, as in the per-agent
+    # path; otherwise the fused one is stored for later requests
+    confidence = results["confidence_emotion_analysis"]
+    results["confidence_emotion_analysis"] = cached_agent_output(
+        "confidence", _confidence_inputs(f, conf_score),
+        lambda: (confidence, from_provider and isinstance(confidence, dict) and "error" not in confidence)
+    )
+
+    # The prompt asks the model to echo the computed scores; keep them exact
+    for section, key, score in (("communication_analysis", "communication_score", comm_score),
+                                ("confidence_emotion_analysis", "confidence_score", conf_score)):
+        if isinstance(results[section], dict):
+            results[section][key] = score
+
+    return results
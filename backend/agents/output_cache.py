@@ -0,0 +1,160 @@
+# agents/output_cache.py
+"""
+Feature-bucket cache for agent outputs.
+
+Some agents depend only on a handful of audio metrics; the confidence agent
+sees pitch variance, energy level, pause ratio and the derived confidence
+score. Recordings whose metrics fall in the same buckets get the same
+qualitative assessment, so the stored output of one is reused for the
+others instead of another LLM round trip.
+
+Numeric inputs are quantized to `floor(value / width)`; inputs without a
+width must match exactly. Agents opt in through AGENT_CACHE_AGENTS and
+their bucket spec, e.g.
+
+    AGENT_CACHE_AGENTS=confidence
+    AGENT_CACHE_BUCKETS_CONFIDENCE=pitch_variance:0.05,energy_level,pause_ratio:0.05,confidence_score:5
+
+Only outputs the provider actually produced are stored, never stub or
+parse-failure ones.
+"""
+
+import copy
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from llm1.llm_config import (
+    AGENT_CACHE_AGENTS,
+    AGENT_CACHE_MAX_ENTRIES,
+    AGENT_CACHE_TTL_SEC,
+    agent_cache_buckets,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def parse_buckets(spec):
+    """'a:5,b,c:0.05' -> {"a": 5.0, "b": None, "c": 0.05}"""
+    buckets = {}
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, _, width = entry.partition(":")
+        buckets[name.strip()] = float(width) if width.strip() else None
+    return buckets
+
+
+def quantize(value, width):
+    """Bucket of `value`: its index for numeric widths, the value itself otherwise."""
+    if width is None or isinstance(value, bool):
+        return value
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return value
+    if math.isnan(value):
+        return None
+    return math.floor(value / width)
+
+
+class BucketCache:
+    """LRU of agent outputs keyed by quantized inputs, with TTL and hit statistics."""
+
+    def __init__(self, name, buckets, max_entries=AGENT_CACHE_MAX_ENTRIES, ttl=AGENT_CACHE_TTL_SEC):
+        self.name = name
+        self.buckets = buckets
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._entries = OrderedDict()   # key -> (output, stored_at)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def key(self, inputs):
+        return tuple(quantize(inputs.get(feature), width) for feature, width in self.buckets.items())
+
+    def get(self, inputs):
+        """A copy of the stored output for the bucket of `inputs`, or None."""
+        key = self.key(inputs)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[1] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return copy.deepcopy(entry[0])
+
+    def put(self, inputs, output):
+        key = self.key(inputs)
+        with self._lock:
+            self._entries[key] = (copy.deepcopy(output), time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "buckets": {feature: width for feature, width in self.buckets.items()},
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else None,
+            }
+
+
+def cached_agent_output(agent, inputs, generate):
+    """
+    Output of `agent` for `inputs`, from its bucket cache when possible.
+
+    `generate()` returns `(output, cacheable)`; the output is stored only
+    when `cacheable` is true. Agents that have not opted in always generate.
+    """
+    cache = get_agent_cache(agent)
+    if cache is not None:
+        output = cache.get(inputs)
+        if output is not None:
+            return output
+
+    output, cacheable = generate()
+    if cache is not None and cacheable:
+        cache.put(inputs, output)
+    return output
+
+
+# Singleton caches, one per opted-in agent
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_agent_cache(agent):
+    """The bucket cache of `agent`, or None when it has not opted in."""
+    if agent not in AGENT_CACHE_AGENTS:
+        return None
+    with _caches_lock:
+        if agent not in _caches:
+            buckets = parse_buckets(agent_cache_buckets(agent))
+            if not buckets:
+                logger.warning(f"Agent cache enabled for '{agent}' without a bucket spec; not caching")
+            _caches[agent] = BucketCache(agent, buckets) if buckets else None
+    return _caches[agent]
+
+
+def agent_cache_stats():
+    """Hit statistics of every opted-in agent cache, for /health."""
+    stats = {}
+    for agent in AGENT_CACHE_AGENTS:
+        cache = get_agent_cache(agent)
+        if cache is not None:
+            stats[agent] = cache.stats()
+    return stats
@@ -13,6 +13,12 @@ import traceback
 import logging
 import wave
 import struct
+import json
+
+# Cap library thread pools before numpy / ctranslate2 / torch load
+from thread_budget import get_thread_governor
+
+get_thread_governor().configure_process()
 
 import numpy as np
 
@@ -20,10 +26,16 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 
-from link import run_pipeline
+from link import run_pipeline, run_pipeline_stream, run_pipeline_tiered
+from speech_features import ACOUSTIC_EXTRACTORS
+from llm1.provider import provider_health
+from agents.output_cache import agent_cache_stats
+from speech_to_text import aiter_transcription, TranscriptAccumulator
 
 # Load environment variables
 load_dotenv()
@@ -98,32 +110,103 @@ async def health_check():
         "llm_provider": "nvidia-nim",
         "nvidia_configured": nvidia_configured,
         "model": os.getenv("NVIDIA_MODEL_NAME", "meta/llama-3.1-70b-instruct"),
+        "llm": provider_health(),
+        "agent_cache": agent_cache_stats(),
     }
 
 
+def _save_upload_as_wav(file: UploadFile):
+    """Save an uploaded file and convert it to WAV. Returns (raw_path, wav_path)."""
+    file_ext = os.path.splitext(file.filename or "audio.webm")[1] or ".webm"
+    raw_path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4()}{file_ext}")
+
+    with open(raw_path, "wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+
+    logger.info(f"Audio saved: {raw_path} ({os.path.getsize(raw_path)} bytes)")
+
+    wav_path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4()}.wav")
+    try:
+        convert_to_wav(raw_path, wav_path)
+    except Exception:
+        _cleanup(raw_path, wav_path)
+        raise
+    return raw_path, wav_path
+
+
+def _check_extractor(extractor):
+    if extractor is not None and extractor not in ACOUSTIC_EXTRACTORS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown extractor '{extractor}' (expected one of: {', '.join(ACOUSTIC_EXTRACTORS)})"
+        )
+
+
+def _cleanup(*paths):
+    """Remove temporary files, ignoring ones that are already gone."""
+    for path in paths:
+        if path and os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+@app.post("/transcribe/stream")
+async def transcribe_stream(file: UploadFile = File(...)):
+    """
+    Stream the transcript as newline-delimited JSON while Whisper decodes.
+
+    Emits one `{"type": "segment", ...}` line per decoded segment and a final
+    `{"type": "transcript", ...}` line with the accumulated transcript.
+    """
+    try:
+        raw_path, wav_path = await run_in_threadpool(_save_upload_as_wav, file)
+    except Exception as e:
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
+
+    async def _events():
+        accumulator = TranscriptAccumulator()
+        try:
+            async for event in aiter_transcription(wav_path, accumulator=accumulator):
+                yield json.dumps({
+                    "type": "segment",
+                    "segment": event["segment"],
+                    "words": event["words"].to_list()
+                }) + "\n"
+
+            yield json.dumps({"type": "transcript", **accumulator.to_dict()}) + "\n"
+        except Exception as e:
+            logger.error(traceback.format_exc())
+            yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+        finally:
+            _cleanup(raw_path, wav_path)
+
+    return StreamingResponse(_events(), media_type="application/x-ndjson")
+
+
+# The analysis endpoints are plain `def`: FastAPI runs them in its thread
+# pool, so a request blocked on the pipeline (or waiting for the thread
+# governor's budget) does not stall the event loop.
 @app.post("/analyze")
-async def analyze_audio(file: UploadFile = File(...)):
+def analyze_audio(
+    file: UploadFile = File(...),
+    extractor: str = Query(None, description="Acoustic extractor: opensmile or numpy (fast)"),
+):
     """
     Analyze uploaded audio file for speech and personality insights.
     """
+    _check_extractor(extractor)
     raw_path = None
     wav_path = None
     try:
-        # Save uploaded file with its original extension
-        file_ext = os.path.splitext(file.filename or "audio.webm")[1] or ".webm"
-        raw_path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4()}{file_ext}")
-
-        with open(raw_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        logger.info(f"Audio saved: {raw_path} ({os.path.getsize(raw_path)} bytes)")
-
-        # Always convert to a proper WAV so every pipeline component can read it
-        wav_path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4()}.wav")
-        convert_to_wav(raw_path, wav_path)
+        # Save the upload and convert to a proper WAV so every pipeline
+        # component can read it
+        raw_path, wav_path = _save_upload_as_wav(file)
 
         # Run the analysis pipeline on the converted WAV
-        result = run_pipeline(wav_path)
+        result = run_pipeline(wav_path, extractor=extractor)
         return result
 
     except Exception as e:
@@ -134,9 +217,74 @@ async def analyze_audio(file: UploadFile = File(...)):
 
     finally:
         # Always clean up temporary files
-        for path in (raw_path, wav_path):
-            if path and os.path.exists(path):
-                try:
-                    os.remove(path)
-                except OSError:
-                    pass
+        _cleanup(raw_path, wav_path)
+
+
+@app.post("/analyze/tiered")
+def analyze_audio_tiered(
+    file: UploadFile = File(...),
+    extractor: str = Query(None, description="Acoustic extractor: opensmile or numpy (fast)"),
+):
+    """
+    Two-tier analysis streamed as newline-delimited JSON.
+
+    The first lines are previews (the fast Whisper model's transcript so far
+    and preliminary metrics), the first one after its first segment; the
+    last line is the full analysis from the accurate model. Each line's
+    `tiers` field marks which tier every field came from.
+    """
+    _check_extractor(extractor)
+    try:
+        raw_path, wav_path = _save_upload_as_wav(file)
+    except Exception as e:
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+    def _events():
+        try:
+            for result in run_pipeline_tiered(wav_path, extractor=extractor):
+                yield json.dumps(result, default=str) + "\n"
+        except Exception as e:
+            logger.error("Tiered pipeline failed with exception:")
+            logger.error(traceback.format_exc())
+            yield json.dumps({"error": f"Analysis failed: {str(e)}"}) + "\n"
+        finally:
+            _cleanup(raw_path, wav_path)
+
+    return StreamingResponse(_events(), media_type="application/x-ndjson")
+
+
+@app.post("/analyze/stream")
+def analyze_audio_stream(
+    file: UploadFile = File(...),
+    extractor: str = Query(None, description="Acoustic extractor: opensmile or numpy (fast)"),
+):
+    """
+    Analysis with the final report streamed as newline-delimited JSON.
+
+    Emits one `{"type": "analysis", ...}` line with every result field except
+    the report, then `{"type": "token", "text": ...}` lines as the LLM writes
+    the report, and a final `{"type": "report", "final_report": ..., "truncated": ...}`
+    line with the guardrails-validated report. `truncated` is true when the
+    LLM failed mid-report: the tokens stop short and `final_report` is the
+    fallback report.
+    """
+    _check_extractor(extractor)
+    try:
+        raw_path, wav_path = _save_upload_as_wav(file)
+    except Exception as e:
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+    def _events():
+        try:
+            for event in run_pipeline_stream(wav_path, extractor=extractor):
+                yield json.dumps(event, default=str) + "\n"
+        except Exception as e:
+            logger.error("Streaming pipeline failed with exception:")
+            logger.error(traceback.format_exc())
+            yield json.dumps({"type": "error", "detail": f"Analysis failed: {str(e)}"}) + "\n"
+        finally:
+            _cleanup(raw_path, wav_path)
+
+    return StreamingResponse(_events(), media_type="application/x-ndjson")
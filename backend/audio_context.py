@@ -0,0 +1,83 @@
+# audio_context.py
+"""
+Per-request audio context.
+
+Decodes a recording once and lazily caches everything derived from the raw
+signal (the VAD result, feature vectors, ...) so transcription, feature extraction and
+chunking share one copy instead of each re-reading and re-analysing the file.
+Safe to use from several threads of the same request.
+"""
+
+import threading
+
+from utils.audio_loader import load_audio
+from vad_engine import get_vad_engine
+
+SAMPLE_RATE = 16000
+
+
+class AudioContext:
+    """Shared, lazily-populated view of one recording."""
+
+    def __init__(self, path, sample_rate=SAMPLE_RATE):
+        self.path = path
+        self.sample_rate = sample_rate
+        self._samples = None
+        self._vad = None
+        self._samples_lock = threading.Lock()
+        self._vad_lock = threading.Lock()
+        self._memo = {}
+        self._memo_locks = {}
+        self._memo_guard = threading.Lock()
+
+    @classmethod
+    def of(cls, audio):
+        """Wrap a path in a context; contexts are passed through unchanged."""
+        return audio if isinstance(audio, cls) else cls(audio)
+
+    @classmethod
+    def from_samples(cls, samples, sample_rate=SAMPLE_RATE):
+        """Wrap an already-decoded mono buffer at `sample_rate`."""
+        ctx = cls(None, sample_rate)
+        ctx._samples = samples
+        return ctx
+
+    @property
+    def samples(self):
+        """Mono float32 samples at `sample_rate`, decoded on first access."""
+        with self._samples_lock:
+            if self._samples is None:
+                self._samples, _ = load_audio(self.path, target_sr=self.sample_rate)
+            return self._samples
+
+    def decode(self):
+        """Decode the recording now (samples are otherwise decoded on first access)."""
+        self.samples
+        return self
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.sample_rate
+
+    @property
+    def vad(self):
+        """`VADResult` for the recording, computed once."""
+        with self._vad_lock:
+            if self._vad is None:
+                self._vad = get_vad_engine().analyze(self.samples)
+            return self._vad
+
+    def memo(self, key, compute):
+        """
+        Return the cached value for `key`, computing it with `compute()` on
+        first use. Concurrent callers for the same key wait for one result.
+        """
+        with self._memo_guard:
+            if key in self._memo:
+                return self._memo[key]
+            lock = self._memo_locks.setdefault(key, threading.Lock())
+
+        with lock:
+            if key not in self._memo:
+                self._memo[key] = compute()
+            return self._memo[key]
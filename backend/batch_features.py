@@ -0,0 +1,148 @@
+# batch_features.py
+"""
+Batch Feature Extraction.
+
+Runs `analyze_speech` over many recordings on a process pool. Each worker
+pins its library thread pools to one thread, loads openSMILE and the VAD
+engine (and Whisper, when transcribing) once in its initializer, and then
+processes recordings one after another, so the archive is spread over every
+core without oversubscribing any of them.
+
+Decoded buffers at other sample rates are resampled to 16 kHz in the worker
+(Silero VAD and Whisper expect 16 kHz). Only a bounded window of recordings
+is queued on the pool at a time, so a large archive is not pickled into the
+pool's queue up front. Results are streamed back in completion order:
+
+    for index, result, error in analyze_speech_batch(paths, on_progress=print):
+        ...
+"""
+
+import itertools
+import logging
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from thread_budget import get_thread_governor
+
+logger = logging.getLogger(__name__)
+
+# Per-worker state, set up once by the pool initializer
+_worker_transcribe = False
+
+
+def _init_worker(transcribe):
+    global _worker_transcribe
+    # Before numpy / onnxruntime / ctranslate2 load in this process
+    get_thread_governor().configure_process()
+
+    import speech_features  # noqa: F401  (builds the openSMILE extractor)
+    from vad_engine import get_vad_engine
+
+    get_vad_engine()
+    if transcribe:
+        from speech_to_text import get_whisper_model
+        get_whisper_model(cpu_threads=1)
+    _worker_transcribe = transcribe
+
+
+def _analyze_one(job):
+    """Analyze one path or (samples, sample_rate) buffer."""
+    from audio_context import SAMPLE_RATE, AudioContext
+    from speech_features import analyze_speech
+    from utils.audio_loader import resample_audio
+    from utils.word_segments import WordSegments
+
+    audio, word_segments, extractor = job
+    if isinstance(audio, tuple):
+        samples, sample_rate = audio
+        ctx = AudioContext.from_samples(resample_audio(samples, sample_rate, SAMPLE_RATE), SAMPLE_RATE)
+    else:
+        ctx = AudioContext(audio)
+
+    if word_segments is None:
+        if _worker_transcribe:
+            from speech_to_text import transcribe_audio
+            # Sequential single-threaded decoding: the pool is the parallelism,
+            # so never start a nested parallel-transcription pool per worker
+            word_segments = transcribe_audio(
+                ctx, batched=False, parallel=False, cpu_threads=1, columnar=True
+            )["word_segments"]
+        else:
+            word_segments = WordSegments()
+    else:
+        word_segments = WordSegments.of(word_segments)
+
+    return analyze_speech(ctx, word_segments, extractor)
+
+
+def analyze_speech_batch(items, word_segments=None, workers=None, transcribe=False,
+                         extractor=None, on_progress=None, max_in_flight=None):
+    """
+    Analyze many recordings in parallel, yielding results as they finish.
+
+    Args:
+        items: Audio file paths and/or decoded mono buffers given as
+            (samples, sample_rate) tuples; buffers are resampled to 16 kHz.
+        word_segments: Optional list aligned with `items` of each recording's
+            word timings (`WordSegments` or the list-of-dicts shape). Entries
+            that are None are transcribed when `transcribe` is set, otherwise
+            analysed without words (speech rate 0).
+        workers: Number of worker processes (default: one per thread of the
+            global CPU budget).
+        transcribe: Run Whisper in the workers for recordings without word
+            timings.
+        extractor: Acoustic extractor ("opensmile" or "numpy").
+        on_progress: Called as `on_progress(done, total)` after each recording.
+        max_in_flight: Recordings queued on the pool at once (default: two
+            per worker, enough to keep every worker busy).
+
+    Yields:
+        (index, result, error): `index` into `items`, the `analyze_speech`
+        tuple (None on failure) and the exception (None on success).
+    """
+    items = list(items)
+    if word_segments is None:
+        word_segments = [None] * len(items)
+    if len(word_segments) != len(items):
+        raise ValueError("word_segments must be aligned with items")
+    if not items:
+        return
+
+    workers = min(workers or get_thread_governor().total, len(items))
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        # spawn avoids forking a parent that already runs native thread pools
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(transcribe,),
+    )
+    logger.info(f"Analyzing {len(items)} recordings across {workers} workers")
+
+    jobs = enumerate(zip(items, word_segments))
+    max_in_flight = max(1, max_in_flight or 2 * workers)
+    # Window of submitted recordings, refilled as each one completes
+    pending = {}
+
+    def _submit(count):
+        for i, (audio, words) in itertools.islice(jobs, count):
+            pending[executor.submit(_analyze_one, (audio, words, extractor))] = i
+
+    try:
+        _submit(max_in_flight)
+        done = 0
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index = pending.pop(future)
+                try:
+                    result, error = future.result(), None
+                except Exception as e:
+                    logger.warning(f"Analysis of item {index} failed: {e}")
+                    result, error = None, e
+                _submit(1)
+                done += 1
+                if on_progress is not None:
+                    on_progress(done, len(items))
+                yield index, result, error
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,83 @@
+# benchmarks/acoustic_extractors.py
+"""
+Benchmark the numpy acoustic extractor against openSMILE.
+
+Reports, per recording, the wall time of each extractor (median of several
+runs on an already-decoded buffer) and how far the numpy values are from
+the eGeMAPS ones.
+
+Usage (from backend/):
+    python benchmarks/acoustic_extractors.py temp_audio.webm other.wav --runs 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from thread_budget import get_thread_governor
+
+get_thread_governor().configure_process()
+
+from audio_context import AudioContext
+from speech_features import ACOUSTIC_EXTRACTORS, OPENSMILE_AVAILABLE
+
+FEATURES = ("loudness", "pitch_mean", "pitch_variance", "jitter", "shimmer")
+
+
+def time_extractor(name, samples, sample_rate, runs):
+    """Median wall time and the values of one extractor."""
+    timings = []
+    for _ in range(runs):
+        # Fresh context each run so nothing is served from its memo
+        ctx = AudioContext.from_samples(samples, sample_rate)
+        start = time.perf_counter()
+        values = ACOUSTIC_EXTRACTORS[name](ctx)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)), values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("audio", nargs="*", default=["temp_audio.webm"])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if not OPENSMILE_AVAILABLE:
+        raise SystemExit("openSMILE is not installed; nothing to compare against")
+
+    errors = {f: [] for f in FEATURES}
+    speedups = []
+
+    for path in args.audio:
+        ctx = AudioContext(path)
+        samples, sr = ctx.samples, ctx.sample_rate
+
+        smile_time, reference = time_extractor("opensmile", samples, sr, args.runs)
+        numpy_time, values = time_extractor("numpy", samples, sr, args.runs)
+        speedups.append(smile_time / numpy_time)
+
+        print("\n" + "=" * 60)
+        print(f"🎧 {path} ({ctx.duration:.1f}s)")
+        print("=" * 60)
+        print(f"   openSMILE: {smile_time * 1000:8.1f} ms")
+        print(f"   numpy:     {numpy_time * 1000:8.1f} ms  ({smile_time / numpy_time:.1f}x)")
+        print(f"\n   {'feature':<16}{'openSMILE':>12}{'numpy':>12}{'rel. error':>12}")
+        for feature in FEATURES:
+            ref, val = reference[feature], values[feature]
+            rel = abs(val - ref) / abs(ref) if ref else float("nan")
+            errors[feature].append(rel)
+            print(f"   {feature:<16}{ref:12.4f}{val:12.4f}{rel:12.1%}")
+
+    print("\n" + "=" * 60)
+    print(f"📊 {len(args.audio)} recording(s), median speedup {np.median(speedups):.1f}x")
+    for feature in FEATURES:
+        print(f"   {feature:<16} median rel. error {np.nanmedian(errors[feature]):.1%}")
+
+
+if __name__ == "__main__":
+    main()
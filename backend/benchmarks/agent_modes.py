@@ -0,0 +1,98 @@
+# benchmarks/agent_modes.py
+"""
+Benchmark the per-agent and fused agent modes.
+
+Runs the agents and the final report on a sample state in both modes and
+reports, per mode, the median wall time, the LLM calls made and the input /
+output tokens the provider reported. The response and agent caches are
+disabled so every run reaches the provider.
+
+Without NVIDIA_API_KEY the stub LLM answers: timings then show only the
+orchestration overhead and no provider calls or tokens are reported.
+
+Usage (from backend/):
+    python benchmarks/agent_modes.py --runs 3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Must be set before the LLM modules read their configuration
+os.environ["LLM_CACHE_ENABLED"] = "false"
+os.environ["AGENT_CACHE_AGENTS"] = ""
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from thread_budget import get_thread_governor
+
+get_thread_governor().configure_process()
+
+from agent import run_agents
+from llm1.provider import usage_totals
+from rag.rag_pipeline import rag_enhanced_report
+
+MODES = ("separate", "fused")
+
+SAMPLE_STATE = {
+    "transcript": (
+        "Good morning everyone. Today I want to walk you through our results for "
+        "the quarter, what went well, and, um, where we still need to improve."
+    ),
+    "audio_features": {
+        "speech_rate": 132,
+        "pitch_variance": 21.4,
+        "pause_ratio": 0.17,
+        "energy_level": "medium-high",
+        "articulation_rate": 4.6,
+        "pause_count": 9,
+        "mid_sentence_pauses": 2,
+        "longest_pause": 1.3,
+    },
+}
+
+
+def run_mode(mode, runs):
+    """Median wall time and mean usage per request for one agent mode."""
+    timings = []
+    before = usage_totals()
+    for _ in range(runs):
+        start = time.perf_counter()
+        agent_results = run_agents(SAMPLE_STATE, mode=mode)
+        rag_enhanced_report(agent_results)
+        timings.append(time.perf_counter() - start)
+    after = usage_totals()
+    usage = {key: (after[key] - before[key]) / runs for key in after}
+    return float(np.median(timings)), usage
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    results = {mode: run_mode(mode, args.runs) for mode in MODES}
+
+    print("\n" + "=" * 60)
+    print(f"🧠 Agents + report, {args.runs} run(s) per mode")
+    print("=" * 60)
+    print(f"   {'mode':<10}{'median time':>14}{'LLM calls':>12}{'in tokens':>12}{'out tokens':>12}")
+    for mode, (elapsed, usage) in results.items():
+        print(f"   {mode:<10}{elapsed:13.2f}s{usage['calls']:12.1f}"
+              f"{usage['input_tokens']:12.0f}{usage['output_tokens']:12.0f}")
+
+    if not all(usage["calls"] for _, usage in results.values()):
+        # Stub timings only measure orchestration, not the LLM round trips saved
+        print("\n⚠️  No provider calls were made; set NVIDIA_API_KEY to compare latency")
+        return
+
+    separate, fused = results["separate"][0], results["fused"][0]
+    if fused > 0:
+        print(f"\n📊 fused is {separate / fused:.2f}x the speed of separate")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# feature_stage.py
+"""
+Concurrent Feature Stage.
+
+Whisper transcription, Silero VAD and openSMILE (functionals and the
+frame-level descriptors behind the prosody windows) all read the same decoded
+signal and do not depend on each other, so they run side by side on one
+AudioContext instead of one after another. Each engine spends its time in
+native code (CTranslate2, ONNX Runtime, openSMILE) that releases the GIL,
+so plain threads are enough and the buffer is never copied.
+
+The request reserves its CPU threads from the thread governor (see
+thread_budget.py) and splits them between the stages: openSMILE is
+single-threaded, VAD keeps VAD_THREADS, and Whisper gets the remainder
+(rounded to one of the governor's fixed tiers).
+`analyze_speech` then assembles the metrics from the results cached on the
+context without recomputing anything.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from audio_context import AudioContext
+from speech_config import FEATURE_STAGE_THREADS
+from speech_features import (
+    acoustic_features,
+    analyze_speech,
+    extract_egemaps_lld,
+    resolve_extractor,
+)
+from speech_to_text import transcribe_audio
+from thread_budget import get_thread_governor
+from utils.word_segments import WordSegments
+
+logger = logging.getLogger(__name__)
+
+
+def run_feature_stage(audio_file, transcription=None, thread_budget=FEATURE_STAGE_THREADS,
+                      extractor=None):
+    """
+    Transcribe and extract acoustic features concurrently.
+
+    Args:
+        audio_file: Path to the audio file, or an AudioContext.
+        transcription: Existing `transcribe_audio` result (word timings as a
+            list or columnar); when given only VAD and openSMILE run.
+        thread_budget: CPU threads for the whole stage (0 = this request's
+            share of the global budget at the current concurrency).
+        extractor: Acoustic extractor ("opensmile" or "numpy"); the
+            frame-level descriptors for prosody are only extracted with
+            openSMILE.
+
+    Returns:
+        (transcription, analysis) where `transcription["word_segments"]` is a
+        columnar `WordSegments` and `analysis` is the tuple returned by
+        `analyze_speech`.
+    """
+    ctx = AudioContext.of(audio_file)
+    extractor = resolve_extractor(extractor)
+
+    # Warm-up: decode now so the stages start on the buffer immediately
+    # instead of the first one to touch it decoding while the others wait
+    ctx.decode()
+
+    # The Whisper share is reserved only when this stage runs the transcription
+    with get_thread_governor().request(thread_budget, whisper=transcription is None) as threads, \
+            ThreadPoolExecutor(max_workers=4, thread_name_prefix="feature-stage") as pool:
+        futures = [
+            pool.submit(lambda: ctx.vad),
+            pool.submit(acoustic_features, ctx, extractor),
+        ]
+        if extractor == "opensmile":
+            futures.append(pool.submit(extract_egemaps_lld, ctx))
+        if transcription is None:
+            transcription = pool.submit(
+                transcribe_audio, ctx, cpu_threads=threads["whisper"], columnar=True
+            ).result()
+        for future in futures:
+            future.result()
+
+    logger.info(f"Feature stage done (whisper threads={threads['whisper']}, vad threads={threads['vad']})")
+
+    transcription = {**transcription, "word_segments": WordSegments.of(transcription["word_segments"])}
+    analysis = analyze_speech(ctx, transcription["word_segments"], extractor)
+    return transcription, analysis
@@ -0,0 +1,236 @@
+# feature_store.py
+"""
+Columnar Feature Store.
+
+Appends one row per analysed recording (speech metrics, the eGeMAPS
+functionals vector, VAD / pause statistics and agent scores) to a Parquet
+dataset partitioned by analysis date:
+
+    <FEATURE_STORE_DIR>/date=2026-10-19/part-<uuid>-0.parquet
+
+Rows are buffered and written in batches; a batch that cannot be written
+(a row the schema rejects, a full disk, a permission error) is logged and
+dropped so later batches are not held up by it. Reads go through pyarrow.dataset,
+so column projection, partition pruning and row-group statistics push the
+filter down and cohort queries never touch audio:
+
+    import pyarrow.dataset as ds
+    store = get_feature_store()
+    table = store.read(
+        columns=["recording_id", "speech_rate", "confidence_score"],
+        filter=(ds.field("date") >= "2026-10-01") & (ds.field("confidence_score") < 50),
+    )
+
+Requires pyarrow; disabled when FEATURE_STORE_DIR is unset.
+"""
+
+import atexit
+import logging
+import threading
+import uuid
+from datetime import datetime, timezone
+
+from speech_config import FEATURE_STORE_DIR, FEATURE_STORE_BATCH_SIZE
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# analyze_speech result key -> column name
+METRIC_COLUMNS = {
+    "Speech Duration (sec)": "duration_sec",
+    "speech_rate": "speech_rate",
+    "pause_ratio": "pause_ratio",
+    "Energy (Loudness)": "loudness",
+    "Pitch Mean (semitones)": "pitch_mean",
+    "Pitch Variance": "pitch_variance",
+    "Jitter": "jitter",
+    "Shimmer (dB)": "shimmer",
+    "Total Pause Time (sec)": "total_pause_time",
+}
+
+# pause_analytics.analyze_pauses key -> column name
+PAUSE_COLUMNS = {
+    "pause_count": "pause_count",
+    "mean_pause": "mean_pause",
+    "longest_pause": "longest_pause",
+    "mid_sentence_pauses": "mid_sentence_pauses",
+    "between_sentence_pauses": "between_sentence_pauses",
+    "articulation_rate": "articulation_rate",
+}
+
+
+def _schema():
+    return pa.schema(
+        [
+            ("recording_id", pa.string()),
+            ("analyzed_at", pa.timestamp("ms", tz="UTC")),
+            ("date", pa.string()),
+            ("total_words", pa.int32()),
+            ("energy_level", pa.string()),
+            ("confidence_score", pa.float64()),
+            ("confidence_label", pa.string()),
+            ("vad_segments", pa.int32()),
+            ("speech_time", pa.float64()),
+            ("communication_score", pa.float64()),
+            ("agent_confidence_score", pa.float64()),
+            ("personality_type", pa.string()),
+            ("egemaps", pa.list_(pa.float32())),
+        ]
+        + [(col, pa.float64()) for col in METRIC_COLUMNS.values()]
+        + [(col, pa.int32() if col.endswith(("_count", "_pauses")) else pa.float64())
+           for col in PAUSE_COLUMNS.values()]
+    )
+
+
+def _partitioning():
+    return ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive")
+
+
+def _as_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_text(value):
+    """Text column value; agents sometimes answer with a list or a number."""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(item) for item in value)
+    return str(value)
+
+
+def _agent_field(agent_results, section, key):
+    section = (agent_results or {}).get(section)
+    return section.get(key) if isinstance(section, dict) else None
+
+
+def feature_row(results, confidence_score, confidence_label, egemaps=None, vad=None,
+                pauses=None, agent_results=None, recording_id=None):
+    """
+    Flatten one analysis into a feature-store row.
+
+    Args:
+        results: `analyze_speech` results dict.
+        confidence_score, confidence_label: `analyze_speech` score and label.
+        egemaps: eGeMAPS functionals vector (see speech_features.extract_egemaps).
+        vad: The recording's `VADResult`.
+        pauses: `analyze_pauses` output.
+        agent_results: `run_agents` output.
+        recording_id: Identifier of the recording (random when omitted).
+    """
+    now = datetime.now(timezone.utc)
+    row = {
+        "recording_id": recording_id or uuid.uuid4().hex,
+        "analyzed_at": now,
+        "date": now.strftime("%Y-%m-%d"),
+        "total_words": results.get("Total Words"),
+        "energy_level": _as_text(results.get("energy_level")),
+        "confidence_score": _as_float(confidence_score),
+        "confidence_label": _as_text(confidence_label),
+        "vad_segments": len(vad) if vad is not None else None,
+        "speech_time": vad.speech_time if vad is not None else None,
+        "communication_score": _as_float(
+            _agent_field(agent_results, "communication_analysis", "communication_score")),
+        "agent_confidence_score": _as_float(
+            _agent_field(agent_results, "confidence_emotion_analysis", "confidence_score")),
+        "personality_type": _as_text(
+            _agent_field(agent_results, "personality_analysis", "personality_type")),
+        "egemaps": egemaps.astype("float32").tolist() if egemaps is not None else None,
+    }
+    row.update({col: _as_float(results.get(key)) for key, col in METRIC_COLUMNS.items()})
+    row.update({col: (pauses or {}).get(key) for key, col in PAUSE_COLUMNS.items()})
+    return row
+
+
+class FeatureStore:
+    """Partitioned Parquet dataset of per-recording features."""
+
+    def __init__(self, root, batch_size=FEATURE_STORE_BATCH_SIZE):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for the feature store")
+        self.root = root
+        self.batch_size = batch_size
+        self.schema = _schema()
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def append(self, row):
+        """Buffer one row; the buffer is written once it holds `batch_size` rows."""
+        self.append_many([row])
+
+    def append_many(self, rows):
+        with self._lock:
+            self._buffer.extend(rows)
+            if len(self._buffer) >= self.batch_size:
+                self._write_locked()
+
+    def flush(self):
+        """Write any buffered rows."""
+        with self._lock:
+            self._write_locked()
+
+    def _write_locked(self):
+        if not self._buffer:
+            return
+        # Taken off the buffer before writing: a batch that fails would
+        # otherwise be retried, and fail again, on every later append
+        rows, self._buffer = self._buffer, []
+        try:
+            table = pa.Table.from_pylist(rows, schema=self.schema)
+            ds.write_dataset(
+                table,
+                self.root,
+                format="parquet",
+                partitioning=_partitioning(),
+                basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+                existing_data_behavior="overwrite_or_ignore",
+            )
+        except (pa.ArrowException, OSError) as e:
+            logger.error(f"Feature store: dropped {len(rows)} rows, write failed ({e})")
+            return
+        logger.info(f"Feature store: wrote {len(rows)} rows")
+
+    def dataset(self):
+        """The stored rows as a pyarrow Dataset."""
+        return ds.dataset(self.root, format="parquet", schema=self.schema,
+                          partitioning=_partitioning())
+
+    def read(self, columns=None, filter=None):
+        """
+        Read rows as a pyarrow Table.
+
+        Args:
+            columns: Columns to load (default: all).
+            filter: pyarrow.dataset expression, pushed down to partitions
+                and Parquet row groups.
+        """
+        return self.dataset().to_table(columns=columns, filter=filter)
+
+
+# Singleton instance for easy access
+_store_instance = None
+_store_lock = threading.Lock()
+
+
+def get_feature_store():
+    """Get the shared feature store, or None when disabled or pyarrow is missing."""
+    global _store_instance
+    if not FEATURE_STORE_DIR:
+        return None
+    if not PYARROW_AVAILABLE:
+        logger.warning("FEATURE_STORE_DIR is set but pyarrow is not installed")
+        return None
+    with _store_lock:
+        if _store_instance is None:
+            _store_instance = FeatureStore(FEATURE_STORE_DIR)
+            atexit.register(_store_instance.flush)
+    return _store_instance
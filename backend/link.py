@@ -1,19 +1,47 @@
 # backend/pipeline.py
 
-from speech_to_text import transcribe_audio
-from speech_features import analyze_speech
+import logging
+
+from audio_context import AudioContext
+from speech_to_text import transcribe_tiered
+from feature_stage import run_feature_stage
+from feature_store import feature_row, get_feature_store
+from pause_analytics import analyze_pauses
+from prosody import prosody_windows
+from speech_config import PROSODY_WINDOW_SEC
+from speech_features import extract_egemaps, resolve_extractor
 from agent import run_agents
-from rag.rag_pipeline import rag_enhanced_report
+from rag.rag_pipeline import rag_enhanced_report, rag_enhanced_report_stream
+
+logger = logging.getLogger(__name__)
+
+# Result fields and the transcription tier they were produced from
+RESULT_FIELDS = (
+    "transcript",
+    "speech_metrics",
+    "pause_structure",
+    "prosody",
+    "confidence_score",
+    "confidence_label",
+    "agent_results",
+    "final_report",
+)
 
-def run_pipeline(audio_file: str):
-    # STEP 3: Speech-to-text
-    data = transcribe_audio(audio_file)
 
-    # STEP 4: Feature extraction
-    results, score, label, wpm, avg_pause = analyze_speech(
-        audio_file,
-        data["word_segments"]
+def analyze_recording(audio_file, transcription: dict = None, extractor: str = None):
+    """Every result field except the final report (steps 1-4)."""
+    # Decode once; the VAD result is computed once and shared by stages
+    ctx = AudioContext.of(audio_file)
+    extractor = resolve_extractor(extractor)
+
+    # STEP 3 + 4: Speech-to-text (skipped if a transcription is supplied),
+    # VAD and openSMILE run concurrently on the shared buffer
+    data, (results, score, label, wpm, avg_pause) = run_feature_stage(
+        ctx,
+        transcription,
+        extractor=extractor
     )
+    pauses = analyze_pauses(ctx, data["word_segments"])
 
     pipeline_state = {
         "transcript": data["transcript"],
@@ -22,20 +50,96 @@ def run_pipeline(audio_file: str):
             "pitch_variance": results.get("Pitch Variance"),
             "pause_ratio": results.get("pause_ratio"),
             "energy_level": results.get("energy_level"),
+            "articulation_rate": pauses["articulation_rate"],
+            "pause_count": pauses["pause_count"],
+            "mid_sentence_pauses": pauses["mid_sentence_pauses"],
+            "longest_pause": pauses["longest_pause"],
         }
     }
 
     # STEP 4: Agents
     agent_results = run_agents(pipeline_state)
 
-    # STEP 5: Final report (RAG + LLM)
-    final_report = rag_enhanced_report(agent_results)
+    store = get_feature_store()
+    if store is not None:
+        # The feature store is a side channel: never fail the analysis over it
+        try:
+            store.append(feature_row(
+                results, score, label,
+                egemaps=extract_egemaps(ctx) if extractor == "opensmile" else None,
+                vad=ctx.vad,
+                pauses=pauses,
+                agent_results=agent_results,
+            ))
+        except Exception as e:
+            logger.warning(f"Feature store append failed ({e}), result not stored")
 
     return {
         "transcript": data["transcript"],
         "speech_metrics": results,
+        "pause_structure": pauses,
+        # Prosody windows need openSMILE's frame-level descriptors
+        "prosody": (
+            prosody_windows(ctx, PROSODY_WINDOW_SEC).to_dict()
+            if extractor == "opensmile" else None
+        ),
         "confidence_score": score,
         "confidence_label": label,
         "agent_results": agent_results,
-        "final_report": final_report
     }
+
+
+def run_pipeline(audio_file, transcription: dict = None, extractor: str = None):
+    result = analyze_recording(audio_file, transcription, extractor)
+
+    # STEP 5: Final report (RAG + LLM)
+    result["final_report"] = rag_enhanced_report(result["agent_results"])
+    return result
+
+
+def run_pipeline_stream(audio_file, extractor: str = None):
+    """
+    Pipeline with a streamed report: yields `{"type": "analysis", ...}` with
+    every field but the report, then the report's `token` events and a final
+    `report` event carrying the validated `final_report`.
+    """
+    result = analyze_recording(audio_file, extractor=extractor)
+    yield {"type": "analysis", **result}
+    yield from rag_enhanced_report_stream(result["agent_results"])
+
+
+def preview_result(audio_file, preview: dict) -> dict:
+    """Build a preliminary result from the preview-tier transcript."""
+    duration_sec = AudioContext.of(audio_file).duration
+    total_words = len(preview["word_segments"])
+    wpm = round((total_words / duration_sec) * 60, 2) if duration_sec > 0 else 0
+
+    return {
+        "transcript": preview["transcript"],
+        "speech_metrics": {
+            "speech_rate": round(wpm),
+            "Speech Duration (sec)": round(duration_sec, 2),
+            "Total Words": total_words
+        },
+        "tiers": {
+            "transcript": "preview",
+            "speech_metrics": "preview"
+        }
+    }
+
+
+def run_pipeline_tiered(audio_file: str, extractor: str = None):
+    """
+    Two-tier pipeline: yields preview results from the fast Whisper model as
+    its transcript grows (the first after its first segment), then the full
+    result based on the accurate model.
+    Each result's `tiers` maps its fields to the tier they came from.
+    """
+    ctx = AudioContext.of(audio_file)
+    for tier, data in transcribe_tiered(ctx):
+        if tier == "preview":
+            yield preview_result(ctx, data)
+        else:
+            result = run_pipeline(ctx, transcription=data, extractor=extractor)
+            result["tiers"] = {field: "final" for field in RESULT_FIELDS}
+            yield result
@@ -1,11 +1,12 @@
 """LLM wrapper used by agents.
 
-Uses NVIDIA NIM API (meta/llama-3.1-70b-instruct) via langchain-nvidia-ai-endpoints.
+Uses NVIDIA NIM API (meta/llama-3.1-70b-instruct) through the shared
+provider in `llm1/provider.py`.
 Falls back to a deterministic stub for testing when the API is unavailable.
 """
 import json
 
-from llm1.llm_config import LLM_MODEL_NAME, TEMPERATURE, MAX_TOKENS, NVIDIA_API_KEY, NVIDIA_BASE_URL
+from llm1.provider import ProviderLLM
 
 
 class _StubLLM:
@@ -13,6 +14,13 @@ class _StubLLM:
 
     def invoke(self, prompt: str) -> str:
         p = prompt.lower() if prompt else ""
+        if "combined speech analysis engine" in p:
+            # Fused agent prompt: the three single-agent stubs together
+            return json.dumps({
+                "communication_analysis": json.loads(self.invoke("senior communication skills analyst")),
+                "confidence_emotion_analysis": json.loads(self.invoke("confidence emotion")),
+                "personality_analysis": json.loads(self.invoke("personality")),
+            })
         if "communication analysis ai agent" in p or "senior communication skills analyst" in p:
             resp = {
                 "communication_score": 85,
@@ -64,55 +72,5 @@ class _StubLLM:
         return json.dumps(resp)
 
 
-class _LazyNvidiaLLM:
-    """Lazy-loading wrapper that uses NVIDIA NIM API, falls back to stub."""
-
-    def __init__(self):
-        self._llm = None
-        self._initialized = False
-
-    def _get_llm(self):
-        if not self._initialized:
-            self._initialized = True
-
-            if not NVIDIA_API_KEY:
-                print("[WARNING] NVIDIA_API_KEY not set. Using stub LLM.")
-                print("   Get your free key at: https://build.nvidia.com/")
-                print("   Then set it in backend/.env file")
-                self._llm = _StubLLM()
-                return self._llm
-
-            try:
-                from langchain_nvidia_ai_endpoints import ChatNVIDIA
-
-                self._llm = ChatNVIDIA(
-                    model=LLM_MODEL_NAME,
-                    nvidia_api_key=NVIDIA_API_KEY,
-                    base_url=NVIDIA_BASE_URL,
-                    temperature=TEMPERATURE,
-                    max_tokens=MAX_TOKENS,
-                )
-
-                # Test connection
-                test_response = self._llm.invoke("Say ok in one word.")
-                if hasattr(test_response, "content"):
-                    _ = test_response.content
-                print(f"[OK] NVIDIA NIM ({LLM_MODEL_NAME}) connected successfully")
-
-            except Exception as e:
-                print(f"[WARNING] NVIDIA API not available ({e}), using stub LLM")
-                self._llm = _StubLLM()
-
-        return self._llm
-
-    def invoke(self, prompt: str) -> str:
-        llm = self._get_llm()
-        response = llm.invoke(prompt)
-        # ChatNVIDIA returns AIMessage — extract text content
-        if hasattr(response, "content"):
-            return response.content
-        return str(response)
-
-
-# Export lazy-loading LLM instance
-llm = _LazyNvidiaLLM()
\ No newline at end of file
+# Export the shared provider with the agent stub as fallback
+llm = ProviderLLM(fallback=_StubLLM())
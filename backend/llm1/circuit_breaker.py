@@ -0,0 +1,203 @@
+# llm1/circuit_breaker.py
+"""
+Circuit breaker and background health monitor for the LLM provider.
+
+The breaker watches the outcome and latency of the most recent LLM calls.
+When too many of them fail or are too slow, it opens and calls are answered
+by the fallback at once instead of each waiting for a timeout. After
+LLM_BREAKER_OPEN_SEC one trial call is let through (half-open). Meanwhile
+the health monitor probes the provider from a background thread, and the
+first success closes the breaker again. Only the trial call and the probes
+move the breaker out of open / half-open; late results of calls admitted
+before a state change are ignored.
+
+    closed ──(error rate ≥ threshold)──▶ open ──(cool-down)──▶ half-open
+      ▲                                    ▲                       │
+      └────────(trial / probe succeeds)────┴───(trial fails)───────┘
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+
+from llm1.llm_config import (
+    LLM_BREAKER_WINDOW,
+    LLM_BREAKER_MIN_CALLS,
+    LLM_BREAKER_ERROR_RATE,
+    LLM_BREAKER_OPEN_SEC,
+    LLM_SLOW_CALL_SEC,
+    LLM_HEALTH_INTERVAL_SEC,
+)
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class Ticket:
+    """Admission for one provider call, handed back to `CircuitBreaker.record`."""
+
+    __slots__ = ("generation", "trial")
+
+    def __init__(self, generation, trial):
+        self.generation = generation
+        self.trial = trial
+
+
+class CircuitBreaker:
+    """Rolling-window error-rate breaker; calls slower than `slow_call_sec` count as failures."""
+
+    def __init__(self, window=LLM_BREAKER_WINDOW, min_calls=LLM_BREAKER_MIN_CALLS,
+                 error_rate=LLM_BREAKER_ERROR_RATE, open_sec=LLM_BREAKER_OPEN_SEC,
+                 slow_call_sec=LLM_SLOW_CALL_SEC):
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate
+        self.open_sec = open_sec
+        self.slow_call_sec = slow_call_sec
+
+        self._calls = deque(maxlen=window)   # (ok, latency_sec)
+        self._state = CLOSED
+        self._opened_at = None
+        self._trial_in_flight = False
+        # Bumped on every state change; results of calls admitted under an
+        # older generation are stale and ignored
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        return self._state
+
+    def allow(self):
+        """
+        A `Ticket` if a call may go to the provider now, else None. Pass the
+        ticket to `record` with the call's outcome.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return Ticket(self._generation, trial=False)
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_sec:
+                self._state = HALF_OPEN
+                self._generation += 1
+            if self._state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return Ticket(self._generation, trial=True)
+            return None
+
+    def record(self, ticket, ok, latency=0.0):
+        """Record the outcome of a call admitted with `ticket`."""
+        ok = ok and latency <= self.slow_call_sec
+        with self._lock:
+            if ticket.generation != self._generation:
+                # Admitted before the last state change (e.g. a slow call
+                # from before the breaker opened): it says nothing now
+                return
+
+            if ticket.trial:
+                self._trial_in_flight = False
+                if ok:
+                    self._close_locked()
+                else:
+                    self._open_locked()
+                return
+
+            self._calls.append((ok, latency))
+            if len(self._calls) >= self.min_calls and self._error_rate_locked() >= self.error_rate_threshold:
+                self._open_locked()
+
+    def record_probe(self, ok, latency=0.0):
+        """Record a health-probe outcome; only matters while the breaker is not closed."""
+        ok = ok and latency <= self.slow_call_sec
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            self._trial_in_flight = False
+            if ok:
+                self._close_locked()
+            else:
+                self._open_locked()
+
+    def _error_rate_locked(self):
+        if not self._calls:
+            return 0.0
+        return sum(1 for ok, _ in self._calls if not ok) / len(self._calls)
+
+    def _open_locked(self):
+        if self._state != OPEN:
+            logger.warning(f"LLM circuit breaker opened (error rate {self._error_rate_locked():.0%})")
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._generation += 1
+
+    def _close_locked(self):
+        logger.info("LLM circuit breaker closed, provider recovered")
+        self._state = CLOSED
+        self._opened_at = None
+        self._calls.clear()
+        self._generation += 1
+
+    def snapshot(self):
+        """State and recent statistics, for /health."""
+        with self._lock:
+            latencies = sorted(latency for ok, latency in self._calls if ok)
+            return {
+                "state": self._state,
+                "recent_calls": len(self._calls),
+                "error_rate": round(self._error_rate_locked(), 3),
+                "p50_latency_sec": round(latencies[len(latencies) // 2], 3) if latencies else None,
+                "open_for_sec": (
+                    round(time.monotonic() - self._opened_at, 1) if self._opened_at is not None else None
+                ),
+            }
+
+
+class HealthMonitor:
+    """Daemon thread that probes the provider while the breaker is not closed."""
+
+    def __init__(self, breaker, probe, interval=LLM_HEALTH_INTERVAL_SEC):
+        self.breaker = breaker
+        self.probe = probe
+        self.interval = interval
+        self.last_probe = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="llm-health", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if self.breaker.state == CLOSED:
+                continue
+            start = time.monotonic()
+            try:
+                self.probe()
+                ok = True
+            except Exception as e:
+                logger.info(f"LLM health probe failed: {e}")
+                ok = False
+            latency = time.monotonic() - start
+            self.last_probe = {"ok": ok, "latency_sec": round(latency, 3), "at": time.time()}
+            self.breaker.record_probe(ok, latency)
+
+
+# Singleton instances for easy access
+_breaker_instance = None
+_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker():
+    """Get or create the breaker guarding the shared LLM provider."""
+    global _breaker_instance
+    with _breaker_lock:
+        if _breaker_instance is None:
+            _breaker_instance = CircuitBreaker()
+    return _breaker_instance
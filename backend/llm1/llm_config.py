@@ -23,3 +23,53 @@ MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "1024"))
 
 # NVIDIA NIM base URL
 NVIDIA_BASE_URL = "https://integrate.api.nvidia.com/v1"
+
+# Keep-alive HTTP connections shared by all concurrent LLM calls
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "10"))
+
+# Circuit breaker: open when at least LLM_BREAKER_ERROR_RATE of the last
+# LLM_BREAKER_WINDOW calls (and at least LLM_BREAKER_MIN_CALLS) failed or
+# took longer than LLM_SLOW_CALL_SEC; retry after LLM_BREAKER_OPEN_SEC.
+LLM_BREAKER_WINDOW = int(os.getenv("LLM_BREAKER_WINDOW", "20"))
+LLM_BREAKER_MIN_CALLS = int(os.getenv("LLM_BREAKER_MIN_CALLS", "5"))
+LLM_BREAKER_ERROR_RATE = float(os.getenv("LLM_BREAKER_ERROR_RATE", "0.5"))
+LLM_BREAKER_OPEN_SEC = float(os.getenv("LLM_BREAKER_OPEN_SEC", "30"))
+LLM_SLOW_CALL_SEC = float(os.getenv("LLM_SLOW_CALL_SEC", "30"))
+
+# Background provider probes while the breaker is open (seconds)
+LLM_HEALTH_INTERVAL_SEC = float(os.getenv("LLM_HEALTH_INTERVAL_SEC", "15"))
+
+# Exact-match response cache (memory LRU + SQLite, entries expire after TTL)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), ".cache", "llm_responses.sqlite3")
+)
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_MB", "64")) * 1024 * 1024
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "512"))
+LLM_CACHE_TTL_SEC = float(os.getenv("LLM_CACHE_TTL_SEC", "86400"))
+
+# Feature-bucket cache for agent outputs (opt-in per agent): agents listed in
+# AGENT_CACHE_AGENTS reuse a stored output when their inputs fall in the same
+# buckets. Widths are on the inputs' own scales; pitch_variance is eGeMAPS'
+# normalised F0 standard deviation (typically 0.05-0.5).
+# AGENT_CACHE_BUCKETS_<AGENT> lists "feature:width" (numeric) or "feature"
+# (exact match) entries.
+AGENT_CACHE_AGENTS = [
+    name.strip() for name in os.getenv("AGENT_CACHE_AGENTS", "").split(",") if name.strip()
+]
+AGENT_CACHE_DEFAULT_BUCKETS = {
+    "confidence": "pitch_variance:0.05,energy_level,pause_ratio:0.05,confidence_score:5",
+}
+AGENT_CACHE_MAX_ENTRIES = int(os.getenv("AGENT_CACHE_MAX_ENTRIES", "1024"))
+AGENT_CACHE_TTL_SEC = float(os.getenv("AGENT_CACHE_TTL_SEC", "86400"))
+
+
+def agent_cache_buckets(agent):
+    """Bucket spec string for `agent` (env override or default), or ""."""
+    return os.getenv(f"AGENT_CACHE_BUCKETS_{agent.upper()}", AGENT_CACHE_DEFAULT_BUCKETS.get(agent, ""))
+
+
+# Agent orchestration: "separate" (one LLM call per agent) or "fused" (one
+# call returning all three analyses, per-agent fallback on malformed output)
+AGENT_MODE = os.getenv("AGENT_MODE", "separate").lower()
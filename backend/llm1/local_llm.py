@@ -2,11 +2,11 @@
 """
 LLM provider for report generation.
 
-Returns a NVIDIA NIM LLM instance via langchain-nvidia-ai-endpoints.
+Returns the shared NVIDIA NIM LLM instance (see llm1/provider.py).
 Falls back to stub if the API is unavailable.
 """
 
-from llm1.llm_config import LLM_MODEL_NAME, TEMPERATURE, MAX_TOKENS, NVIDIA_API_KEY, NVIDIA_BASE_URL
+from llm1.provider import ProviderLLM, get_chat_model
 
 
 class _StubLLM:
@@ -30,34 +30,14 @@ class _StubLLM:
 
 def get_llm():
     """
-    Returns a NVIDIA NIM LLM instance (meta/llama-3.1-70b-instruct).
-    Falls back to stub if the API key is not configured or connection fails.
+    Returns the shared NVIDIA NIM LLM instance (meta/llama-3.1-70b-instruct).
+    Falls back to stub if the API key is not configured or the client fails.
     """
-    if not NVIDIA_API_KEY:
-        print("⚠️  NVIDIA_API_KEY not set. Using stub LLM for report generation.")
-        print("   Get your free key at: https://build.nvidia.com/")
+    model = get_chat_model()
+    if model is None:
         return _StubLLM()
+    return model
 
-    try:
-        from langchain_nvidia_ai_endpoints import ChatNVIDIA
 
-        llm = ChatNVIDIA(
-            model=LLM_MODEL_NAME,
-            nvidia_api_key=NVIDIA_API_KEY,
-            base_url=NVIDIA_BASE_URL,
-            temperature=TEMPERATURE,
-            max_tokens=MAX_TOKENS,
-        )
-
-        # Quick test to verify the API key works
-        test_response = llm.invoke("Say ok in one word.")
-        if hasattr(test_response, "content"):
-            _ = test_response.content
-
-        print(f"✅ NVIDIA NIM ({LLM_MODEL_NAME}) ready for report generation")
-        return llm
-
-    except Exception as e:
-        print(f"⚠️  NVIDIA API not available: {e}")
-        print("   Using stub LLM for testing...")
-        return _StubLLM()
+# Text interface for report generation, answering with the stub on failure
+report_llm = ProviderLLM(fallback=_StubLLM())
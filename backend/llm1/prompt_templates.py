@@ -21,7 +21,9 @@ Transcript:
 \"\"\"{transcript}\"\"\"
 
 Speech Rate: {speech_rate}
+Articulation Rate (excluding pauses): {articulation_rate}
 Pause Ratio: {pause_ratio}
+Pauses: {pause_count} ({mid_sentence_pauses} mid-sentence, longest {longest_pause}s)
 Computed Communication Score (0–100): {communication_score}
 
 Interpret this score alongside qualitative observations.
@@ -91,6 +93,66 @@ OUTPUT JSON ONLY:
 }}
 """
 
+# ==============================
+# FUSED AGENT PROMPT
+# ==============================
+
+# All three analyses in one call (AGENT_MODE=fused); each section follows
+# the schema of the matching single-agent prompt above.
+FUSED_AGENT_PROMPT = """
+You are a combined speech analysis engine: a communication skills analyst,
+a voice confidence analyst and a personality insight engine in one.
+
+{rag_context}
+
+Transcript:
+\"\"\"{transcript}\"\"\"
+
+Speech Rate: {speech_rate}
+Articulation Rate (excluding pauses): {articulation_rate}
+Pause Ratio: {pause_ratio}
+Pauses: {pause_count} ({mid_sentence_pauses} mid-sentence, longest {longest_pause}s)
+Pitch Variance: {pitch_variance}
+Energy Level: {energy_level}
+Computed Communication Score (0–100): {communication_score}
+Computed Confidence Score (0–100): {confidence_score}
+
+Use the scores to guide the level classifications. Derive the personality
+analysis from your communication and confidence analyses.
+
+OUTPUT JSON ONLY:
+{{
+  "communication_analysis": {{
+    "communication_score": {communication_score},
+    "clarity_level": "Low | Medium | High",
+    "fluency_level": "Low | Medium | High",
+    "speech_pacing": "Too Slow | Balanced | Too Fast",
+    "key_observations": ["Observation 1", "Observation 2"],
+    "communication_strengths": ["Strength 1", "Strength 2"],
+    "communication_gaps": ["Gap 1", "Gap 2"],
+    "improvement_suggestions": ["Suggestion 1", "Suggestion 2"]
+  }},
+  "confidence_emotion_analysis": {{
+    "confidence_score": {confidence_score},
+    "confidence_level": "Low | Medium | High",
+    "emotional_tone": "Neutral | Positive | Nervous | Assertive",
+    "vocal_energy_assessment": "Low | Moderate | High",
+    "confidence_indicators": ["Indicator 1", "Indicator 2"],
+    "possible_challenges": ["Challenge 1", "Challenge 2"],
+    "confidence_enhancement_tips": ["Tip 1", "Tip 2"]
+  }},
+  "personality_analysis": {{
+    "personality_type": "Introvert | Ambivert | Extrovert",
+    "interaction_style": "Reserved | Balanced | Expressive",
+    "professional_presence": "Developing | Competent | Strong",
+    "key_personality_traits": ["Trait 1", "Trait 2"],
+    "strengths_in_interaction": ["Strength 1", "Strength 2"],
+    "growth_opportunities": ["Opportunity 1", "Opportunity 2"],
+    "overall_summary": "Professional summary."
+  }}
+}}
+"""
+
 # Final Report Prompt
 REPORT_PROMPT = """You are an AI Communication Coach generating a personalized report.
 
@@ -0,0 +1,294 @@
+# llm1/provider.py
+"""
+Shared LLM provider.
+
+One ChatNVIDIA client per thread (agents, report generation, evaluations
+and refinement reuse their thread's client), created lazily on first use
+without a test call. Clients are not shared between threads because the
+client keeps per-request state (`last_inputs`, `last_response`) between
+building a request and posting it. All clients send their HTTP requests
+through a single pooled requests.Session, so consecutive calls reuse
+keep-alive connections instead of paying a TCP + TLS handshake each time.
+
+`get_chat_model()` returns the raw LangChain model (needed by LangChain's
+evaluator chains); `ProviderLLM` wraps it with a plain text `invoke` that
+falls back to a stub when the provider is unavailable. `ProviderLLM` calls
+pass through a circuit breaker (see llm1/circuit_breaker.py), so while the
+provider is down they are answered by the fallback immediately, and
+through the response cache (see llm1/response_cache.py), so a prompt seen
+before is answered without a provider call.
+"""
+
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from llm1.circuit_breaker import HealthMonitor, get_circuit_breaker
+from llm1.llm_config import (
+    LLM_MODEL_NAME,
+    TEMPERATURE,
+    MAX_TOKENS,
+    NVIDIA_API_KEY,
+    NVIDIA_BASE_URL,
+    LLM_POOL_SIZE,
+)
+from llm1.response_cache import get_response_cache, make_response_key
+
+logger = logging.getLogger(__name__)
+
+_available = False
+_initialized = False
+_init_lock = threading.Lock()
+_thread_models = threading.local()
+_session = None
+_session_lock = threading.Lock()
+_health_monitor = None
+
+# Provider calls and token usage since start-up
+_usage = {"calls": 0, "input_tokens": 0, "output_tokens": 0}
+_usage_lock = threading.Lock()
+
+HEALTH_PROBE_PROMPT = "Say ok in one word."
+
+
+def _pooled_session(verify=True):
+    """requests.Session keeping up to LLM_POOL_SIZE keep-alive connections."""
+    session = requests.Session()
+    session.verify = verify
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=LLM_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _shared_session(verify=True):
+    """The process-wide pooled session, created on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _pooled_session(verify)
+        return _session
+
+
+def _share_connections(model):
+    """
+    Route the client's requests through the shared pooled session.
+    ChatNVIDIA otherwise opens a fresh requests.Session per call.
+    """
+    client = getattr(model, "_client", None)
+    if client is None or not hasattr(client, "get_session_fn"):
+        logger.info("ChatNVIDIA client has no session hook; connections are not pooled")
+        return
+    session = _shared_session(verify=getattr(client, "verify_ssl", True))
+    client.get_session_fn = lambda: session
+
+
+def _create_model():
+    from langchain_nvidia_ai_endpoints import ChatNVIDIA
+
+    model = ChatNVIDIA(
+        model=LLM_MODEL_NAME,
+        nvidia_api_key=NVIDIA_API_KEY,
+        base_url=NVIDIA_BASE_URL,
+        temperature=TEMPERATURE,
+        max_tokens=MAX_TOKENS,
+    )
+    _share_connections(model)
+    return model
+
+
+def get_chat_model():
+    """
+    The calling thread's ChatNVIDIA model, or None when NVIDIA_API_KEY is
+    not set or the client cannot be created.
+    """
+    global _available, _initialized
+    with _init_lock:
+        if not _initialized:
+            _initialized = True
+            _available = _init_provider()
+    if not _available:
+        return None
+
+    model = getattr(_thread_models, "model", None)
+    if model is None:
+        model = _thread_models.model = _create_model()
+    return model
+
+
+def _init_provider():
+    """Create the first client (checking the provider can be used at all)."""
+    if not NVIDIA_API_KEY:
+        print("⚠️  NVIDIA_API_KEY not set. Using stub LLM.")
+        print("   Get your free key at: https://build.nvidia.com/")
+        print("   Then set it in backend/.env file")
+        return False
+
+    try:
+        _thread_models.model = _create_model()
+    except Exception as e:
+        print(f"⚠️  NVIDIA client could not be created ({e}), using stub LLM")
+        return False
+
+    _start_health_monitor()
+    print(f"✅ NVIDIA NIM ({LLM_MODEL_NAME}) client ready")
+    return True
+
+
+def _start_health_monitor():
+    global _health_monitor
+    # The probe runs on the monitor's thread, with that thread's client
+    _health_monitor = HealthMonitor(
+        get_circuit_breaker(),
+        probe=lambda: get_chat_model().invoke(HEALTH_PROBE_PROMPT),
+    )
+    _health_monitor.start()
+
+
+def provider_health():
+    """Breaker state, the last background probe and cache hit rates, for /health."""
+    cache = get_response_cache()
+    return {
+        "circuit_breaker": get_circuit_breaker().snapshot(),
+        "last_probe": _health_monitor.last_probe if _health_monitor else None,
+        "response_cache": cache.stats() if cache is not None else None,
+    }
+
+
+def _record_usage(message):
+    """Add one provider response (or final stream chunk) to the usage totals."""
+    usage = getattr(message, "usage_metadata", None) or {}
+    with _usage_lock:
+        _usage["calls"] += 1
+        _usage["input_tokens"] += usage.get("input_tokens", 0)
+        _usage["output_tokens"] += usage.get("output_tokens", 0)
+
+
+def usage_totals():
+    """Provider calls and input / output tokens reported by the provider so far."""
+    with _usage_lock:
+        return dict(_usage)
+
+
+class ProviderLLM:
+    """
+    Text-in / text-out view of the shared model.
+
+    Calls that cannot reach the provider, or arrive while the circuit
+    breaker is open, are answered by `fallback` (an object with
+    `invoke(prompt) -> str`), so callers always get a string.
+    """
+
+    def __init__(self, fallback):
+        self.fallback = fallback
+
+    def invoke(self, prompt: str) -> str:
+        response = self.invoke_provider(prompt)
+        if response is None:
+            return self.fallback.invoke(prompt)
+        return response
+
+    def invoke_provider(self, prompt: str):
+        """The provider's answer to `prompt`, or None when it could not answer."""
+        model = get_chat_model()
+        if model is None:
+            return None
+
+        cache = get_response_cache()
+        try:
+            if cache is None:
+                return self._call(model, prompt)
+            key = make_response_key(LLM_MODEL_NAME, TEMPERATURE, MAX_TOKENS, prompt)
+            return cache.get_or_compute(key, lambda: self._call(model, prompt))
+        except _ProviderUnavailable:
+            # Fallback answers are never cached
+            return None
+
+    def stream(self, prompt: str):
+        """
+        Yield the answer to `prompt` as text chunks while the provider
+        generates it. Cached answers and fallback answers come as one chunk.
+        If the provider fails mid-stream, StreamInterrupted is raised after
+        the chunks sent so far, so the caller can tell the answer is cut
+        short.
+        """
+        model = get_chat_model()
+        if model is None:
+            yield self.fallback.invoke(prompt)
+            return
+
+        cache = get_response_cache()
+        key = make_response_key(LLM_MODEL_NAME, TEMPERATURE, MAX_TOKENS, prompt)
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            yield cached
+            return
+
+        breaker = get_circuit_breaker()
+        ticket = breaker.allow()
+        if ticket is None:
+            yield self.fallback.invoke(prompt)
+            return
+
+        start = time.monotonic()
+        chunks = []
+        last = None
+        failure = None
+        try:
+            for chunk in model.stream(prompt):
+                last = chunk
+                text = chunk.content if hasattr(chunk, "content") else str(chunk)
+                if text:
+                    chunks.append(text)
+                    yield text
+        except Exception as e:
+            failure = e
+        finally:
+            # Also runs on GeneratorExit when the client goes away: the
+            # provider was answering, and a trial ticket must not stay open
+            breaker.record(ticket, failure is None, time.monotonic() - start)
+
+        if failure is not None:
+            if chunks:
+                logger.warning(f"LLM stream failed after {len(chunks)} chunks ({failure})")
+                raise StreamInterrupted(str(failure)) from failure
+            logger.warning(f"LLM stream failed ({failure}), using fallback response")
+            yield self.fallback.invoke(prompt)
+            return
+
+        _record_usage(last)
+        if cache is not None:
+            cache.put(key, "".join(chunks))
+
+    def _call(self, model, prompt):
+        """One provider call through the breaker; raises _ProviderUnavailable."""
+        breaker = get_circuit_breaker()
+        ticket = breaker.allow()
+        if ticket is None:
+            raise _ProviderUnavailable("circuit breaker open")
+
+        start = time.monotonic()
+        try:
+            response = model.invoke(prompt)
+        except Exception as e:
+            breaker.record(ticket, False, time.monotonic() - start)
+            logger.warning(f"LLM call failed ({e}), using fallback response")
+            raise _ProviderUnavailable(str(e)) from e
+        breaker.record(ticket, True, time.monotonic() - start)
+        _record_usage(response)
+
+        # ChatNVIDIA returns AIMessage — extract text content
+        if hasattr(response, "content"):
+            return response.content
+        return str(response)
+
+
+class _ProviderUnavailable(Exception):
+    """The provider could not answer; the caller should use its fallback."""
+
+
+class StreamInterrupted(Exception):
+    """The provider failed part-way through a streamed answer."""
@@ -9,7 +9,7 @@ identical to `rag_enhanced_report()` in rag/rag_pipeline.py.
 Both produce the same output and can be used interchangeably.
 """
 
-from llm1.local_llm import get_llm
+from llm1.local_llm import report_llm
 from llm1.prompt_templates import REPORT_PROMPT
 
 # Import RAG system for context augmentation
@@ -92,7 +92,7 @@ def generate_final_report(agent_outputs: dict):
     Converts agent outputs into a user-friendly AI report.
     Uses RAG to augment the prompt with relevant expert knowledge.
     """
-    llm = get_llm()
+    llm = report_llm
     
     # Get RAG context for augmented generation
     rag_context = _get_rag_context(agent_outputs)
@@ -0,0 +1,270 @@
+# llm1/response_cache.py
+"""
+Exact-match LLM response cache.
+
+Agent prompts are filled with bucketed metrics and deterministic RAG
+context, so identical prompts recur across sessions. Responses are cached
+under a hash of (model, temperature, max tokens, prompt) in two tiers:
+
+- memory: an LRU dict of the most recent responses
+- disk: a SQLite table shared across restarts, LRU-evicted past its byte
+  budget
+
+Entries expire after LLM_CACHE_TTL_SEC. Concurrent requests for the same
+key are single-flighted: one caller queries the provider and the others
+wait for its answer. Failed calls are never cached. Disk-tier errors (a
+locked, full or corrupt database) are logged and the cache carries on as a
+memory-only cache for that call.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from llm1.llm_config import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_PATH,
+    LLM_CACHE_MAX_BYTES,
+    LLM_CACHE_MEMORY_ENTRIES,
+    LLM_CACHE_TTL_SEC,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def make_response_key(model_name, temperature, max_tokens, prompt):
+    """Cache key for one prompt under one model configuration."""
+    raw = f"{model_name}\0{temperature}\0{max_tokens}\0{prompt}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    """A provider call in progress that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResponseCache:
+    """Two-tier (memory + SQLite) response cache with TTL, LRU and single-flight."""
+
+    def __init__(self, path=LLM_CACHE_PATH, max_bytes=LLM_CACHE_MAX_BYTES,
+                 memory_entries=LLM_CACHE_MEMORY_ENTRIES, ttl=LLM_CACHE_TTL_SEC):
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.ttl = ttl
+
+        self._memory = OrderedDict()   # key -> (value, created_at)
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "shared_flights": 0}
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)"
+        )
+        self._conn.commit()
+
+    # ---------------------------
+    # Tiers
+    # ---------------------------
+    def _expired(self, created_at):
+        return time.time() - created_at > self.ttl
+
+    def _memory_get_locked(self, key):
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        if self._expired(entry[1]):
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return entry[0]
+
+    def _memory_put_locked(self, key, value, created_at):
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key):
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self._expired(row[1]):
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+        return row
+
+    def _disk_put(self, key, value, created_at):
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, created_at, created_at)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        self._conn.execute(
+            "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,)
+        )
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+    # ---------------------------
+    # Public API
+    # ---------------------------
+    def get(self, key):
+        """Cached response for `key`, or None."""
+        with self._lock:
+            value = self._memory_get_locked(key)
+            if value is not None:
+                self._stats["memory_hits"] += 1
+                return value
+
+        try:
+            row = self._disk_get(key)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM response cache read failed ({e}), treating as a miss")
+            return None
+        if row is None:
+            return None
+        with self._lock:
+            self._stats["disk_hits"] += 1
+            self._memory_put_locked(key, row[0], row[1])
+        return row[0]
+
+    def put(self, key, value):
+        created_at = time.time()
+        with self._lock:
+            self._memory_put_locked(key, value, created_at)
+        self._store(key, value, created_at)
+
+    def _store(self, key, value, created_at):
+        try:
+            self._disk_put(key, value, created_at)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM response cache write failed ({e}), kept in memory only")
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached response for `key`, or run `compute()` once for all
+        concurrent callers of the same key and cache its result. Exceptions
+        from `compute` propagate to every waiting caller and nothing is cached.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._stats["misses"] += 1
+            else:
+                self._stats["shared_flights"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+            created_at = time.time()
+            with self._lock:
+                self._memory_put_locked(key, flight.value, created_at)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+        # The disk write can fail; the answer is already in hand either way
+        self._store(key, flight.value, created_at)
+        return flight.value
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"] + stats["shared_flights"]
+        hits = lookups - stats["misses"]
+        stats["hit_rate"] = round(hits / lookups, 3) if lookups else None
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        with self._db_lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+# Singleton instance for easy access
+_cache_instance = None
+_cache_failed = False
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """
+    Get or create the LLM response cache, or None if caching is disabled or
+    the cache could not be opened (not retried).
+    """
+    global _cache_instance, _cache_failed
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache_instance is None and not _cache_failed:
+            try:
+                _cache_instance = ResponseCache()
+            except Exception as e:
+                _cache_failed = True
+                logger.warning(f"LLM response cache unavailable ({e}), continuing without it")
+    return _cache_instance
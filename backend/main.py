@@ -9,10 +9,16 @@ warnings.filterwarnings("ignore", category=UserWarning, module="torchaudio")
 warnings.filterwarnings("ignore", message=".*torchaudio.*deprecated.*")
 warnings.filterwarnings("ignore", message=".*sox_effects.*")
 
+# Cap library thread pools before numpy / ctranslate2 / torch load
+from thread_budget import get_thread_governor
+
+get_thread_governor().configure_process()
+
 import soundfile as sf
 import json
 import librosa
 from rag.rag_pipeline import rag_enhanced_report
+from audio_context import AudioContext
 from speech_to_text import transcribe_audio
 from speech_features import analyze_speech
 from agent import run_agents
@@ -73,7 +79,8 @@ def run_pipeline(audio_file=CLEAN_AUDIO):
     print("🔄 STEP 3: SPEECH-TO-TEXT TRANSCRIPTION")
     print("="*50)
 
-    data = transcribe_audio(audio_file)
+    ctx = AudioContext(audio_file)
+    data = transcribe_audio(ctx, columnar=True)
 
     print("\n📝 Transcript:\n")
     print(data["transcript"])
@@ -83,7 +90,7 @@ def run_pipeline(audio_file=CLEAN_AUDIO):
     print("="*50 + "\n")
 
     results, score, label, wpm, avg_pause = analyze_speech(
-        audio_file,
+        ctx,
         data["word_segments"]
     )
 
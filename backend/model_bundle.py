@@ -0,0 +1,246 @@
+# model_bundle.py
+"""
+Offline Model Bundle Manager.
+
+Fetches every model artifact the pipeline needs into one local directory so
+production nodes without outbound network can start deterministically:
+
+    bundle/
+    ├── manifest.json            # sha256 + size of every file
+    ├── whisper/<size>/          # faster-whisper (CTranslate2) models
+    ├── silero-vad/              # torch.hub repo for Silero VAD
+    └── minilm/onnx/             # ChromaDB's all-MiniLM-L6-v2 ONNX embedder
+
+The MiniLM archive is downloaded from ChromaDB's pinned URL and checked
+against its published sha256, so fetching does not depend on ChromaDB's
+private download helpers.
+
+Usage:
+    python model_bundle.py fetch  --dir /opt/models
+    python model_bundle.py verify --dir /opt/models
+
+At runtime set MODEL_BUNDLE_DIR=/opt/models; the loaders below then read only
+from that directory and never touch the network.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import mmap
+import os
+import shutil
+import tarfile
+import tempfile
+import urllib.request
+
+from speech_config import MODEL_BUNDLE_DIR
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+SILERO_REPO = "snakers4/silero-vad"
+
+# ChromaDB's default embedder (ONNXMiniLM_L6_V2) reads <dir>/onnx/
+MINILM_ARCHIVE_URL = "https://chroma-onnx-models.s3.amazonaws.com/all-MiniLM-L6-v2/onnx.tar.gz"
+MINILM_ARCHIVE_SHA256 = "913d7300ceae3b2dbc2c50d1de4baacab4be7b9380491c27fab7418616a16ec3"
+
+if MODEL_BUNDLE_DIR:
+    # Never let HuggingFace / transformers reach out when running from a bundle
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+
+# ---------------------------
+# Verification
+# ---------------------------
+def _sha256(path):
+    """Hash a file through a read-only memory map (no full read into RAM)."""
+    digest = hashlib.sha256()
+    if os.path.getsize(path) == 0:
+        return digest.hexdigest()
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        digest.update(m)
+    return digest.hexdigest()
+
+
+def _bundle_files(bundle_dir):
+    for root, _, files in os.walk(bundle_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, bundle_dir)
+            if rel != MANIFEST_NAME:
+                yield rel.replace(os.sep, "/"), path
+
+
+def write_manifest(bundle_dir):
+    manifest = {
+        rel: {"sha256": _sha256(path), "size": os.path.getsize(path)}
+        for rel, path in sorted(_bundle_files(bundle_dir))
+    }
+    with open(os.path.join(bundle_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def verify_bundle(bundle_dir):
+    """
+    Check every file listed in the manifest.
+
+    Returns:
+        List of problems (empty when the bundle is intact).
+    """
+    manifest_path = os.path.join(bundle_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return [f"missing {MANIFEST_NAME}"]
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    problems = []
+    for rel, entry in manifest.items():
+        path = os.path.join(bundle_dir, rel)
+        if not os.path.exists(path):
+            problems.append(f"missing {rel}")
+        elif os.path.getsize(path) != entry["size"]:
+            problems.append(f"size mismatch {rel}")
+        elif _sha256(path) != entry["sha256"]:
+            problems.append(f"checksum mismatch {rel}")
+    return problems
+
+
+# ---------------------------
+# Fetching
+# ---------------------------
+def fetch_whisper(bundle_dir, sizes):
+    from faster_whisper import download_model
+
+    for size in sizes:
+        print(f"⬇️  Whisper '{size}'")
+        download_model(size, output_dir=os.path.join(bundle_dir, "whisper", size))
+
+
+def fetch_silero(bundle_dir):
+    import torch
+
+    print("⬇️  Silero VAD")
+    target = os.path.join(bundle_dir, "silero-vad")
+    with tempfile.TemporaryDirectory() as hub_dir:
+        previous = torch.hub.get_dir()
+        torch.hub.set_dir(hub_dir)
+        try:
+            torch.hub.load(repo_or_dir=SILERO_REPO, model="silero_vad", trust_repo=True)
+        finally:
+            torch.hub.set_dir(previous)
+
+        repo_dirs = [d for d in os.listdir(hub_dir) if d.startswith("snakers4_silero-vad")]
+        if not repo_dirs:
+            raise RuntimeError("Silero VAD repository was not downloaded")
+        shutil.rmtree(target, ignore_errors=True)
+        shutil.copytree(os.path.join(hub_dir, repo_dirs[0]), target)
+
+
+def _safe_members(tar, target):
+    """Archive members, refusing links and paths that escape `target`."""
+    root = os.path.realpath(target)
+    for member in tar.getmembers():
+        path = os.path.realpath(os.path.join(root, member.name))
+        if not (member.isfile() or member.isdir()) or os.path.commonpath([root, path]) != root:
+            raise RuntimeError(f"Unsafe entry in MiniLM archive: {member.name}")
+        yield member
+
+
+def fetch_minilm(bundle_dir, url=MINILM_ARCHIVE_URL, sha256=MINILM_ARCHIVE_SHA256):
+    print("⬇️  all-MiniLM-L6-v2 (ONNX)")
+    target = os.path.join(bundle_dir, "minilm")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        archive = os.path.join(tmp_dir, "onnx.tar.gz")
+        with urllib.request.urlopen(url) as response, open(archive, "wb") as f:
+            shutil.copyfileobj(response, f)
+        if _sha256(archive) != sha256:
+            raise RuntimeError(f"MiniLM archive checksum mismatch ({url})")
+
+        # The extracted model is all we need at runtime
+        shutil.rmtree(target, ignore_errors=True)
+        os.makedirs(target)
+        with tarfile.open(archive, "r:gz") as tar:
+            tar.extractall(target, members=list(_safe_members(tar, target)))
+
+
+def fetch_bundle(bundle_dir, whisper_sizes):
+    os.makedirs(bundle_dir, exist_ok=True)
+    fetch_whisper(bundle_dir, whisper_sizes)
+    fetch_silero(bundle_dir)
+    fetch_minilm(bundle_dir)
+    manifest = write_manifest(bundle_dir)
+    print(f"✅ Bundle ready: {len(manifest)} files in {bundle_dir}")
+
+
+# ---------------------------
+# Loaders
+# ---------------------------
+def whisper_model_path(model_size):
+    """Local path of a bundled Whisper model, or the size name when unbundled."""
+    if not MODEL_BUNDLE_DIR:
+        return model_size
+    path = os.path.join(MODEL_BUNDLE_DIR, "whisper", model_size)
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"Whisper '{model_size}' not in bundle {MODEL_BUNDLE_DIR}")
+    return path
+
+
+def load_silero_vad():
+    """Load Silero VAD from the bundle, or from torch.hub when unbundled."""
+    import torch
+
+    if not MODEL_BUNDLE_DIR:
+        return torch.hub.load(repo_or_dir=SILERO_REPO, model="silero_vad", trust_repo=True)
+
+    path = os.path.join(MODEL_BUNDLE_DIR, "silero-vad")
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"Silero VAD not in bundle {MODEL_BUNDLE_DIR}")
+    return torch.hub.load(repo_or_dir=path, model="silero_vad", source="local")
+
+
+def get_embedding_function():
+    """
+    ChromaDB embedding function reading MiniLM from the bundle.
+    Returns None when unbundled so ChromaDB uses its default (downloading) one.
+    """
+    if not MODEL_BUNDLE_DIR:
+        return None
+
+    from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+    path = os.path.join(MODEL_BUNDLE_DIR, "minilm")
+    if not os.path.isdir(os.path.join(path, "onnx")):
+        raise FileNotFoundError(f"MiniLM not in bundle {MODEL_BUNDLE_DIR}")
+
+    # DOWNLOAD_PATH is where the embedder looks for (and would download) the model
+    embedder = ONNXMiniLM_L6_V2()
+    embedder.DOWNLOAD_PATH = path
+    return embedder
+
+
+if __name__ == "__main__":
+    from speech_config import WHISPER_MODEL_SIZE, WHISPER_PREVIEW_MODEL_SIZE
+
+    parser = argparse.ArgumentParser(description="Manage the offline model bundle")
+    parser.add_argument("command", choices=["fetch", "verify"])
+    parser.add_argument("--dir", default=MODEL_BUNDLE_DIR or "models",
+                        help="Bundle directory (default: $MODEL_BUNDLE_DIR or ./models)")
+    parser.add_argument("--whisper", nargs="+",
+                        default=sorted({WHISPER_MODEL_SIZE, WHISPER_PREVIEW_MODEL_SIZE}),
+                        help="Whisper model sizes to include")
+    args = parser.parse_args()
+
+    if args.command == "fetch":
+        fetch_bundle(args.dir, args.whisper)
+    else:
+        problems = verify_bundle(args.dir)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            raise SystemExit(1)
+        print(f"✅ Bundle {args.dir} verified")
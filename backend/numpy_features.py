@@ -0,0 +1,159 @@
+# numpy_features.py
+"""
+Pure-NumPy Acoustic Extractor.
+
+A fast, dependency-free alternative to openSMILE that produces the acoustic
+values `analyze_speech` reports (loudness, pitch mean / variance, jitter,
+shimmer) on the same scales as the eGeMAPS functionals it replaces:
+
+- loudness: frame-strided RMS, compressed with a power law (Stevens' law,
+  as openSMILE's loudness is) and scaled to eGeMAPS' range
+- pitch: YIN over all frames at once (FFT-based difference function,
+  cumulative-mean normalisation, first dip below the threshold), reported
+  in semitones from 27.5 Hz like F0semitoneFrom27.5Hz
+- jitter / shimmer: relative period and dB peak-amplitude changes between
+  consecutive voiced frames (openSMILE measures them per pitch cycle, so
+  shimmer is rescaled)
+
+Framing and frame energies come from the request's shared SpectralFrontEnd;
+YIN runs one block of frames at a time (autocorrelation included), and every
+step is a whole-array numpy operation over the block with no per-frame
+Python loop. The tracks are registered
+as front-end features ("loudness", "pitch", "acoustic"). See
+benchmarks/acoustic_extractors.py for a comparison against openSMILE.
+"""
+
+import numpy as np
+
+from spectral_frontend import SpectralFrontEnd, register_feature, short_lag_autocorrelation
+
+FRAME_SEC = 0.06      # eGeMAPS pitch frame
+F0_MIN = 55.0
+F0_MAX = 500.0
+YIN_THRESHOLD = 0.15
+
+# Frames quieter than this fraction of the loudest frame are treated as unvoiced
+VOICING_RMS_RATIO = 0.05
+
+# Map compressed RMS and frame-to-frame shimmer onto openSMILE's scales
+# (calibrated against eGeMAPS on speech; see the benchmark for the residuals)
+LOUDNESS_EXPONENT = 0.3
+LOUDNESS_SCALE = 1.0
+SHIMMER_SCALE = 2.8
+
+
+def _yin(frames, sr):
+    """
+    Vectorized YIN over a block of frames.
+
+    Returns:
+        (f0, aperiodicity): per-frame F0 in Hz (0 where no period is found)
+        and the normalised difference at the chosen lag.
+    """
+    n, w = frames.shape
+    half = w // 2
+    tau_min = int(sr / F0_MAX)
+    tau_max = min(int(sr / F0_MIN), half - 1)
+
+    # d(tau) = E(0..half) + E(tau..tau+half) - 2 r(tau)
+    acf = short_lag_autocorrelation(frames)
+    energy = np.cumsum(np.pad(frames ** 2, ((0, 0), (1, 0))), axis=1)
+    lags = np.arange(half)
+    e_lag = energy[:, lags + half] - energy[:, lags]
+    diff = energy[:, [half]] + e_lag - 2 * acf
+    diff[:, 0] = 0
+
+    # Cumulative mean normalised difference
+    cum = np.cumsum(diff[:, 1:], axis=1)
+    cmnd = np.ones_like(diff)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cmnd[:, 1:] = diff[:, 1:] * lags[1:] / cum
+    cmnd = np.nan_to_num(cmnd, nan=1.0, posinf=1.0)
+
+    search = cmnd[:, tau_min:tau_max]
+    below = search < YIN_THRESHOLD
+    # First lag under the threshold, then walk to the bottom of that dip
+    first = np.where(below.any(axis=1), below.argmax(axis=1), search.argmin(axis=1))
+    rising = np.diff(search, axis=1, append=np.inf) > 0
+    after = rising & (np.arange(search.shape[1]) >= first[:, None])
+    tau = after.argmax(axis=1)
+
+    rows = np.arange(n)
+    aperiodicity = search[rows, tau]
+
+    # Parabolic interpolation around the minimum
+    t = np.clip(tau, 1, search.shape[1] - 2)
+    a, b, c = search[rows, t - 1], search[rows, t], search[rows, t + 1]
+    denom = a - 2 * b + c
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shift = np.where(np.abs(denom) > 1e-12, 0.5 * (a - c) / denom, 0.0)
+    period = tau_min + t + np.clip(shift, -1, 1)
+
+    f0 = np.where(aperiodicity < YIN_THRESHOLD, sr / period, 0.0)
+    return f0, aperiodicity
+
+
+def _relative_changes(values, voiced):
+    """Changes between consecutive voiced frames (pairs broken by unvoiced frames are dropped)."""
+    pairs = voiced[1:] & voiced[:-1]
+    return values[:-1][pairs], values[1:][pairs]
+
+
+@register_feature("loudness")
+def loudness_track(fe):
+    """Per-frame loudness on openSMILE's loudness_sma3 scale."""
+    return LOUDNESS_SCALE * fe.frame_energy(FRAME_SEC) ** LOUDNESS_EXPONENT
+
+
+@register_feature("pitch")
+def pitch_track(fe):
+    """Per-frame F0 in Hz from YIN, 0 for unvoiced frames."""
+    rms = fe.frame_energy(FRAME_SEC)
+    f0 = np.concatenate([_yin(block, fe.sample_rate)[0] for block in fe.blocks(FRAME_SEC)])
+    voiced = rms > VOICING_RMS_RATIO * (rms.max() if len(rms) else 0)
+    return np.where(voiced, f0, 0.0)
+
+
+@register_feature("acoustic")
+def acoustic_summary(fe):
+    """Recording-level loudness, pitch mean / variance, jitter and shimmer."""
+    loudness = fe.extract("loudness")
+    f0 = fe.extract("pitch")
+    voiced = f0 > 0
+
+    if not voiced.any():
+        pitch_mean = pitch_variance = jitter = shimmer = 0.0
+    else:
+        semitones = 12 * np.log2(f0[voiced] / 27.5)
+        pitch_mean = float(semitones.mean())
+        pitch_variance = float(semitones.std() / pitch_mean) if pitch_mean else 0.0
+
+        periods = np.where(voiced, 1.0 / np.where(voiced, f0, 1.0), 0.0)
+        prev_t, next_t = _relative_changes(periods, voiced)
+        jitter = float(np.mean(np.abs(next_t - prev_t)) / np.mean(periods[voiced])) if len(prev_t) else 0.0
+
+        peaks = fe.frame_peaks(FRAME_SEC)
+        prev_a, next_a = _relative_changes(np.maximum(peaks, 1e-10), voiced)
+        shimmer = float(SHIMMER_SCALE * np.mean(np.abs(20 * np.log10(next_a / prev_a)))) if len(prev_a) else 0.0
+
+    return {
+        "loudness": float(loudness.mean()) if len(loudness) else 0.0,
+        "pitch_mean": pitch_mean,
+        "pitch_variance": pitch_variance,
+        "jitter": jitter,
+        "shimmer": shimmer,
+    }
+
+
+def extract_numpy_features(audio):
+    """
+    Acoustic features of a recording with numpy only.
+
+    Args:
+        audio: Path to the audio file, or an AudioContext.
+
+    Returns:
+        dict with `loudness`, `pitch_mean`, `pitch_variance`, `jitter` and
+        `shimmer`, on the eGeMAPS scales `analyze_speech` expects.
+    """
+    return SpectralFrontEnd.of(audio).extract("acoustic")
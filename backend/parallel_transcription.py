@@ -0,0 +1,163 @@
+# parallel_transcription.py
+"""
+Parallel chunked transcription for long recordings.
+
+The audio is cut at silences chosen from the request's shared VAD speech
+timestamps (see AudioContext.vad), each chunk (padded with a little overlap
+on both sides) is transcribed by a worker in a process pool holding a
+preloaded WhisperModel, and the results are stitched
+back together with global timestamps. Each chunk owns the words whose
+midpoint falls inside its un-padded core, so words heard twice in an overlap
+are kept exactly once.
+"""
+
+import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+# Per-worker model, loaded once by the pool initializer
+_worker_model = None
+_worker_language = None
+
+
+def plan_chunks(speech_timestamps, total_samples, chunk_samples, overlap_samples):
+    """
+    Choose chunk boundaries at silences between VAD speech segments.
+
+    Args:
+        speech_timestamps: Silero-style list of {"start", "end"} sample indices.
+        total_samples: Length of the audio in samples.
+        chunk_samples: Target chunk length in samples.
+        overlap_samples: Padding added on both sides of each chunk.
+
+    Returns:
+        List of (core_start, core_end, pad_start, pad_end) sample indices.
+    """
+    # Candidate cut points: midpoints of the gaps between speech segments
+    cuts = [
+        (prev["end"] + nxt["start"]) // 2
+        for prev, nxt in zip(speech_timestamps, speech_timestamps[1:])
+        if nxt["start"] > prev["end"]
+    ]
+
+    boundaries = [0]
+    while total_samples - boundaries[-1] > chunk_samples * 1.5:
+        target = boundaries[-1] + chunk_samples
+        window = [c for c in cuts if boundaries[-1] + chunk_samples // 2 <= c <= target + chunk_samples // 2]
+        # Cut at the silence nearest the target, or hard-cut if the speaker never pauses
+        boundaries.append(min(window, key=lambda c: abs(c - target)) if window else target)
+    boundaries.append(total_samples)
+
+    return [
+        (start, end, max(0, start - overlap_samples), min(total_samples, end + overlap_samples))
+        for start, end in zip(boundaries, boundaries[1:])
+    ]
+
+
+def _init_worker(model_size, device, compute_type, cpu_threads, language):
+    global _worker_model, _worker_language
+    from faster_whisper import WhisperModel
+
+    _worker_model = WhisperModel(
+        model_size,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads
+    )
+    _worker_language = language
+
+
+def _transcribe_chunk(job):
+    """Transcribe one padded chunk and keep only the words it owns."""
+    samples, pad_start, core_start, core_end, is_last = job
+    offset = pad_start / SAMPLE_RATE
+    core_start_sec = core_start / SAMPLE_RATE
+    core_end_sec = core_end / SAMPLE_RATE
+
+    segments, _ = _worker_model.transcribe(samples, language=_worker_language)
+
+    kept = []
+    for seg in segments:
+        start, end = seg.start + offset, seg.end + offset
+        words = seg.text.strip().split()
+        if not words:
+            continue
+
+        # Even per-word timing, matching TranscriptAccumulator's estimation
+        avg_word_time = (end - start) / len(words)
+        owned = []
+        for i, word in enumerate(words):
+            mid = start + (i + 0.5) * avg_word_time
+            if core_start_sec <= mid and (mid < core_end_sec or is_last):
+                owned.append((word, start + i * avg_word_time))
+
+        if owned:
+            kept.append({
+                "text": " " + " ".join(word for word, _ in owned),
+                "start": owned[0][1],
+                "end": owned[-1][1] + avg_word_time
+            })
+    return kept
+
+
+class ParallelTranscriber:
+    """Process pool of preloaded Whisper models for chunked transcription."""
+
+    def __init__(self, model_size, device, compute_type, language,
+                 workers=None, threads_per_worker=2):
+        cpu_count = os.cpu_count() or 1
+        self.workers = workers or max(1, cpu_count // threads_per_worker)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            # spawn avoids forking a parent that already runs CTranslate2/torch threads
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_size, device, compute_type, threads_per_worker, language),
+        )
+
+    def transcribe(self, audio, speech_timestamps, chunk_sec=60.0, overlap_sec=1.0,
+                   max_in_flight=None):
+        """
+        Transcribe decoded 16 kHz audio, yielding segment objects in order.
+
+        Segments carry `text`, `start` and `end` like faster-whisper's, with
+        timestamps relative to the start of the whole recording. At most
+        `max_in_flight` chunks (default: all workers) are decoded at once, so
+        a request can stay within its share of the CPU thread budget.
+        """
+        chunks = plan_chunks(
+            speech_timestamps,
+            len(audio),
+            int(chunk_sec * SAMPLE_RATE),
+            int(overlap_sec * SAMPLE_RATE)
+        )
+        max_in_flight = min(max_in_flight or self.workers, self.workers)
+        logger.info(f"Transcribing {len(chunks)} chunks across {max_in_flight} workers")
+
+        jobs = (
+            (audio[pad_start:pad_end], pad_start, core_start, core_end, i == len(chunks) - 1)
+            for i, (core_start, core_end, pad_start, pad_end) in enumerate(chunks)
+        )
+        # Sliding window of submitted chunks, consumed in order
+        pending = deque()
+        for job in jobs:
+            pending.append(self._executor.submit(_transcribe_chunk, job))
+            if len(pending) >= max_in_flight:
+                yield from self._segments(pending.popleft())
+        while pending:
+            yield from self._segments(pending.popleft())
+
+    @staticmethod
+    def _segments(future):
+        for seg in future.result():
+            yield SimpleNamespace(**seg)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
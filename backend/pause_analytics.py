@@ -0,0 +1,93 @@
+# pause_analytics.py
+"""
+Pause-Structure Analytics.
+
+Derives pause statistics from the request's shared VAD segments (see
+AudioContext.vad) and the word timings, without another model pass:
+
+- pause count, rate and mean / longest duration
+- a duration histogram
+- mid-sentence vs between-sentence pauses, by locating the word preceding
+  each pause with np.searchsorted and checking its sentence punctuation
+- articulation rate (words per minute of speaking time, pauses excluded)
+
+Everything is computed on numpy arrays and takes a few milliseconds even for
+hour-long recordings.
+"""
+
+import numpy as np
+
+from audio_context import AudioContext
+
+# Silences shorter than this are articulation gaps, not pauses (seconds)
+MIN_PAUSE_SEC = 0.25
+
+# Histogram bin edges (seconds); the last bin is open-ended
+PAUSE_BINS = (0.25, 0.5, 1.0, 2.0, np.inf)
+
+SENTENCE_END_CHARS = ".?!"
+
+
+def _bin_label(lo, hi):
+    return f"{lo:g}s+" if np.isinf(hi) else f"{lo:g}-{hi:g}s"
+
+
+def pause_durations(vad, min_pause=MIN_PAUSE_SEC):
+    """
+    Pauses between consecutive speech segments.
+
+    Leading and trailing silence are not pauses and are excluded.
+
+    Returns:
+        (starts, durations) numpy arrays in seconds.
+    """
+    starts = vad.ends[:-1]
+    durations = vad.starts[1:] - starts
+    keep = durations >= min_pause
+    return starts[keep], durations[keep]
+
+
+def analyze_pauses(audio, word_segments, min_pause=MIN_PAUSE_SEC):
+    """
+    Pause structure of a recording.
+
+    Args:
+        audio: Path to the audio file, or an AudioContext.
+        word_segments: `WordSegments` of the transcript.
+        min_pause: Shortest silence counted as a pause (seconds).
+
+    Returns:
+        dict of pause metrics.
+    """
+    vad = AudioContext.of(audio).vad
+    starts, durations = pause_durations(vad, min_pause)
+
+    counts, _ = np.histogram(durations, bins=PAUSE_BINS)
+    histogram = {
+        _bin_label(lo, hi): int(n)
+        for lo, hi, n in zip(PAUSE_BINS, PAUSE_BINS[1:], counts)
+    }
+
+    # The word spoken last before each pause's midpoint decides its kind
+    mid_sentence = between_sentence = 0
+    if len(word_segments) and len(durations):
+        preceding = word_segments.index_at(starts + durations / 2)
+        ends_sentence = word_segments.ends_with_any(SENTENCE_END_CHARS)
+        has_word = preceding >= 0
+        at_boundary = ends_sentence[preceding[has_word]]
+        between_sentence = int(at_boundary.sum())
+        mid_sentence = int(len(at_boundary) - between_sentence)
+
+    speech_time = vad.speech_time
+    total_words = len(word_segments)
+
+    return {
+        "pause_count": int(len(durations)),
+        "pauses_per_minute": round(len(durations) / vad.duration * 60, 2) if vad.duration > 0 else 0,
+        "mean_pause": round(float(durations.mean()), 2) if len(durations) else 0.0,
+        "longest_pause": round(float(durations.max()), 2) if len(durations) else 0.0,
+        "pause_histogram": histogram,
+        "mid_sentence_pauses": mid_sentence,
+        "between_sentence_pauses": between_sentence,
+        "articulation_rate": round(total_words / speech_time * 60, 2) if speech_time > 0 else 0,
+    }
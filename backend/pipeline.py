@@ -1,5 +1,6 @@
-from speech_to_text import transcribe_audio
-from speech_features import analyze_speech
+from audio_context import AudioContext
+from feature_stage import run_feature_stage
+from thread_budget import get_thread_governor
 
 
 def get_pipeline_output(audio_file):
@@ -8,14 +9,10 @@ def get_pipeline_output(audio_file):
     Returns a dict with `transcript` and `audio_features` keys
     matching the requested format.
     """
-    # Step 1: Transcription
-    transcription_data = transcribe_audio(audio_file)
+    ctx = AudioContext(audio_file)
 
-    # Step 2: Speech Analysis
-    results, score, label, wpm, avg_pause = analyze_speech(
-        audio_file,
-        transcription_data["word_segments"]
-    )
+    # Transcription and speech analysis, run concurrently
+    transcription_data, (results, score, label, wpm, avg_pause) = run_feature_stage(ctx)
 
     # Assemble the output data structure
     data = {
@@ -41,6 +38,7 @@ def get_pipeline_output(audio_file):
 
 
 if __name__ == "__main__":
+    get_thread_governor().configure_process()
     AUDIO_FILE = "clean_audio.wav"
     print("🔄 Starting Speech Analysis Pipeline...\n")
 
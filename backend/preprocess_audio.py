@@ -1,6 +1,9 @@
 import librosa
 import soundfile as sf
 from utils.audio_loader import load_audio
+from audio_context import AudioContext
+from spectral_frontend import SpectralFrontEnd
+from thread_budget import get_thread_governor
 
 INPUT_AUDIO = "raw_audio.wav"
 OUTPUT_AUDIO = "clean_audio.wav"
@@ -12,8 +15,9 @@ def preprocess_audio(input_path, output_path):
     # Normalize volume
     y = librosa.util.normalize(y)
 
-    # Remove silence
-    y_trimmed, _ = librosa.effects.trim(y, top_db=20)
+    # Remove silence (frame energies from the shared spectral front-end)
+    start, end = SpectralFrontEnd.of(AudioContext.from_samples(y, sr)).trim_bounds(top_db=20)
+    y_trimmed = y[start:end]
 
     # Save cleaned audio
     sf.write(output_path, y_trimmed, sr)
@@ -25,4 +29,5 @@ def preprocess_audio(input_path, output_path):
     print(f"Sample Rate: {sr}")
 
 if __name__ == "__main__":
+    get_thread_governor().configure_process()
     preprocess_audio(INPUT_AUDIO, OUTPUT_AUDIO)
@@ -0,0 +1,128 @@
+# prosody.py
+"""
+Windowed Prosody Time-Series.
+
+`analyze_speech` reports whole-recording averages. This module turns the
+openSMILE eGeMAPS low-level descriptors (one frame every 10 ms, extracted
+once per request and cached on the AudioContext) into per-window
+trajectories of loudness, pitch, voice quality and pausing.
+
+Windowing is a reshape of the frame matrix into (windows, frames, features)
+followed by NaN-aware reductions, so any number of window sizes can be
+computed from the same descriptors without re-running the extractor.
+"""
+
+import numpy as np
+
+from audio_context import AudioContext
+from speech_features import extract_egemaps_lld, EGEMAPS_LLD_INDEX
+
+# eGeMAPS LLD frame step (seconds)
+FRAME_STEP = 0.01
+
+# Voiced-only descriptors are 0 in unvoiced frames; treated as missing
+_TRACKS = {
+    "loudness": ("Loudness_sma3", False),
+    "pitch": ("F0semitoneFrom27.5Hz_sma3nz", True),
+    "jitter": ("jitterLocal_sma3nz", True),
+    "shimmer": ("shimmerLocaldB_sma3nz", True),
+}
+
+
+def _windowed(values, frames_per_window):
+    """Reshape a (frames, k) array to (windows, frames_per_window, k), NaN-padded."""
+    pad = -len(values) % frames_per_window
+    if pad:
+        values = np.concatenate([values, np.full((pad,) + values.shape[1:], np.nan)])
+    return values.reshape(-1, frames_per_window, *values.shape[1:])
+
+
+def _nan_mean_std(windows):
+    """Mean and standard deviation over axis 1, ignoring NaN (NaN for empty windows)."""
+    valid = ~np.isnan(windows)
+    count = valid.sum(axis=1)
+    filled = np.where(valid, windows, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = filled.sum(axis=1) / count
+        var = (filled ** 2).sum(axis=1) / count - mean ** 2
+    return mean, np.sqrt(np.maximum(var, 0.0))
+
+
+def _speech_mask(vad, n_frames):
+    """Per-frame speech flag from the shared VAD segments."""
+    centers = (np.arange(n_frames) + 0.5) * FRAME_STEP
+    idx = np.searchsorted(vad.starts, centers, side="right") - 1
+    inside = idx >= 0
+    inside[inside] = centers[inside] < vad.ends[idx[inside]]
+    return inside
+
+
+class ProsodyWindows:
+    """
+    Per-window prosody of one recording.
+
+    `starts` holds each window's start time in seconds; `tracks` maps a
+    name (loudness, pitch_mean, pitch_std, jitter, shimmer, pause_ratio) to
+    an array with one value per window, NaN where a window has no voiced
+    frames.
+    """
+
+    def __init__(self, window_sec, starts, tracks):
+        self.window_sec = window_sec
+        self.starts = starts
+        self.tracks = tracks
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, name):
+        return self.tracks[name]
+
+    def to_dict(self):
+        """JSON-safe form (NaN becomes None)."""
+        def _clean(arr):
+            return [None if np.isnan(v) else round(v, 4) for v in arr.tolist()]
+
+        return {
+            "window_sec": self.window_sec,
+            "start": np.round(self.starts, 2).tolist(),
+            **{name: _clean(arr) for name, arr in self.tracks.items()},
+        }
+
+
+def prosody_windows(audio, window_sec=5.0):
+    """
+    Aggregate the recording's low-level descriptors into fixed windows.
+
+    Args:
+        audio: Path to the audio file, or an AudioContext.
+        window_sec: Window length in seconds.
+
+    Returns:
+        ProsodyWindows
+    """
+    ctx = AudioContext.of(audio)
+    lld = extract_egemaps_lld(ctx)
+    frames_per_window = max(1, int(round(window_sec / FRAME_STEP)))
+
+    columns = [EGEMAPS_LLD_INDEX[name] for name, _ in _TRACKS.values()]
+    values = lld[:, columns].copy()
+    voiced_only = np.array([nz for _, nz in _TRACKS.values()])
+    values[:, voiced_only] = np.where(values[:, voiced_only] > 0, values[:, voiced_only], np.nan)
+
+    mean, std = _nan_mean_std(_windowed(values, frames_per_window))
+
+    # Pause ratio: share of non-speech frames per window (padding is NaN)
+    speech = _speech_mask(ctx.vad, len(lld)).astype(np.float64)
+    speech_mean, _ = _nan_mean_std(_windowed(speech[:, None], frames_per_window))
+
+    tracks = {
+        "loudness": mean[:, 0],
+        "pitch_mean": mean[:, 1],
+        "pitch_std": std[:, 1],
+        "jitter": mean[:, 2],
+        "shimmer": mean[:, 3],
+        "pause_ratio": 1.0 - speech_mean[:, 0],
+    }
+    starts = np.arange(len(mean)) * frames_per_window * FRAME_STEP
+    return ProsodyWindows(window_sec, starts, tracks)
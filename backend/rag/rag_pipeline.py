@@ -1,5 +1,6 @@
 from rag.retriever import get_retriever
-from llm1.local_llm import get_llm
+from llm1.local_llm import report_llm
+from llm1.provider import StreamInterrupted
 from llm1.prompt_templates import REPORT_PROMPT
 
 # Import GuardrailsAI for report validation
@@ -11,22 +12,21 @@ except ImportError:
     def validate_final_report(x): return x
 
 
-def rag_enhanced_report(agent_outputs: dict) -> str:
+def _report_prompt(agent_outputs: dict) -> str:
     """
-    Generate a RAG-enhanced report using retrieved knowledge.
+    Build the report prompt with RAG-retrieved improvement knowledge.
     Uses the custom RAGRetriever API (not LangChain's invoke).
     """
     retriever = get_retriever()
-    llm = get_llm()
-    
+
     # Extract analysis results to identify weak areas for targeted improvements
     comm = agent_outputs.get("communication_analysis", {})
     conf = agent_outputs.get("confidence_emotion_analysis", {})
     pers = agent_outputs.get("personality_analysis", {})
-    
+
     # Identify areas needing improvement based on agent outputs
     weak_areas = []
-    
+
     if isinstance(comm, dict):
         if comm.get("clarity_score", 100) < 70:
             weak_areas.append("clarity")
@@ -36,7 +36,7 @@ def rag_enhanced_report(agent_outputs: dict) -> str:
         structure = str(comm.get("speech_structure", "")).lower()
         if structure in ["disorganized", "basic"]:
             weak_areas.append("speech structure")
-            
+
     if isinstance(conf, dict):
         confidence = str(conf.get("confidence_level", "")).lower()
         if confidence == "low":
@@ -44,25 +44,58 @@ def rag_enhanced_report(agent_outputs: dict) -> str:
         nervousness = str(conf.get("nervousness", "")).lower()
         if nervousness in ["high", "medium"]:
             weak_areas.append("nervousness reduction")
-            
+
     if isinstance(pers, dict):
         assertiveness = str(pers.get("assertiveness", "")).lower()
         if assertiveness == "low":
             weak_areas.append("assertiveness")
-    
+
     # Get targeted improvement recommendations using RAGRetriever's method
     improve_metrics = {"weak_areas": weak_areas if weak_areas else ["general speaking skills"]}
     rag_context = retriever.get_context_for_analysis("improvement", improve_metrics)
-    
+
     # Build prompt using template
-    prompt = REPORT_PROMPT.format(
+    return REPORT_PROMPT.format(
         rag_context=rag_context if rag_context else "No specific recommendations available.",
         agent_outputs=agent_outputs
     )
 
-    report = llm.invoke(prompt)
-    
+
+def rag_enhanced_report(agent_outputs: dict) -> str:
+    """
+    Generate a RAG-enhanced report using retrieved knowledge.
+    """
+    report = report_llm.invoke(_report_prompt(agent_outputs))
+
     # Validate final report with guardrails
     validated_report = validate_final_report(report)
-    
+
     return validated_report
+
+
+def rag_enhanced_report_stream(agent_outputs: dict):
+    """
+    Streaming variant of `rag_enhanced_report`.
+
+    Yields `{"type": "token", "text": ...}` events as the LLM generates the
+    report, then one `{"type": "report", "final_report": ..., "truncated": ...}`
+    event with the complete report after guardrails validation (which may
+    differ from the streamed text). If the LLM fails mid-stream the streamed
+    tokens stop short: the report event then carries the fallback report and
+    `truncated: true`.
+    """
+    prompt = _report_prompt(agent_outputs)
+    chunks = []
+    try:
+        for text in report_llm.stream(prompt):
+            chunks.append(text)
+            yield {"type": "token", "text": text}
+    except StreamInterrupted:
+        yield {
+            "type": "report",
+            "final_report": validate_final_report(report_llm.fallback.invoke(prompt)),
+            "truncated": True,
+        }
+        return
+
+    yield {"type": "report", "final_report": validate_final_report("".join(chunks)), "truncated": False}
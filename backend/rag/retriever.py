@@ -5,6 +5,7 @@ ChromaDB uses its own built-in embeddings (all-MiniLM-L6-v2) for fast local retr
 """
 
 import os
+import threading
 from typing import List, Dict, Optional
 
 try:
@@ -20,6 +21,7 @@ from rag.config import (
     TOP_K_RESULTS
 )
 from rag.knowledge_base import KnowledgeBase
+from model_bundle import get_embedding_function
 
 
 class RAGRetriever:
@@ -47,10 +49,17 @@ class RAGRetriever:
             # Use in-memory client for speed and simplicity
             self.client = chromadb.Client()
             
-            # Get or create collection (uses default embedding function)
+            # Get or create collection (default embedding function, or the
+            # bundled MiniLM when running from an offline model bundle)
+            collection_kwargs = {}
+            embedding_function = get_embedding_function()
+            if embedding_function is not None:
+                collection_kwargs["embedding_function"] = embedding_function
+
             self.collection = self.client.get_or_create_collection(
                 name=COLLECTION_NAME,
-                metadata={"description": "Speech analysis knowledge base"}
+                metadata={"description": "Speech analysis knowledge base"},
+                **collection_kwargs
             )
             
             # Index documents if collection is empty
@@ -263,10 +272,13 @@ class RAGRetriever:
 
 # Singleton instance for easy access
 _retriever_instance = None
+# Agents run concurrently; only one of them may build (and index) the retriever
+_retriever_lock = threading.Lock()
 
 def get_retriever() -> RAGRetriever:
     """Get or create the RAG retriever instance"""
     global _retriever_instance
-    if _retriever_instance is None:
-        _retriever_instance = RAGRetriever()
+    with _retriever_lock:
+        if _retriever_instance is None:
+            _retriever_instance = RAGRetriever()
     return _retriever_instance
@@ -0,0 +1,136 @@
+# spectral_frontend.py
+"""
+Shared Spectral Front-End.
+
+One object per request that frames the decoded signal and computes the
+common per-frame summaries once (frame energies and peaks), memoised on the
+AudioContext. Feature extractors register by name and read from the
+front-end instead of each re-framing the signal:
+
+    @register_feature("zero_crossings")
+    def zero_crossings(fe):
+        return np.concatenate([
+            (np.diff(np.sign(block), axis=1) != 0).sum(axis=1)
+            for block in fe.blocks(0.025)
+        ])
+
+    SpectralFrontEnd.of(ctx).extract("zero_crossings")
+
+Only small per-frame results are memoised. Full-resolution intermediates
+(the float64 frames, the short-lag autocorrelation) are produced one block
+of BLOCK_FRAMES frames at a time and dropped after use, so peak memory does
+not grow with the recording's length.
+
+Silero VAD and openSMILE keep their own model-specific front-ends; the
+numpy extractors (see numpy_features.py) and trimming use this one.
+"""
+
+import numpy as np
+
+from audio_context import AudioContext
+
+HOP_SEC = 0.01
+
+# Frames transformed per vectorized block (bounds peak memory)
+BLOCK_FRAMES = 4096
+
+# Named feature extractors: name -> function(front_end)
+FEATURE_EXTRACTORS = {}
+
+
+def register_feature(name):
+    """Decorator registering `func(front_end)` as the extractor for `name`."""
+    def decorator(func):
+        FEATURE_EXTRACTORS[name] = func
+        return func
+    return decorator
+
+
+def short_lag_autocorrelation(frames):
+    """
+    r(tau) = sum_{j < W/2} x[j] x[j + tau] for every frame of a block and
+    tau < W/2 (the form YIN needs). Kept in float64: YIN's cumulative mean
+    normalised difference subtracts nearly equal sums.
+    """
+    w = frames.shape[1]
+    half = w // 2
+    size = 1 << (w + half - 1).bit_length()
+    spectrum = np.fft.rfft(frames, size, axis=1)
+    head = np.fft.rfft(frames[:, :half], size, axis=1)
+    return np.fft.irfft(spectrum * np.conj(head), size, axis=1)[:, :half]
+
+
+class SpectralFrontEnd:
+    """Block-wise framing and memoised per-frame summaries of one recording."""
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.sample_rate = ctx.sample_rate
+
+    @classmethod
+    def of(cls, audio):
+        """The front-end of a path or AudioContext (one per context)."""
+        ctx = AudioContext.of(audio)
+        return ctx.memo("spectral_frontend", lambda: cls(ctx))
+
+    def _memo(self, *key, compute):
+        return self.ctx.memo(("spectral",) + key, compute)
+
+    # ---------------------------
+    # Framing
+    # ---------------------------
+    def frames(self, frame_sec, hop_sec=HOP_SEC):
+        """(n_frames, frame_len) strided view of the samples (no copy)."""
+        frame_len = int(frame_sec * self.sample_rate)
+        hop = int(hop_sec * self.sample_rate)
+        y = self.ctx.samples
+        if len(y) < frame_len:
+            y = np.pad(y, (0, frame_len - len(y)))
+        return np.lib.stride_tricks.sliding_window_view(y, frame_len)[::hop]
+
+    def blocks(self, frame_sec, hop_sec=HOP_SEC):
+        """Consecutive float64 blocks of at most BLOCK_FRAMES frames."""
+        frames = self.frames(frame_sec, hop_sec)
+        for i in range(0, len(frames), BLOCK_FRAMES):
+            yield frames[i:i + BLOCK_FRAMES].astype(np.float64)
+
+    def frame_energy(self, frame_sec, hop_sec=HOP_SEC):
+        """Per-frame RMS."""
+        return self._memo("rms", frame_sec, hop_sec, compute=lambda: np.concatenate([
+            np.sqrt(np.mean(block ** 2, axis=1)) for block in self.blocks(frame_sec, hop_sec)
+        ]))
+
+    def frame_peaks(self, frame_sec, hop_sec=HOP_SEC):
+        """Per-frame peak absolute amplitude."""
+        return self._memo("peaks", frame_sec, hop_sec, compute=lambda: np.concatenate([
+            np.abs(block).max(axis=1) for block in self.blocks(frame_sec, hop_sec)
+        ]))
+
+    # ---------------------------
+    # Derived
+    # ---------------------------
+    def trim_bounds(self, top_db=20, frame_sec=0.128, hop_sec=0.032):
+        """
+        (start, end) sample indices of the non-silent part of the signal:
+        the first and last frames within `top_db` of the loudest frame, as
+        librosa.effects.trim finds them. A signal with no frame above the
+        others (e.g. digital silence) is kept whole, as librosa does.
+        """
+        rms = self.frame_energy(frame_sec, hop_sec)
+        n = len(self.ctx.samples)
+        if not len(rms) or rms.max() <= 0:
+            return 0, n
+        db = 20 * np.log10(np.maximum(rms, 1e-10) / rms.max())
+        loud = np.flatnonzero(db > -top_db)
+        hop = int(hop_sec * self.sample_rate)
+        frame_len = int(frame_sec * self.sample_rate)
+        if loud[-1] == len(rms) - 1:
+            # The last frame is loud: keep the tail it does not quite reach
+            return int(loud[0] * hop), n
+        return int(loud[0] * hop), int(min(n, loud[-1] * hop + frame_len))
+
+    def extract(self, name):
+        """Run (once) and return the registered feature `name`."""
+        if name not in FEATURE_EXTRACTORS:
+            raise KeyError(f"No feature extractor registered as '{name}'")
+        return self.ctx.memo(("feature", name), lambda: FEATURE_EXTRACTORS[name](self))
@@ -0,0 +1,86 @@
+# speech_config.py
+"""
+Speech Processing Configuration.
+
+Settings for transcription (faster-whisper) and acoustic analysis.
+Configure via environment variables or .env file.
+"""
+
+import os
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Whisper model settings
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "small")
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "cpu")
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE", "en")
+
+# Preview tier for two-tier (speculative) transcription — a fast model whose
+# transcript is shown immediately and later replaced by WHISPER_MODEL_SIZE's
+WHISPER_PREVIEW_MODEL_SIZE = os.getenv("WHISPER_PREVIEW_MODEL_SIZE", "base")
+WHISPER_PREVIEW_COMPUTE_TYPE = os.getenv("WHISPER_PREVIEW_COMPUTE_TYPE", "int8")
+# The growing preview is re-sent at most this often (seconds) while it decodes
+WHISPER_PREVIEW_INTERVAL_SEC = float(os.getenv("WHISPER_PREVIEW_INTERVAL_SEC", "2"))
+
+# Batched inference — VAD chunks are decoded in parallel batches.
+# Used automatically for recordings longer than WHISPER_BATCHED_MIN_DURATION seconds.
+WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "8"))
+WHISPER_BATCHED_MIN_DURATION = float(os.getenv("WHISPER_BATCHED_MIN_DURATION", "60"))
+
+# Parallel chunked transcription across a process pool of preloaded models.
+# Used automatically for recordings longer than WHISPER_PARALLEL_MIN_DURATION seconds.
+WHISPER_PARALLEL_MIN_DURATION = float(os.getenv("WHISPER_PARALLEL_MIN_DURATION", "900"))
+WHISPER_PARALLEL_WORKERS = int(os.getenv("WHISPER_PARALLEL_WORKERS", "0"))  # 0 = cores / threads
+WHISPER_PARALLEL_THREADS = int(os.getenv("WHISPER_PARALLEL_THREADS", "2"))  # per worker
+WHISPER_PARALLEL_CHUNK_SEC = float(os.getenv("WHISPER_PARALLEL_CHUNK_SEC", "60"))
+WHISPER_PARALLEL_OVERLAP_SEC = float(os.getenv("WHISPER_PARALLEL_OVERLAP_SEC", "1.0"))
+
+# 0 = assigned by the thread governor from CPU_THREAD_BUDGET
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0"))
+
+# Persistent transcription cache (SQLite, LRU-evicted)
+TRANSCRIPT_CACHE_ENABLED = os.getenv("TRANSCRIPT_CACHE_ENABLED", "true").lower() == "true"
+TRANSCRIPT_CACHE_PATH = os.getenv(
+    "TRANSCRIPT_CACHE_PATH",
+    os.path.join(os.path.dirname(__file__), ".cache", "transcripts.sqlite3")
+)
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.getenv("TRANSCRIPT_CACHE_MAX_MB", "256")) * 1024 * 1024
+
+# Silero VAD engine: "onnx" (batched windows, persistent session) or "jit"
+VAD_BACKEND = os.getenv("VAD_BACKEND", "onnx")
+VAD_THREADS = int(os.getenv("VAD_THREADS", "1"))
+
+# Global CPU thread budget shared by all in-flight requests (0 = all cores)
+CPU_THREAD_BUDGET = int(os.getenv("CPU_THREAD_BUDGET", "0"))
+
+# Concurrent feature stage: CPU threads shared by Whisper, VAD and openSMILE
+# for one request (0 = the request's share of CPU_THREAD_BUDGET). openSMILE
+# is single-threaded and VAD gets VAD_THREADS; Whisper receives the rest,
+# rounded down to one of the governor's fixed thread tiers.
+FEATURE_STAGE_THREADS = int(os.getenv("FEATURE_STAGE_THREADS", "0"))
+
+# Number of Whisper thread-count tiers (1-4: the whole Whisper share, then a
+# half, a quarter, an eighth). Each tier in use loads its own copy of the
+# model, so this bounds resident copies; more tiers let more requests
+# transcribe at once on large budgets.
+WHISPER_THREAD_TIERS = int(os.getenv("WHISPER_THREAD_TIERS", "2"))
+
+# Acoustic feature extractor: "opensmile" (eGeMAPS) or "numpy" (fast tier,
+# no openSMILE dependency). Selectable per request; openSMILE falls back to
+# numpy when it is not installed.
+ACOUSTIC_EXTRACTOR = os.getenv("ACOUSTIC_EXTRACTOR", "opensmile")
+
+# Window length (seconds) of the per-window prosody trajectories
+PROSODY_WINDOW_SEC = float(os.getenv("PROSODY_WINDOW_SEC", "5"))
+
+# Columnar feature store (Parquet, partitioned by date); disabled when unset.
+# Rows are written in batches of FEATURE_STORE_BATCH_SIZE.
+FEATURE_STORE_DIR = os.getenv("FEATURE_STORE_DIR", "")
+FEATURE_STORE_BATCH_SIZE = int(os.getenv("FEATURE_STORE_BATCH_SIZE", "64"))
+
+# Offline model bundle (see model_bundle.py); when set, Whisper, Silero VAD
+# and MiniLM load only from this directory
+MODEL_BUNDLE_DIR = os.getenv("MODEL_BUNDLE_DIR", "")
@@ -1,77 +1,146 @@
 import librosa
-import opensmile
-import torch
-from utils.audio_loader import load_audio
+import numpy as np
+from audio_context import AudioContext
+from numpy_features import extract_numpy_features
+from speech_config import ACOUSTIC_EXTRACTOR
+
+try:
+    import opensmile
+    OPENSMILE_AVAILABLE = True
+except ImportError:
+    OPENSMILE_AVAILABLE = False
 
 # ---------------------------
 # LOAD MODELS ONCE
 # ---------------------------
+smile = smile_lld = None
+EGEMAPS_INDEX = {}
+EGEMAPS_LLD_INDEX = {}
+
+if OPENSMILE_AVAILABLE:
+    # openSMILE feature extractor (standardized acoustic features)
+    smile = opensmile.Smile(
+        feature_set=opensmile.FeatureSet.eGeMAPSv02,
+        feature_level=opensmile.FeatureLevel.Functionals,
+    )
+
+    # Frame-level eGeMAPS descriptors (10 ms step) for windowed prosody
+    smile_lld = opensmile.Smile(
+        feature_set=opensmile.FeatureSet.eGeMAPSv02,
+        feature_level=opensmile.FeatureLevel.LowLevelDescriptors,
+    )
+
+    # Column index of every eGeMAPS functional / descriptor, resolved once
+    EGEMAPS_INDEX = {name: i for i, name in enumerate(smile.feature_names)}
+    EGEMAPS_LLD_INDEX = {name: i for i, name in enumerate(smile_lld.feature_names)}
+
+
+def extract_egemaps(audio):
+    """
+    eGeMAPS functionals of a recording as a numpy vector (see EGEMAPS_INDEX).
+
+    Runs openSMILE on the already-decoded signal rather than re-reading the
+    file, and caches the vector on the audio context.
+    """
+    ctx = AudioContext.of(audio)
+
+    def _compute():
+        # smile(...) returns (channels, features, frames); functionals have one frame
+        return np.asarray(smile(ctx.samples, ctx.sample_rate)[0, :, 0], dtype=np.float64)
+
+    return ctx.memo("egemaps", _compute)
+
+
+def extract_egemaps_lld(audio):
+    """
+    eGeMAPS low-level descriptors as a (frames, features) array, one frame
+    every 10 ms (see EGEMAPS_LLD_INDEX). Cached on the audio context.
+    """
+    ctx = AudioContext.of(audio)
+
+    def _compute():
+        return np.asarray(smile_lld(ctx.samples, ctx.sample_rate)[0].T, dtype=np.float64)
+
+    return ctx.memo("egemaps_lld", _compute)
+
+
+def get_feature(vector, name_candidates, default=0.0):
+    """Look up the first available eGeMAPS feature by name."""
+    for name in name_candidates:
+        idx = EGEMAPS_INDEX.get(name)
+        if idx is not None:
+            return float(vector[idx])
+    return default
+
+
+def _opensmile_features(ctx):
+    features = extract_egemaps(ctx)
+    return {
+        "loudness": get_feature(features, ["loudness_sma3_amean", "loudness_sma3_mean"]),
+        "pitch_mean": get_feature(features, ["F0semitoneFrom27.5Hz_sma3nz_amean"]),
+        "pitch_variance": get_feature(features, ["F0semitoneFrom27.5Hz_sma3nz_stddevNorm"]),
+        "jitter": get_feature(features, ["jitterLocal_sma3nz_amean"]),
+        "shimmer": get_feature(features, ["shimmerLocaldB_sma3nz_amean"]),
+    }
+
+
+# Acoustic extractors selectable per request
+ACOUSTIC_EXTRACTORS = {
+    "opensmile": _opensmile_features,
+    "numpy": extract_numpy_features,
+}
 
-# openSMILE feature extractor (standardized acoustic features)
-smile = opensmile.Smile(
-    feature_set=opensmile.FeatureSet.eGeMAPSv02,
-    feature_level=opensmile.FeatureLevel.Functionals,
-)
+
+def resolve_extractor(extractor=None):
+    """Name of the extractor to use; openSMILE falls back to numpy when missing."""
+    extractor = extractor or ACOUSTIC_EXTRACTOR
+    if extractor not in ACOUSTIC_EXTRACTORS:
+        raise ValueError(f"Unknown acoustic extractor '{extractor}'")
+    if extractor == "opensmile" and not OPENSMILE_AVAILABLE:
+        return "numpy"
+    return extractor
+
+
+def acoustic_features(audio, extractor=None):
+    """
+    Loudness, pitch mean / variance, jitter and shimmer of a recording.
+
+    Args:
+        audio: Path to the audio file, or an AudioContext.
+        extractor: "opensmile" (eGeMAPS) or "numpy" (fast tier); defaults
+            to ACOUSTIC_EXTRACTOR.
+    """
+    return ACOUSTIC_EXTRACTORS[resolve_extractor(extractor)](AudioContext.of(audio))
 
 # ---------------------------
-# Silero VAD (Offline, Stable)
+# Silero VAD (ONNX, batched)
 # ---------------------------
-vad_model, vad_utils = torch.hub.load(
-    repo_or_dir="snakers4/silero-vad",
-    model="silero_vad",
-    trust_repo=True
-)
-
-(
-    get_speech_timestamps,
-    save_audio,
-    read_audio,
-    VADIterator,
-    collect_chunks
-) = vad_utils
-
-
-def compute_pause_ratio(audio_path, sampling_rate=16000):
+def compute_pause_ratio(audio, sampling_rate=16000):
     """
     Computes pause ratio using Silero VAD.
     pause_ratio = non-speech duration / total duration.
-    Uses PyAV-based load_audio instead of Silero's read_audio to avoid
-    torchcodec/FFmpeg dependency issues on Windows.
-    """
-    # Load audio as numpy array, then convert to torch tensor for Silero VAD
-    y, sr = load_audio(audio_path, target_sr=sampling_rate)
-    wav = torch.from_numpy(y).float()
-
-    # Silero VAD expects values in [-1, 1] range
-    if wav.abs().max() > 1.0:
-        wav = wav / wav.abs().max()
 
-    speech_timestamps = get_speech_timestamps(
-        wav, vad_model, sampling_rate=sampling_rate
-    )
+    Accepts a path or an AudioContext; the VAD result is cached on the
+    context so other stages reuse the same speech timestamps.
+    """
+    ctx = AudioContext.of(audio)
+    vad = ctx.vad
 
-    if not speech_timestamps:
+    if len(vad) == 0:
         return 1.0, 0.0  # all pause
 
-    speech_time = sum(
-        (seg["end"] - seg["start"]) / sampling_rate
-        for seg in speech_timestamps
-    )
-
-    total_duration = len(wav) / sampling_rate
-    pause_time = max(total_duration - speech_time, 0)
-
-    pause_ratio = pause_time / total_duration if total_duration > 0 else 0
-    return round(pause_ratio, 2), round(pause_time, 2)
+    return round(vad.pause_ratio, 2), round(vad.pause_time, 2)
 
 
 
 # ---------------------------
 # MAIN FUNCTION
 # ---------------------------
-def analyze_speech(audio_file, word_segments):
-    # Load audio using PyAV to handle WebM/various container formats
-    y, sr = load_audio(audio_file, target_sr=16000)
+def analyze_speech(audio_file, word_segments, extractor=None):
+    # Decoded once (PyAV handles WebM/various container formats) and shared
+    # with the other stages through the audio context
+    ctx = AudioContext.of(audio_file)
+    y, sr = ctx.samples, ctx.sample_rate
     duration_sec = librosa.get_duration(y=y, sr=sr)
 
     # -----------------------
@@ -83,43 +152,17 @@ def analyze_speech(audio_file, word_segments):
     # -----------------------
     # Pause Analysis (Silero VAD)
     # -----------------------
-    pause_ratio, total_pause_time = compute_pause_ratio(audio_file)
+    pause_ratio, total_pause_time = compute_pause_ratio(ctx)
 
     # -----------------------
-    # Acoustic Features (openSMILE)
+    # Acoustic Features (openSMILE, or the numpy fast tier)
     # -----------------------
-    features = smile.process_file(audio_file)
-
-    def get_feature(df, name_candidates, default=0.0):
-        for name in name_candidates:
-            if name in df.columns:
-                return float(df[name].iloc[0])
-        return default
-
-    loudness = get_feature(
-        features,
-        ["loudness_sma3_amean", "loudness_sma3_mean"]
-    )
-
-    pitch_mean = get_feature(
-        features,
-        ["F0semitoneFrom27.5Hz_sma3nz_amean"]
-    )
-
-    pitch_variance = get_feature(
-        features,
-        ["F0semitoneFrom27.5Hz_sma3nz_stddevNorm"]
-    )
-
-    jitter = get_feature(
-        features,
-        ["jitterLocal_sma3nz_amean"]
-    )
-
-    shimmer = get_feature(
-        features,
-        ["shimmerLocaldB_sma3nz_amean"]
-    )
+    acoustic = acoustic_features(ctx, extractor)
+    loudness = acoustic["loudness"]
+    pitch_mean = acoustic["pitch_mean"]
+    pitch_variance = acoustic["pitch_variance"]
+    jitter = acoustic["jitter"]
+    shimmer = acoustic["shimmer"]
 
 
     # -----------------------
@@ -1,57 +1,390 @@
-from faster_whisper import WhisperModel
+import asyncio
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+
+from faster_whisper import WhisperModel, BatchedInferencePipeline
+
+from speech_config import (
+    WHISPER_MODEL_SIZE,
+    WHISPER_DEVICE,
+    WHISPER_COMPUTE_TYPE,
+    WHISPER_LANGUAGE,
+    WHISPER_BATCH_SIZE,
+    WHISPER_BATCHED_MIN_DURATION,
+    WHISPER_CPU_THREADS,
+    WHISPER_PREVIEW_MODEL_SIZE,
+    WHISPER_PREVIEW_COMPUTE_TYPE,
+    WHISPER_PREVIEW_INTERVAL_SEC,
+    WHISPER_PARALLEL_MIN_DURATION,
+    WHISPER_PARALLEL_WORKERS,
+    WHISPER_PARALLEL_THREADS,
+    WHISPER_PARALLEL_CHUNK_SEC,
+    WHISPER_PARALLEL_OVERLAP_SEC,
+)
+from audio_context import AudioContext
+from model_bundle import whisper_model_path
+from thread_budget import get_thread_governor
+from transcription_cache import get_transcription_cache, make_cache_key
+from utils.word_segments import WordSegments
 
 AUDIO_FILE = "clean_audio.wav"
 
-def transcribe_audio(audio_file):
-    model = WhisperModel(
-        "small",
-        device="cpu",
-        compute_type="int8"
-    )
+# ---------------------------
+# LOAD MODELS ONCE
+# ---------------------------
+_models = {}
+_batched_pipelines = {}
+_parallel_transcribers = {}
+_model_lock = threading.Lock()
+
+
+def get_whisper_model(model_size=WHISPER_MODEL_SIZE, compute_type=WHISPER_COMPUTE_TYPE,
+                      cpu_threads=WHISPER_CPU_THREADS):
+    """
+    Get or create a cached WhisperModel for the given configuration.
+    `cpu_threads=0` takes the thread governor's current allocation.
+    """
+    cpu_threads = cpu_threads or get_thread_governor().allocate()["whisper"]
+    key = (model_size, compute_type, cpu_threads)
+    with _model_lock:
+        if key not in _models:
+            _models[key] = WhisperModel(
+                whisper_model_path(model_size),
+                device=WHISPER_DEVICE,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads
+            )
+        return _models[key]
+
+
+def get_batched_pipeline(model_size=WHISPER_MODEL_SIZE, compute_type=WHISPER_COMPUTE_TYPE,
+                         cpu_threads=WHISPER_CPU_THREADS):
+    """Get or create a BatchedInferencePipeline wrapping the cached model."""
+    cpu_threads = cpu_threads or get_thread_governor().allocate()["whisper"]
+    key = (model_size, compute_type, cpu_threads)
+    model = get_whisper_model(model_size, compute_type, cpu_threads)
+    with _model_lock:
+        if key not in _batched_pipelines:
+            _batched_pipelines[key] = BatchedInferencePipeline(model=model)
+        return _batched_pipelines[key]
+
+
+def get_parallel_transcriber(model_size=WHISPER_MODEL_SIZE, compute_type=WHISPER_COMPUTE_TYPE):
+    """Get or create the process pool used for parallel chunked transcription."""
+    from parallel_transcription import ParallelTranscriber
+
+    key = (model_size, compute_type)
+    governor = get_thread_governor()
+    with _model_lock:
+        if key not in _parallel_transcribers:
+            _parallel_transcribers[key] = ParallelTranscriber(
+                whisper_model_path(model_size),
+                WHISPER_DEVICE,
+                compute_type,
+                WHISPER_LANGUAGE,
+                workers=WHISPER_PARALLEL_WORKERS or max(1, governor.total // WHISPER_PARALLEL_THREADS),
+                threads_per_worker=WHISPER_PARALLEL_THREADS
+            )
+        return _parallel_transcribers[key]
+
+
+class TranscriptAccumulator:
+    """
+    Accumulates faster-whisper segments into the transcript structures
+    returned by `transcribe_audio` while transcription is still running.
 
-    print("[INFO] Transcribing audio...")
-    segments, info = model.transcribe(audio_file, language="en")
+    Word timings are kept in a columnar `WordSegments` rather than one dict
+    per word; `to_dict()` converts them to the list-of-dicts shape unless
+    asked to keep them columnar.
+    """
 
-    full_text = ""
-    segment_data = []
-    word_segments = []
+    def __init__(self):
+        self._text = ""
+        self.segments = []
+        self.word_segments = WordSegments()
 
-    for seg in segments:
-        full_text += seg.text + " "
+    @property
+    def transcript(self):
+        return self._text.strip()
 
-        segment_data.append({
+    def add_segment(self, seg):
+        """Add one decoded segment, returning its segment entry and words."""
+        self._text += seg.text + " "
+
+        segment = {
             "text": seg.text,
             "start": seg.start,
             "end": seg.end
-        })
+        }
+        self.segments.append(segment)
 
         # ---- Word-level estimation ----
-        words = seg.text.strip().split()
-        if not words:
-            continue
+        words = self.word_segments.append_segment(seg.start, seg.end, seg.text.strip().split())
+        return segment, words
+
+    def to_dict(self, columnar=False):
+        return {
+            "transcript": self.transcript,
+            "segments": self.segments,
+            "word_segments": self.word_segments if columnar else self.word_segments.to_list()
+        }
+
+
+def transcription_mode(duration_sec, batched=None, parallel=None):
+    """
+    "parallel", "batched" or "sequential": how a recording of `duration_sec`
+    is decoded (None selects by duration). The modes split the audio
+    differently, so they can segment the same words differently.
+    """
+    if parallel is None:
+        parallel = duration_sec >= WHISPER_PARALLEL_MIN_DURATION
+    if batched is None:
+        batched = duration_sec >= WHISPER_BATCHED_MIN_DURATION
+    if parallel:
+        return "parallel"
+    return "batched" if batched else "sequential"
+
+
+def _start_transcription(ctx, batched, batch_size, model_size, compute_type, parallel=None,
+                         cpu_threads=WHISPER_CPU_THREADS):
+    """Start a lazy segment generator on the context's decoded audio."""
+    audio = ctx.samples
+    mode = transcription_mode(ctx.duration, batched, parallel)
+
+    if mode == "parallel":
+        print("[INFO] Transcribing audio (parallel chunks)...")
+        transcriber = get_parallel_transcriber(model_size, compute_type)
+        # Decode only as many chunks at once as the request's Whisper threads allow
+        whisper_threads = cpu_threads or get_thread_governor().allocate()["whisper"]
+        segments = transcriber.transcribe(
+            audio,
+            ctx.vad.to_timestamps(),
+            chunk_sec=WHISPER_PARALLEL_CHUNK_SEC,
+            overlap_sec=WHISPER_PARALLEL_OVERLAP_SEC,
+            max_in_flight=max(1, whisper_threads // WHISPER_PARALLEL_THREADS)
+        )
+    elif mode == "batched":
+        print(f"[INFO] Transcribing audio (batched, batch_size={batch_size})...")
+        pipeline = get_batched_pipeline(model_size, compute_type, cpu_threads)
+        # Decode the shared VAD speech regions instead of re-running VAD
+        segments, info = pipeline.transcribe(
+            audio,
+            language=WHISPER_LANGUAGE,
+            batch_size=batch_size,
+            clip_timestamps=ctx.vad.clip_timestamps()
+        )
+    else:
+        print(f"[INFO] Transcribing audio ({model_size})...")
+        model = get_whisper_model(model_size, compute_type, cpu_threads)
+        segments, info = model.transcribe(audio, language=WHISPER_LANGUAGE)
+
+    return segments
+
+
+def iter_transcription(audio_file, batched=None, batch_size=WHISPER_BATCH_SIZE,
+                       accumulator=None, use_cache=True,
+                       model_size=WHISPER_MODEL_SIZE, compute_type=WHISPER_COMPUTE_TYPE,
+                       parallel=None, cpu_threads=WHISPER_CPU_THREADS):
+    """
+    Transcribe incrementally, yielding each segment as soon as it is decoded.
+
+    Yields dicts with `segment` and `words` (a `WordSegments`) keys. Pass a
+    `TranscriptAccumulator` to read the transcript built so far at any point;
+    once the generator is exhausted `accumulator.to_dict()` matches the
+    return value of `transcribe_audio`.
+
+    Completed transcriptions are stored in the persistent transcription cache
+    and replayed from it when the same audio is transcribed again. Cache
+    errors (a locked, full or corrupt database) are reported and the audio
+    is transcribed as if the cache were absent.
+    """
+    if accumulator is None:
+        accumulator = TranscriptAccumulator()
+
+    ctx = AudioContext.of(audio_file)
+    audio = ctx.samples
+
+    cache = get_transcription_cache() if use_cache else None
+    cache_key = None
+    if cache is not None:
+        cache_key = make_cache_key(
+            audio, model_size, compute_type, WHISPER_LANGUAGE,
+            transcription_mode(ctx.duration, batched, parallel)
+        )
+        try:
+            cached = cache.get(cache_key)
+        except sqlite3.Error as e:
+            print(f"[WARNING] Transcription cache read failed ({e}), transcribing")
+            cached = None
+        if cached is not None:
+            print("[INFO] Transcription cache hit")
+            for seg in cached["segments"]:
+                segment, words = accumulator.add_segment(SimpleNamespace(**seg))
+                yield {"segment": segment, "words": words}
+            return
+
+    for seg in _start_transcription(ctx, batched, batch_size, model_size, compute_type,
+                                    parallel, cpu_threads):
+        segment, words = accumulator.add_segment(seg)
+        yield {"segment": segment, "words": words}
+
+    if cache is not None:
+        try:
+            cache.put(cache_key, {"segments": accumulator.segments})
+        except sqlite3.Error as e:
+            print(f"[WARNING] Transcription cache write failed ({e}), not cached")
+
+
+async def aiter_transcription(audio_file, batched=None, batch_size=WHISPER_BATCH_SIZE,
+                              accumulator=None):
+    """
+    Async variant of `iter_transcription`.
+
+    Decoding runs in a worker thread so the event loop stays free to serve
+    other requests and to forward segments downstream as they arrive.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    done = object()
+
+    def _produce():
+        try:
+            for event in iter_transcription(audio_file, batched, batch_size, accumulator):
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, done)
+
+    threading.Thread(target=_produce, daemon=True).start()
+
+    while True:
+        event = await queue.get()
+        if event is done:
+            break
+        if isinstance(event, Exception):
+            raise event
+        yield event
+
+
+def transcribe_audio(audio_file, batched=None, batch_size=WHISPER_BATCH_SIZE, use_cache=True,
+                     model_size=WHISPER_MODEL_SIZE, compute_type=WHISPER_COMPUTE_TYPE,
+                     parallel=None, cpu_threads=WHISPER_CPU_THREADS, columnar=False):
+    """
+    Transcribe an audio file with faster-whisper.
+
+    Args:
+        audio_file: Path to the audio file, or an AudioContext shared with
+            the other pipeline stages.
+        batched: Use faster-whisper's batched inference pipeline, which splits
+            the audio into VAD-derived chunks and decodes them `batch_size` at
+            a time. None selects it automatically for long recordings.
+        batch_size: Number of chunks decoded per batch.
+        use_cache: Consult the persistent transcription cache.
+        model_size: Whisper model to use (e.g. "tiny", "base", "small", "medium").
+        compute_type: CTranslate2 compute type (e.g. "int8", "float32").
+        parallel: Split the audio at VAD-chosen silences and transcribe the
+            chunks across a process pool. None selects it automatically for
+            very long recordings; takes precedence over `batched`.
+        cpu_threads: CTranslate2 threads for the model, or the thread budget
+            of the parallel chunk workers (0 = assigned by the thread governor).
+        columnar: Return `word_segments` as a columnar `WordSegments`, for
+            callers that go on to analyse the timings.
+
+    Returns:
+        dict with `transcript`, `segments` and `word_segments` keys, where
+        `word_segments` is a list of {"word", "start", "end"} dicts.
+    """
+    accumulator = TranscriptAccumulator()
+    for _ in iter_transcription(audio_file, batched, batch_size, accumulator, use_cache,
+                                model_size, compute_type, parallel, cpu_threads):
+        pass
+
+    return accumulator.to_dict(columnar)
+
+
+def transcribe_tiered(audio_file):
+    """
+    Two-tier speculative transcription.
+
+    The preview model starts first and yields `("preview", data)` as soon as
+    its first segment is decoded, then again as the preview grows (at most
+    every WHISPER_PREVIEW_INTERVAL_SEC). The accurate model starts once the
+    first preview is out and its result is yielded as `("final", data)`;
+    the preview stops early if the final tier finishes first. Each tier
+    reserves half of the request's thread share from the thread governor,
+    so the tiers together never exceed it. Word timings are columnar
+    `WordSegments`.
+    """
+    ctx = AudioContext.of(audio_file)
+    governor = get_thread_governor()
+    tier_budget = max(1, governor.request_budget() // 2)
+
+    # Held back until the preview's first segment: the preview goes first
+    preview_started = threading.Event()
+    final_done = threading.Event()
+    final_result = {}
 
-        duration = seg.end - seg.start
-        avg_word_time = duration / len(words)
+    def _run_final():
+        try:
+            preview_started.wait()
+            with governor.request(tier_budget, features=False) as threads:
+                final_result["data"] = transcribe_audio(
+                    ctx, cpu_threads=threads["whisper"], columnar=True
+                )
+        except Exception as e:
+            final_result["error"] = e
+        finally:
+            final_done.set()
 
-        for i, word in enumerate(words):
-            word_start = seg.start + i * avg_word_time
-            word_end = word_start + avg_word_time
+    worker = threading.Thread(target=_run_final, daemon=True)
+    worker.start()
 
-            word_segments.append({
-                "word": word,
-                "start": round(word_start, 2),
-                "end": round(word_end, 2)
-            })
+    try:
+        with governor.request(tier_budget, features=False) as threads:
+            accumulator = TranscriptAccumulator()
+            segments = iter_transcription(
+                ctx,
+                batched=False,
+                accumulator=accumulator,
+                model_size=WHISPER_PREVIEW_MODEL_SIZE,
+                compute_type=WHISPER_PREVIEW_COMPUTE_TYPE,
+                parallel=False,
+                cpu_threads=threads["whisper"],
+            )
+            last_sent = None
+            pending = False
+            try:
+                for _ in segments:
+                    if final_done.is_set():
+                        break
+                    pending = True
+                    now = time.monotonic()
+                    if last_sent is None or now - last_sent >= WHISPER_PREVIEW_INTERVAL_SEC:
+                        last_sent, pending = now, False
+                        preview_started.set()
+                        yield "preview", accumulator.to_dict(columnar=True)
+            finally:
+                segments.close()
+            if pending and not final_done.is_set():
+                yield "preview", accumulator.to_dict(columnar=True)
+    except Exception as e:
+        # The preview is best-effort; the accurate tier still answers
+        print(f"[WARNING] Preview transcription failed: {e}")
+    finally:
+        preview_started.set()
 
-    return {
-        "transcript": full_text.strip(),
-        "segments": segment_data,
-        "word_segments": word_segments
-    }
+    worker.join()
+    if "error" in final_result:
+        raise final_result["error"]
+    yield "final", final_result["data"]
 
 
 # For standalone testing
 if __name__ == "__main__":
+    get_thread_governor().configure_process()
     data = transcribe_audio(AUDIO_FILE)
     print("\n📝 Transcript:\n")
-    print(data["transcript"]) 
+    print(data["transcript"])
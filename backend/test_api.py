@@ -0,0 +1,22 @@
+# test_api.py
+"""
+Tests for the FastAPI endpoints' execution model.
+"""
+
+import inspect
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+import api
+
+
+@pytest.mark.parametrize("endpoint", [
+    api.analyze_audio,
+    api.analyze_audio_tiered,
+    api.analyze_audio_stream,
+])
+def test_blocking_endpoints_run_in_the_thread_pool(endpoint):
+    # An async handler calling the blocking pipeline would stall the event loop
+    assert not inspect.iscoroutinefunction(endpoint)
@@ -0,0 +1,113 @@
+# test_audio_context.py
+"""
+Tests for the per-request audio context and the VAD result it shares.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import audio_context
+import speech_to_text
+from audio_context import AudioContext
+from pause_analytics import analyze_pauses
+from speech_features import compute_pause_ratio
+from utils.word_segments import WordSegments
+from vad_engine import VADResult
+
+SR = 16000
+
+
+class _CountingEngine:
+    def __init__(self, result, delay=0.0):
+        self.result = result
+        self.delay = delay
+        self.calls = 0
+
+    def analyze(self, samples):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.result
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = _CountingEngine(VADResult([0.5, 3.0], [2.0, 9.0], 10.0))
+    monkeypatch.setattr(audio_context, "get_vad_engine", lambda: engine)
+    return engine
+
+
+def _context():
+    return AudioContext.from_samples(np.zeros(10 * SR, dtype=np.float32))
+
+
+def test_every_consumer_shares_one_vad_pass(monkeypatch, engine):
+    ctx = _context()
+
+    pipeline = SimpleNamespace(calls=[])
+
+    def _transcribe(audio, **kwargs):
+        pipeline.calls.append(kwargs)
+        return iter([]), None
+
+    pipeline.transcribe = _transcribe
+    monkeypatch.setattr(speech_to_text, "get_batched_pipeline", lambda *args: pipeline)
+
+    assert compute_pause_ratio(ctx) == (0.25, 2.5)
+    assert analyze_pauses(ctx, WordSegments())["pause_count"] == 1
+    speech_to_text.transcribe_audio(ctx, batched=True, use_cache=False, cpu_threads=2)
+
+    assert engine.calls == 1
+    assert pipeline.calls[0]["clip_timestamps"] == engine.result.clip_timestamps()
+
+
+def test_concurrent_readers_wait_for_one_pass(engine):
+    engine.delay = 0.05
+    ctx = _context()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(ctx.vad)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert engine.calls == 1
+    assert all(result is engine.result for result in results)
+
+
+def test_no_speech_is_all_pause(monkeypatch):
+    monkeypatch.setattr(audio_context, "get_vad_engine",
+                        lambda: _CountingEngine(VADResult([], [], 10.0)))
+    assert compute_pause_ratio(_context()) == (1.0, 0.0)
+
+
+def test_vad_result_totals():
+    vad = VADResult([0.5, 3.0], [2.0, 9.0], 10.0)
+    assert vad.speech_time == 7.5
+    assert vad.pause_time == 2.5
+    assert vad.pause_ratio == 0.25
+
+
+def test_timestamps_round_trip_in_samples():
+    timestamps = [{"start": 8000, "end": 32000}, {"start": 48000, "end": 144000}]
+    vad = VADResult.from_timestamps(timestamps, 160000)
+
+    np.testing.assert_allclose(vad.starts, [0.5, 3.0])
+    assert vad.duration == 10.0
+    assert vad.to_timestamps() == timestamps
+
+
+def test_clip_timestamps_group_pad_and_split():
+    vad = VADResult([1.0, 5.0, 40.0], [4.0, 20.0, 110.0], 120.0)
+    clips = vad.clip_timestamps(max_duration=30.0, pad=0.2)
+
+    # The first two segments share a clip; the 70 s one is split
+    assert clips[0] == {"start": 0.8, "end": 20.2}
+    assert clips[1]["start"] == 39.8
+    assert all(clip["end"] - clip["start"] <= 30.0 for clip in clips)
+    assert clips[-1]["end"] == pytest.approx(110.2)
+    for prev, nxt in zip(clips, clips[1:]):
+        assert nxt["start"] >= prev["end"]
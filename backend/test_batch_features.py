@@ -0,0 +1,103 @@
+# test_batch_features.py
+"""
+Tests for batch feature extraction workers.
+"""
+
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import numpy as np
+
+import batch_features
+import speech_to_text
+
+
+def test_worker_never_starts_parallel_pool(monkeypatch):
+    """A long recording transcribed in a batch worker decodes in-process."""
+    def _no_pool(*args, **kwargs):
+        raise AssertionError("batch worker started a parallel transcription pool")
+
+    used = {}
+
+    class _Model:
+        def transcribe(self, audio, language=None):
+            return iter([]), SimpleNamespace()
+
+    def _model(model_size, compute_type, cpu_threads):
+        used["cpu_threads"] = cpu_threads
+        return _Model()
+
+    monkeypatch.setattr(speech_to_text, "get_parallel_transcriber", _no_pool)
+    monkeypatch.setattr(speech_to_text, "get_batched_pipeline", _no_pool)
+    monkeypatch.setattr(speech_to_text, "get_whisper_model", _model)
+    monkeypatch.setattr(speech_to_text, "get_transcription_cache", lambda: None)
+    monkeypatch.setattr(batch_features, "_worker_transcribe", True)
+
+    import speech_features
+    monkeypatch.setattr(speech_features, "analyze_speech",
+                        lambda ctx, words, extractor: (ctx.duration, len(words)))
+
+    # Longer than WHISPER_PARALLEL_MIN_DURATION
+    samples = np.zeros(16000 * 1000, dtype=np.float32)
+    duration, words = batch_features._analyze_one(((samples, 16000), None, None))
+
+    assert duration == 1000
+    assert words == 0
+    assert used["cpu_threads"] == 1
+
+
+def test_buffers_are_resampled_to_16k(monkeypatch):
+    import speech_features
+    monkeypatch.setattr(speech_features, "analyze_speech",
+                        lambda ctx, words, extractor: (ctx.sample_rate, len(ctx.samples)))
+
+    samples = np.zeros(44100 * 2, dtype=np.float32)
+    sample_rate, n = batch_features._analyze_one(((samples, 44100), [], None))
+
+    assert sample_rate == 16000
+    assert n == 32000
+
+
+class _InlineExecutor:
+    """Runs jobs on submit; records how many results were outstanding at once."""
+
+    def __init__(self, max_workers, mp_context=None, initializer=None, initargs=()):
+        self.outstanding = 0
+        self.max_outstanding = 0
+
+    def submit(self, fn, job):
+        self.outstanding += 1
+        self.max_outstanding = max(self.max_outstanding, self.outstanding)
+        future = _CountedFuture(self)
+        future.set_result(fn(job))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+class _CountedFuture(Future):
+    def __init__(self, executor):
+        super().__init__()
+        self.executor = executor
+
+    def result(self, timeout=None):
+        self.executor.outstanding -= 1
+        return super().result(timeout)
+
+
+def test_only_a_window_of_jobs_is_queued(monkeypatch):
+    executors = []
+
+    def _executor(**kwargs):
+        executors.append(_InlineExecutor(**kwargs))
+        return executors[-1]
+
+    monkeypatch.setattr(batch_features, "ProcessPoolExecutor", _executor)
+    monkeypatch.setattr(batch_features, "_analyze_one", lambda job: job[0])
+
+    results = list(batch_features.analyze_speech_batch(
+        [f"{i}.wav" for i in range(20)], workers=2, max_in_flight=3))
+
+    assert executors[0].max_outstanding <= 3
+    assert sorted(results) == [(i, f"{i}.wav", None) for i in range(20)]
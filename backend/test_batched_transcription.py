@@ -0,0 +1,88 @@
+# test_batched_transcription.py
+"""
+Tests for batched Whisper inference on long recordings.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import speech_to_text
+from audio_context import AudioContext
+from speech_config import WHISPER_BATCHED_MIN_DURATION, WHISPER_BATCH_SIZE
+from vad_engine import VADResult
+
+SR = 16000
+
+
+class _Pipeline:
+    """Fake BatchedInferencePipeline returning canned segments."""
+
+    def __init__(self, segments):
+        self.segments = segments
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append(kwargs)
+        return iter(self.segments), SimpleNamespace()
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    pipeline = _Pipeline([
+        SimpleNamespace(text="Good morning", start=1.0, end=2.0),
+        SimpleNamespace(text="and welcome back.", start=40.0, end=43.0),
+    ])
+
+    def _sequential(*args, **kwargs):
+        raise AssertionError("batched transcription used the sequential model")
+
+    monkeypatch.setattr(speech_to_text, "get_batched_pipeline", lambda *args: pipeline)
+    monkeypatch.setattr(speech_to_text, "get_whisper_model", _sequential)
+    return pipeline
+
+
+def _context(seconds):
+    ctx = AudioContext.from_samples(np.zeros(int(seconds * SR), dtype=np.float32))
+    ctx._vad = VADResult([1.0, 40.0], [10.0, 45.0], seconds)
+    return ctx
+
+
+def test_batched_decodes_the_shared_vad_clips(pipeline):
+    ctx = _context(60.0)
+    speech_to_text.transcribe_audio(ctx, batched=True, batch_size=4, use_cache=False, cpu_threads=2)
+
+    (call,) = pipeline.calls
+    assert call["batch_size"] == 4
+    assert call["clip_timestamps"] == ctx.vad.clip_timestamps()
+
+
+def test_segments_are_stitched_into_the_usual_structures(pipeline):
+    data = speech_to_text.transcribe_audio(_context(60.0), batched=True, use_cache=False, cpu_threads=2)
+
+    assert data["transcript"] == "Good morning and welcome back."
+    assert [(s["start"], s["end"]) for s in data["segments"]] == [(1.0, 2.0), (40.0, 43.0)]
+    assert data["word_segments"][0] == {"word": "Good", "start": 1.0, "end": 1.5}
+    assert data["word_segments"][-1] == {"word": "back.", "start": 42.0, "end": 43.0}
+
+
+def test_long_recordings_are_batched_by_default(pipeline):
+    speech_to_text.transcribe_audio(_context(WHISPER_BATCHED_MIN_DURATION), use_cache=False, cpu_threads=2)
+
+    assert pipeline.calls[0]["batch_size"] == WHISPER_BATCH_SIZE
+
+
+def test_short_recordings_decode_sequentially(monkeypatch, pipeline):
+    used = []
+
+    class _Model:
+        def transcribe(self, audio, language=None):
+            used.append(len(audio))
+            return iter([]), SimpleNamespace()
+
+    monkeypatch.setattr(speech_to_text, "get_whisper_model", lambda *args: _Model())
+    speech_to_text.transcribe_audio(_context(10.0), use_cache=False, cpu_threads=2)
+
+    assert used == [10 * SR]
+    assert pipeline.calls == []
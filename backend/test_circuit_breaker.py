@@ -0,0 +1,99 @@
+# test_circuit_breaker.py
+"""
+Tests for the LLM circuit breaker state machine.
+"""
+
+from llm1.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def _breaker(**kwargs):
+    options = dict(window=10, min_calls=5, error_rate=0.5, open_sec=60, slow_call_sec=30)
+    options.update(kwargs)
+    return CircuitBreaker(**options)
+
+
+def _open(breaker):
+    tickets = [breaker.allow() for _ in range(5)]
+    for ticket in tickets:
+        breaker.record(ticket, False)
+    assert breaker.state == OPEN
+
+
+def test_opens_on_error_rate_and_rejects_calls():
+    breaker = _breaker()
+    _open(breaker)
+    assert breaker.allow() is None
+
+
+def test_slow_calls_count_as_failures():
+    breaker = _breaker(slow_call_sec=1)
+    for _ in range(5):
+        breaker.record(breaker.allow(), True, latency=2)
+    assert breaker.state == OPEN
+
+
+def test_half_open_trial_success_closes():
+    breaker = _breaker()
+    _open(breaker)
+    breaker.open_sec = 0
+
+    trial = breaker.allow()
+    assert trial is not None and trial.trial
+    assert breaker.state == HALF_OPEN
+    # Only one trial at a time
+    assert breaker.allow() is None
+
+    breaker.record(trial, True)
+    assert breaker.state == CLOSED
+    assert breaker.allow() is not None
+
+
+def test_half_open_trial_failure_reopens():
+    breaker = _breaker()
+    _open(breaker)
+    breaker.open_sec = 0
+
+    trial = breaker.allow()
+    breaker.record(trial, False)
+    assert breaker.state == OPEN
+
+
+def test_stale_results_do_not_change_state():
+    breaker = _breaker()
+    late = breaker.allow()          # admitted while closed, finishes late
+    _open(breaker)
+
+    breaker.record(late, True)
+    assert breaker.state == OPEN
+
+    breaker.open_sec = 0
+    trial = breaker.allow()
+    assert breaker.state == HALF_OPEN
+
+    # A stale success neither closes the breaker nor frees the trial slot
+    breaker.record(late, True)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() is None
+
+    breaker.record(trial, False)
+    assert breaker.state == OPEN
+
+
+def test_trial_result_after_probe_closed_is_ignored():
+    breaker = _breaker()
+    _open(breaker)
+    breaker.open_sec = 0
+    trial = breaker.allow()
+
+    breaker.record_probe(True)
+    assert breaker.state == CLOSED
+
+    breaker.record(trial, False)
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["recent_calls"] == 0
+
+
+def test_probe_ignored_while_closed():
+    breaker = _breaker()
+    breaker.record_probe(False)
+    assert breaker.state == CLOSED
@@ -0,0 +1,95 @@
+# test_feature_store.py
+"""
+Tests for the partitioned Parquet feature store.
+"""
+
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+ds = pytest.importorskip("pyarrow.dataset")
+
+import feature_store
+from feature_store import FeatureStore, feature_row
+
+RESULTS = {"Total Words": 42, "energy_level": "medium", "speech_rate": 130.0, "Pitch Variance": 0.2}
+AGENTS = {
+    "communication_analysis": {"communication_score": 71},
+    "confidence_emotion_analysis": {"confidence_score": "64"},
+    "personality_analysis": {"personality_type": "Analytical"},
+}
+
+
+def _row(recording_id, date=None, **overrides):
+    row = feature_row(RESULTS, 55.0, "Moderate", egemaps=np.arange(3, dtype=np.float64),
+                      agent_results=AGENTS, recording_id=recording_id)
+    if date is not None:
+        row["date"] = date
+        row["analyzed_at"] = datetime.fromisoformat(date).replace(tzinfo=timezone.utc)
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FeatureStore(str(tmp_path / "features"), batch_size=2)
+
+
+def test_write_read_round_trip(store):
+    store.append(_row("a"))
+    assert store._buffer and not os.path.exists(store.root)
+    store.append(_row("b"))
+
+    table = store.read().sort_by("recording_id")
+    assert table.column("recording_id").to_pylist() == ["a", "b"]
+    first = table.to_pylist()[0]
+    assert first["total_words"] == 42
+    assert first["communication_score"] == 71.0
+    assert first["agent_confidence_score"] == 64.0
+    assert first["personality_type"] == "Analytical"
+    assert first["egemaps"] == [0.0, 1.0, 2.0]
+
+
+def test_partition_filter_and_projection(store):
+    store.append_many([
+        _row("old", "2026-09-30", confidence_score=40.0),
+        _row("new-low", "2026-10-02", confidence_score=40.0),
+        _row("new-high", "2026-10-03", confidence_score=80.0),
+    ])
+    store.flush()
+
+    table = store.read(
+        columns=["recording_id", "confidence_score"],
+        filter=(ds.field("date") >= "2026-10-01") & (ds.field("confidence_score") < 50),
+    )
+    assert table.column_names == ["recording_id", "confidence_score"]
+    assert table.column("recording_id").to_pylist() == ["new-low"]
+
+
+def test_non_string_agent_fields_are_coerced(store):
+    agents = dict(AGENTS, personality_analysis={"personality_type": ["Analytical", "Reserved"]})
+    row = feature_row(RESULTS, 55.0, "Moderate", agent_results=agents, recording_id="x")
+    assert row["personality_type"] == "Analytical, Reserved"
+
+    store.append_many([row, _row("y")])
+    assert sorted(store.read(columns=["recording_id"]).column(0).to_pylist()) == ["x", "y"]
+
+
+def test_failed_write_is_dropped_not_retried(store, monkeypatch):
+    calls = []
+
+    def _failing_write(*args, **kwargs):
+        calls.append(1)
+        raise OSError("disk full")
+
+    monkeypatch.setattr(feature_store.ds, "write_dataset", _failing_write)
+    store.append_many([_row("a"), _row("b")])
+    assert calls == [1]
+    assert store._buffer == []
+
+    monkeypatch.undo()
+    store.append_many([_row("c"), _row("d")])
+    assert sorted(store.read(columns=["recording_id"]).column(0).to_pylist()) == ["c", "d"]
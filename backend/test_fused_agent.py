@@ -0,0 +1,122 @@
+# test_fused_agent.py
+"""
+Tests for the fused single-call agent mode.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import agent
+from agents import fused_agent as fused_module
+from agents import output_cache
+from agents.output_cache import BucketCache, parse_buckets
+from llm1.llm_config import AGENT_CACHE_DEFAULT_BUCKETS
+
+STATE = {
+    "transcript": "Good morning everyone, here are the results for the quarter.",
+    "audio_features": {
+        "speech_rate": 132,
+        "pitch_variance": 0.21,
+        "pause_ratio": 0.17,
+        "energy_level": "medium-high",
+    },
+}
+
+
+def _fused_response(tone="calm"):
+    response = {
+        section: {key: f"{section}:{key}" for key in required}
+        for section, (_, required) in fused_module.FUSED_SCHEMAS.items()
+    }
+    response["confidence_emotion_analysis"]["emotional_tone"] = tone
+    return response
+
+
+def _answer(response):
+    """Fake provider LLM that answers every prompt with `response`."""
+    text = json.dumps(response)
+    return SimpleNamespace(invoke_provider=lambda prompt: text, fallback=None)
+
+
+@pytest.fixture(autouse=True)
+def _offline(monkeypatch):
+    monkeypatch.setattr(fused_module, "_get_communication_context", lambda state: "")
+    monkeypatch.setattr(fused_module, "_get_confidence_context", lambda state: "")
+    monkeypatch.setattr(fused_module, "validate_agent_response", lambda output, name: output)
+    monkeypatch.setattr(output_cache, "get_agent_cache", lambda name: None)
+
+
+@pytest.fixture
+def per_agent_calls(monkeypatch):
+    calls = []
+
+    def _agent(name, key):
+        def _run(state):
+            calls.append(name)
+            return {key: {"from": name}}
+        return _run
+
+    monkeypatch.setattr(agent, "communication_agent", _agent("communication", "communication_analysis"))
+    monkeypatch.setattr(agent, "confidence_agent", _agent("confidence", "confidence_emotion_analysis"))
+    monkeypatch.setattr(agent, "personality_agent", _agent("personality", "personality_analysis"))
+    return calls
+
+
+def test_well_formed_response_skips_the_per_agent_path(monkeypatch, per_agent_calls):
+    monkeypatch.setattr(fused_module, "llm", _answer(_fused_response()))
+
+    result = agent.run_agents(STATE, mode="fused")
+
+    assert per_agent_calls == []
+    assert result["personality_analysis"]["overall_summary"] == "personality_analysis:overall_summary"
+    assert isinstance(result["confidence_emotion_analysis"]["confidence_score"], (int, float))
+
+
+@pytest.mark.parametrize("breakage", ["missing_section", "missing_key", "not_json"])
+def test_malformed_response_falls_back_to_per_agent_path(monkeypatch, per_agent_calls, breakage):
+    response = _fused_response()
+    if breakage == "missing_section":
+        del response["personality_analysis"]
+    elif breakage == "missing_key":
+        del response["communication_analysis"]["clarity_level"]
+    llm = _answer(response)
+    if breakage == "not_json":
+        llm = SimpleNamespace(invoke_provider=lambda prompt: "I cannot answer that.", fallback=None)
+    monkeypatch.setattr(fused_module, "llm", llm)
+
+    result = agent.run_agents(STATE, mode="fused")
+
+    assert sorted(per_agent_calls) == ["communication", "confidence", "personality"]
+    assert result["communication_analysis"] == {"from": "communication"}
+    assert result["personality_analysis"] == {"from": "personality"}
+
+
+def test_confidence_section_goes_through_the_bucket_cache(monkeypatch):
+    cache = BucketCache("confidence", parse_buckets(AGENT_CACHE_DEFAULT_BUCKETS["confidence"]))
+    monkeypatch.setattr(output_cache, "get_agent_cache", lambda name: cache if name == "confidence" else None)
+
+    monkeypatch.setattr(fused_module, "llm", _answer(_fused_response(tone="calm")))
+    first = fused_module.fused_agent(STATE)
+
+    # A recording in the same buckets reuses the stored confidence analysis
+    monkeypatch.setattr(fused_module, "llm", _answer(_fused_response(tone="tense")))
+    second = fused_module.fused_agent(STATE)
+
+    assert first["confidence_emotion_analysis"]["emotional_tone"] == "calm"
+    assert second["confidence_emotion_analysis"]["emotional_tone"] == "calm"
+    assert second["communication_analysis"] == first["communication_analysis"]
+    assert cache.stats()["hits"] == 1
+
+
+def test_stub_answers_are_not_cached(monkeypatch):
+    cache = BucketCache("confidence", parse_buckets(AGENT_CACHE_DEFAULT_BUCKETS["confidence"]))
+    monkeypatch.setattr(output_cache, "get_agent_cache", lambda name: cache if name == "confidence" else None)
+
+    text = json.dumps(_fused_response())
+    stub = SimpleNamespace(invoke=lambda prompt: text)
+    monkeypatch.setattr(fused_module, "llm", SimpleNamespace(invoke_provider=lambda prompt: None, fallback=stub))
+
+    assert fused_module.fused_agent(STATE) is not None
+    assert cache.stats()["entries"] == 0
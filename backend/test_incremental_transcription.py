@@ -0,0 +1,95 @@
+# test_incremental_transcription.py
+"""
+Tests for the incremental transcription generator and its async variant.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import speech_to_text
+from audio_context import AudioContext
+from speech_to_text import TranscriptAccumulator, iter_transcription
+
+SEGMENTS = [
+    SimpleNamespace(text="Hello there.", start=0.0, end=1.0),
+    SimpleNamespace(text="How are you", start=1.5, end=3.0),
+    SimpleNamespace(text="today?", start=3.0, end=3.5),
+]
+
+
+@pytest.fixture
+def decoded(monkeypatch):
+    """Segments the fake decoder has produced so far."""
+    decoded = []
+
+    def _decode(*args):
+        for seg in SEGMENTS:
+            decoded.append(seg)
+            yield seg
+
+    monkeypatch.setattr(speech_to_text, "_start_transcription", _decode)
+    return decoded
+
+
+def _context():
+    return AudioContext.from_samples(np.zeros(4 * 16000, dtype=np.float32))
+
+
+def test_segments_are_yielded_as_they_are_decoded(decoded):
+    accumulator = TranscriptAccumulator()
+    events = iter_transcription(_context(), accumulator=accumulator, use_cache=False)
+
+    first = next(events)
+    assert len(decoded) == 1
+    assert first["segment"] == {"text": "Hello there.", "start": 0.0, "end": 1.0}
+    assert first["words"].words == ["Hello", "there."]
+    assert accumulator.transcript == "Hello there."
+
+    second = next(events)
+    assert len(decoded) == 2
+    assert second["words"].to_list()[0] == {"word": "How", "start": 1.5, "end": 2.0}
+    assert accumulator.transcript == "Hello there. How are you"
+
+
+def test_exhausted_accumulator_matches_transcribe_audio(decoded):
+    accumulator = TranscriptAccumulator()
+    for _ in iter_transcription(_context(), accumulator=accumulator, use_cache=False):
+        pass
+
+    assert accumulator.to_dict() == speech_to_text.transcribe_audio(_context(), use_cache=False)
+    assert len(accumulator.word_segments) == 6
+
+
+def test_async_iterator_yields_the_same_events(monkeypatch, decoded):
+    monkeypatch.setattr(speech_to_text, "get_transcription_cache", lambda: None)
+
+    async def _collect():
+        accumulator = TranscriptAccumulator()
+        events = [event async for event in speech_to_text.aiter_transcription(_context(), accumulator=accumulator)]
+        return events, accumulator
+
+    events, accumulator = asyncio.run(_collect())
+
+    assert [event["segment"]["text"] for event in events] == [seg.text for seg in SEGMENTS]
+    assert accumulator.transcript == "Hello there. How are you today?"
+
+
+def test_async_iterator_reraises_decoder_errors(monkeypatch):
+    def _failing(*args):
+        yield SEGMENTS[0]
+        raise RuntimeError("decoder crashed")
+
+    monkeypatch.setattr(speech_to_text, "_start_transcription", _failing)
+    monkeypatch.setattr(speech_to_text, "get_transcription_cache", lambda: None)
+
+    async def _collect():
+        seen = []
+        with pytest.raises(RuntimeError, match="decoder crashed"):
+            async for event in speech_to_text.aiter_transcription(_context()):
+                seen.append(event)
+        return seen
+
+    assert len(asyncio.run(_collect())) == 1
@@ -0,0 +1,77 @@
+# test_model_bundle.py
+"""
+Tests for the offline model bundle manifest and MiniLM fetch.
+"""
+
+import io
+import tarfile
+
+import pytest
+
+import model_bundle
+
+
+@pytest.fixture
+def bundle(tmp_path):
+    (tmp_path / "whisper" / "small").mkdir(parents=True)
+    (tmp_path / "whisper" / "small" / "model.bin").write_bytes(b"weights" * 100)
+    (tmp_path / "minilm" / "onnx").mkdir(parents=True)
+    (tmp_path / "minilm" / "onnx" / "model.onnx").write_bytes(b"onnx" * 50)
+    (tmp_path / "empty.txt").write_bytes(b"")
+    model_bundle.write_manifest(str(tmp_path))
+    return tmp_path
+
+
+def test_intact_bundle_verifies(bundle):
+    assert model_bundle.verify_bundle(str(bundle)) == []
+
+
+def test_tampered_file_is_rejected(bundle):
+    path = bundle / "whisper" / "small" / "model.bin"
+    data = bytearray(path.read_bytes())
+    data[10] ^= 0xFF   # same size, different content
+    path.write_bytes(bytes(data))
+
+    assert model_bundle.verify_bundle(str(bundle)) == ["checksum mismatch whisper/small/model.bin"]
+
+
+def test_truncated_and_missing_files_are_rejected(bundle):
+    (bundle / "minilm" / "onnx" / "model.onnx").write_bytes(b"onnx")
+    (bundle / "empty.txt").unlink()
+
+    assert sorted(model_bundle.verify_bundle(str(bundle))) == [
+        "missing empty.txt", "size mismatch minilm/onnx/model.onnx",
+    ]
+
+
+def test_missing_manifest(tmp_path):
+    assert model_bundle.verify_bundle(str(tmp_path)) == [f"missing {model_bundle.MANIFEST_NAME}"]
+
+
+def _archive(path, entries):
+    with tarfile.open(path, "w:gz") as tar:
+        for name, data in entries.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return path.as_uri(), model_bundle._sha256(str(path))
+
+
+def test_fetch_minilm_checks_the_archive(tmp_path):
+    url, sha256 = _archive(tmp_path / "onnx.tar.gz", {"onnx/model.onnx": b"model"})
+    target = tmp_path / "bundle"
+
+    with pytest.raises(RuntimeError, match="checksum mismatch"):
+        model_bundle.fetch_minilm(str(target), url=url, sha256="0" * 64)
+    assert not (target / "minilm").exists()
+
+    model_bundle.fetch_minilm(str(target), url=url, sha256=sha256)
+    assert (target / "minilm" / "onnx" / "model.onnx").read_bytes() == b"model"
+
+
+def test_fetch_minilm_refuses_paths_outside_the_bundle(tmp_path):
+    url, sha256 = _archive(tmp_path / "onnx.tar.gz", {"../escaped.txt": b"x"})
+
+    with pytest.raises(RuntimeError, match="Unsafe entry"):
+        model_bundle.fetch_minilm(str(tmp_path / "bundle"), url=url, sha256=sha256)
+    assert not (tmp_path / "escaped.txt").exists()
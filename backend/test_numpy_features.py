@@ -0,0 +1,59 @@
+# test_numpy_features.py
+"""
+Tests for the pure-NumPy acoustic extractor.
+"""
+
+import numpy as np
+import pytest
+
+import numpy_features
+import spectral_frontend
+from audio_context import AudioContext
+from spectral_frontend import SpectralFrontEnd
+
+SR = 16000
+
+
+def _tone(freq, seconds=2.0, amplitude=0.5):
+    t = np.arange(int(seconds * SR)) / SR
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def _front_end(samples):
+    return SpectralFrontEnd.of(AudioContext.from_samples(samples, SR))
+
+
+@pytest.mark.parametrize("freq", [80.0, 200.0, 440.0])
+def test_yin_finds_a_pure_tone(freq):
+    f0 = _front_end(_tone(freq)).extract("pitch")
+
+    assert (f0 > 0).all()
+    assert np.median(f0) == pytest.approx(freq, rel=0.01)
+
+
+def test_silence_is_unvoiced():
+    samples = np.concatenate([np.zeros(SR, dtype=np.float32), _tone(200.0, 1.0)])
+    f0 = _front_end(samples).extract("pitch")
+
+    # Frames entirely inside the leading second of silence
+    frames_in_silence = int((1.0 - numpy_features.FRAME_SEC) / spectral_frontend.HOP_SEC)
+    assert (f0[:frames_in_silence] == 0).all()
+    assert np.median(f0[f0 > 0]) == pytest.approx(200.0, rel=0.01)
+
+
+def test_block_boundaries_do_not_change_the_track(monkeypatch):
+    samples = _tone(150.0, 3.0) + _tone(230.0, 3.0, amplitude=0.1)
+    whole = _front_end(samples).extract("pitch")
+
+    monkeypatch.setattr(spectral_frontend, "BLOCK_FRAMES", 7)
+    blocked = _front_end(samples).extract("pitch")
+
+    np.testing.assert_allclose(blocked, whole)
+
+
+def test_pitch_mean_is_in_semitones_from_27_5_hz():
+    features = numpy_features.extract_numpy_features(AudioContext.from_samples(_tone(220.0), SR))
+
+    assert features["pitch_mean"] == pytest.approx(12 * np.log2(220.0 / 27.5), abs=0.1)
+    assert features["pitch_variance"] < 0.01
+    assert features["jitter"] < 0.01
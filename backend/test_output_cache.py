@@ -0,0 +1,49 @@
+# test_output_cache.py
+"""
+Tests for the feature-bucket agent output cache.
+"""
+
+from agents.output_cache import BucketCache, parse_buckets
+from llm1.llm_config import AGENT_CACHE_DEFAULT_BUCKETS
+
+
+def _confidence_cache():
+    return BucketCache("confidence", parse_buckets(AGENT_CACHE_DEFAULT_BUCKETS["confidence"]))
+
+
+def _inputs(pitch_variance, energy_level="medium", pause_ratio=0.18, confidence_score=62.0):
+    return {
+        "pitch_variance": pitch_variance,
+        "energy_level": energy_level,
+        "pause_ratio": pause_ratio,
+        "confidence_score": confidence_score,
+    }
+
+
+def test_key_separates_realistic_pitch_variation():
+    cache = _confidence_cache()
+    # eGeMAPS normalised F0 deviation: monotone vs. lively speakers
+    monotone, typical, lively = (cache.key(_inputs(v)) for v in (0.08, 0.21, 0.42))
+    assert len({monotone, typical, lively}) == 3
+
+
+def test_key_groups_near_identical_inputs():
+    cache = _confidence_cache()
+    assert cache.key(_inputs(0.21, pause_ratio=0.16)) == cache.key(_inputs(0.22, pause_ratio=0.17))
+
+
+def test_key_separates_energy_levels():
+    cache = _confidence_cache()
+    assert cache.key(_inputs(0.21, energy_level="low")) != cache.key(_inputs(0.21, energy_level="high"))
+
+
+def test_hits_return_copies_and_count():
+    cache = _confidence_cache()
+    assert cache.get(_inputs(0.21)) is None
+    cache.put(_inputs(0.21), {"confidence_level": "High"})
+
+    hit = cache.get(_inputs(0.22))
+    hit["confidence_level"] = "Low"
+    assert cache.get(_inputs(0.21)) == {"confidence_level": "High"}
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
@@ -0,0 +1,103 @@
+# test_parallel_transcription.py
+"""
+Tests for chunk planning and overlap stitching in parallel transcription.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import parallel_transcription
+from parallel_transcription import SAMPLE_RATE, plan_chunks
+
+SEC = SAMPLE_RATE
+
+
+def _speech(*spans):
+    return [{"start": int(a * SEC), "end": int(b * SEC)} for a, b in spans]
+
+
+def test_short_audio_is_one_chunk():
+    chunks = plan_chunks(_speech((0, 50)), 80 * SEC, 60 * SEC, SEC)
+    assert chunks == [(0, 80 * SEC, 0, 80 * SEC)]
+
+
+def test_cuts_at_the_gap_nearest_the_target():
+    # Gaps centred at 30 s, 58 s and 75 s; the 58 s one is nearest 60 s
+    speech = _speech((0, 29), (31, 57), (59, 74), (76, 150))
+    chunks = plan_chunks(speech, 150 * SEC, 60 * SEC, SEC)
+
+    assert chunks[0][:2] == (0, 58 * SEC)
+    assert chunks[1][0] == 58 * SEC
+
+
+def test_hard_cut_when_the_speaker_never_pauses():
+    chunks = plan_chunks(_speech((0, 200)), 200 * SEC, 60 * SEC, SEC)
+    assert [core_start for core_start, *_ in chunks] == [0, 60 * SEC, 120 * SEC]
+
+
+def test_cores_tile_the_audio_and_pads_stay_inside_it():
+    speech = _speech(*[(t, t + 9) for t in range(0, 600, 10)])
+    total = 600 * SEC
+    chunks = plan_chunks(speech, total, 60 * SEC, SEC)
+
+    assert chunks[0][0] == 0 and chunks[-1][1] == total
+    for (_, end, _, _), (start, _, _, _) in zip(chunks, chunks[1:]):
+        assert end == start
+    for core_start, core_end, pad_start, pad_end in chunks:
+        assert pad_start == max(0, core_start - SEC)
+        assert pad_end == min(total, core_end + SEC)
+    # Every cut lies in a silence
+    for _, core_end, _, _ in chunks[:-1]:
+        assert not any(s["start"] <= core_end < s["end"] for s in speech)
+
+
+class _OverlapModel:
+    """Hears every word whose span falls inside the chunk it is given."""
+
+    def __init__(self, words):
+        self.words = words   # (word, start_sec, end_sec) in global time
+        self.pad_start = 0
+
+    def transcribe(self, samples, language=None):
+        begin = self.pad_start / SEC
+        end = begin + len(samples) / SEC
+        segments = [
+            SimpleNamespace(text=f" {word}", start=start - begin, end=stop - begin)
+            for word, start, stop in self.words
+            if start >= begin and stop <= end
+        ]
+        return iter(segments), SimpleNamespace()
+
+
+def test_words_in_overlaps_are_kept_exactly_once(monkeypatch):
+    # One word every 0.5 s for 200 s, no pauses: every cut is a hard cut
+    words = [(f"w{i}", i * 0.5, i * 0.5 + 0.4) for i in range(400)]
+    total = 200 * SEC
+    chunks = plan_chunks(_speech((0, 200)), total, 60 * SEC, 2 * SEC)
+    model = _OverlapModel(words)
+    monkeypatch.setattr(parallel_transcription, "_worker_model", model)
+
+    kept = []
+    for i, (core_start, core_end, pad_start, pad_end) in enumerate(chunks):
+        model.pad_start = pad_start
+        job = (
+            [0.0] * (pad_end - pad_start), pad_start, core_start, core_end, i == len(chunks) - 1
+        )
+        kept.extend(seg["text"].strip() for seg in parallel_transcription._transcribe_chunk(job))
+
+    assert kept == [word for word, _, _ in words]
+
+
+def test_multi_word_segment_is_split_at_the_core_boundary(monkeypatch):
+    model = SimpleNamespace(transcribe=lambda samples, language=None: (iter([
+        # Four words over 8-12 s, the core ends at 10 s
+        SimpleNamespace(text=" a b c d", start=8.0, end=12.0),
+    ]), None))
+    monkeypatch.setattr(parallel_transcription, "_worker_model", model)
+
+    first = parallel_transcription._transcribe_chunk(([0.0] * 12 * SEC, 0, 0, 10 * SEC, False))
+    assert first == [{"text": " a b", "start": 8.0, "end": 10.0}]
+
+    second = parallel_transcription._transcribe_chunk(([0.0] * 12 * SEC, 0, 10 * SEC, 20 * SEC, True))
+    assert second == [{"text": " c d", "start": 10.0, "end": 12.0}]
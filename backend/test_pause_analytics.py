@@ -0,0 +1,68 @@
+# test_pause_analytics.py
+"""
+Tests for pause-structure analytics.
+"""
+
+import numpy as np
+import pytest
+
+from audio_context import AudioContext
+from pause_analytics import analyze_pauses, pause_durations
+from utils.word_segments import WordSegments
+from vad_engine import VADResult
+
+# A cough, then speech with a mid-sentence pause, a sentence break and a
+# silence too short to count
+VAD = VADResult([0.0, 0.5, 2.6, 5.0, 6.1], [0.2, 2.0, 4.0, 6.0, 8.0], 9.0)
+
+WORDS = WordSegments.from_list([
+    {"word": "Hello", "start": 0.5, "end": 1.0},
+    {"word": "there,", "start": 1.0, "end": 2.0},
+    {"word": "I", "start": 2.6, "end": 3.0},
+    {"word": "am", "start": 3.0, "end": 3.5},
+    {"word": "done.", "start": 3.5, "end": 4.0},
+    {"word": "Next", "start": 5.0, "end": 6.0},
+    {"word": "one.", "start": 6.1, "end": 8.0},
+])
+
+
+@pytest.fixture
+def ctx():
+    ctx = AudioContext.from_samples(np.zeros(9 * 16000, dtype=np.float32))
+    ctx._vad = VAD
+    return ctx
+
+
+def test_short_silences_are_not_pauses():
+    starts, durations = pause_durations(VAD)
+    np.testing.assert_allclose(starts, [0.2, 2.0, 4.0])
+    np.testing.assert_allclose(durations, [0.3, 0.6, 1.0])
+
+
+def test_pauses_are_classified_by_the_preceding_word(ctx):
+    result = analyze_pauses(ctx, WORDS)
+
+    assert result["pause_count"] == 3
+    # "there," precedes a mid-sentence pause, "done." a sentence break; the
+    # pause after the cough has no preceding word and is neither
+    assert result["mid_sentence_pauses"] == 1
+    assert result["between_sentence_pauses"] == 1
+
+
+def test_rates_and_histogram(ctx):
+    result = analyze_pauses(ctx, WORDS)
+
+    assert result["pauses_per_minute"] == 20.0
+    assert result["mean_pause"] == 0.63
+    assert result["longest_pause"] == 1.0
+    assert result["pause_histogram"] == {"0.25-0.5s": 1, "0.5-1s": 1, "1-2s": 1, "2s+": 0}
+    # 7 words over 6 s of speech; pauses do not slow the articulation rate
+    assert result["articulation_rate"] == 70.0
+
+
+def test_no_words(ctx):
+    result = analyze_pauses(ctx, WordSegments())
+
+    assert result["pause_count"] == 3
+    assert result["mid_sentence_pauses"] == result["between_sentence_pauses"] == 0
+    assert result["articulation_rate"] == 0
@@ -0,0 +1,74 @@
+# test_prosody.py
+"""
+Tests for windowed prosody time-series.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+import prosody
+from audio_context import AudioContext
+from vad_engine import VADResult
+
+_COLUMNS = [name for name, _ in prosody._TRACKS.values()]
+
+
+@pytest.fixture
+def ctx(monkeypatch):
+    """2.5 s of descriptors: a voiced window, an unvoiced one and a partial one."""
+    lld = np.zeros((250, len(_COLUMNS)))
+    lld[:, 0] = 1.0                                  # loudness
+    lld[:100, 1] = np.tile([10.0, 20.0], 50)         # pitch in the first window
+    lld[200:, 1] = 30.0                              # and in the partial last one
+    lld[:100, 2] = 0.01                              # jitter
+    lld[:100, 3] = 0.5                               # shimmer
+
+    monkeypatch.setattr(prosody, "EGEMAPS_LLD_INDEX", {name: i for i, name in enumerate(_COLUMNS)})
+    monkeypatch.setattr(prosody, "extract_egemaps_lld", lambda audio: lld)
+
+    ctx = AudioContext.from_samples(np.zeros(40000, dtype=np.float32))
+    ctx._vad = VADResult([0.0, 2.0], [0.5, 2.5], 2.5)
+    return ctx
+
+
+def test_partial_last_window_is_padded_not_diluted(ctx):
+    windows = prosody.prosody_windows(ctx, window_sec=1.0)
+
+    assert len(windows) == 3
+    np.testing.assert_allclose(windows.starts, [0.0, 1.0, 2.0])
+    # The padding frames count neither as loud nor as pauses
+    np.testing.assert_allclose(windows["loudness"], [1.0, 1.0, 1.0])
+    np.testing.assert_allclose(windows["pause_ratio"], [0.5, 1.0, 0.0])
+    assert windows["pitch_mean"][2] == 30.0
+
+
+def test_voiced_tracks_ignore_unvoiced_frames(ctx):
+    windows = prosody.prosody_windows(ctx, window_sec=1.0)
+
+    assert windows["pitch_mean"][0] == 15.0
+    assert windows["pitch_std"][0] == 5.0
+    assert windows["jitter"][0] == pytest.approx(0.01)
+    assert windows["shimmer"][0] == 0.5
+    # The middle window has no voiced frames at all
+    for name in ("pitch_mean", "pitch_std", "jitter", "shimmer"):
+        assert np.isnan(windows[name][1])
+
+
+def test_window_size_only_reshapes(ctx):
+    windows = prosody.prosody_windows(ctx, window_sec=0.5)
+
+    assert len(windows) == 5
+    np.testing.assert_allclose(windows["pause_ratio"], [0.0, 1.0, 1.0, 1.0, 0.0])
+    np.testing.assert_allclose(windows["pitch_mean"][:2], [15.0, 15.0])
+
+
+def test_to_dict_is_json_safe(ctx):
+    data = prosody.prosody_windows(ctx, window_sec=1.0).to_dict()
+
+    assert data["window_sec"] == 1.0
+    assert data["start"] == [0.0, 1.0, 2.0]
+    assert data["pitch_mean"] == [15.0, None, 30.0]
+    assert data["jitter"][1] is None
+    json.dumps(data, allow_nan=False)
@@ -0,0 +1,97 @@
+# test_provider.py
+"""
+Tests for the shared provider clients and their pooled session.
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from llm1 import provider
+
+
+class _EchoSession:
+    """Stands in for the pooled session: answers each prompt with itself."""
+
+    def __init__(self):
+        self.verify = True
+        self.posts = 0
+        self._lock = threading.Lock()
+
+    @property
+    def post(self):
+        # Looked up after the client stored the request and before it reads
+        # it back: give other threads time to store theirs meanwhile
+        time.sleep(0.01)
+        return self._post
+
+    def _post(self, url, headers=None, json=None, timeout=None, **kwargs):
+        with self._lock:
+            self.posts += 1
+        prompt = json["messages"][-1]["content"]
+        response = requests.models.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response._content = _dumps({
+            "id": "test",
+            "object": "chat.completion",
+            "model": json["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": prompt},
+                "finish_reason": "stop",
+            }],
+        })
+        return response
+
+
+def _dumps(payload):
+    return json.dumps(payload).encode("utf-8")
+
+
+@pytest.fixture
+def echo_session(monkeypatch):
+    pytest.importorskip("langchain_nvidia_ai_endpoints")
+    session = _EchoSession()
+    monkeypatch.setattr(provider, "NVIDIA_API_KEY", "nvapi-test")
+    monkeypatch.setattr(provider, "NVIDIA_BASE_URL", "http://localhost:9/v1")
+    monkeypatch.setattr(provider, "_session", session)
+    monkeypatch.setattr(provider, "_initialized", True)
+    monkeypatch.setattr(provider, "_available", True)
+    monkeypatch.setattr(provider, "_thread_models", threading.local())
+    return session
+
+
+def test_concurrent_invokes_get_their_own_answers(echo_session):
+    prompts = [f"prompt number {i}" for i in range(32)]
+
+    def _invoke(prompt):
+        return provider.get_chat_model().invoke(prompt).content
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        answers = list(pool.map(_invoke, prompts))
+
+    assert answers == prompts
+    assert echo_session.posts == len(prompts)
+
+
+def test_one_client_per_thread_over_one_session(echo_session):
+    models = []
+
+    def _grab():
+        models.append(provider.get_chat_model())
+        models.append(provider.get_chat_model())
+
+    threads = [threading.Thread(target=_grab) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert models[0] is models[1] and models[2] is models[3]
+    assert models[0] is not models[2]
+    assert all(model._client.get_session_fn() is echo_session for model in models)
@@ -0,0 +1,97 @@
+# test_provider_stream.py
+"""
+Tests for streamed provider answers: mid-stream failures and disconnects.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from llm1 import provider
+from llm1.circuit_breaker import HALF_OPEN, OPEN, CircuitBreaker
+from llm1.provider import ProviderLLM, StreamInterrupted
+from rag import rag_pipeline
+
+
+class _Fallback:
+    def invoke(self, prompt):
+        return "fallback report"
+
+
+class _Model:
+    def __init__(self, chunks, fail=False):
+        self.chunks = chunks
+        self.fail = fail
+
+    def stream(self, prompt):
+        for text in self.chunks:
+            yield SimpleNamespace(content=text)
+        if self.fail:
+            raise ConnectionError("connection reset")
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = CircuitBreaker(window=10, min_calls=1, error_rate=0.5, open_sec=0, slow_call_sec=30)
+    monkeypatch.setattr(provider, "get_circuit_breaker", lambda: breaker)
+    monkeypatch.setattr(provider, "get_response_cache", lambda: None)
+    return breaker
+
+
+def _use_model(monkeypatch, model):
+    monkeypatch.setattr(provider, "get_chat_model", lambda: model)
+
+
+def _half_open(breaker):
+    breaker.record(breaker.allow(), False)
+    assert breaker.state == OPEN
+
+
+def test_mid_stream_failure_is_raised_after_partial_chunks(monkeypatch, breaker):
+    _use_model(monkeypatch, _Model(["Hello", " wor"], fail=True))
+    received = []
+    with pytest.raises(StreamInterrupted):
+        for text in ProviderLLM(_Fallback()).stream("prompt"):
+            received.append(text)
+    assert received == ["Hello", " wor"]
+    assert breaker.state == OPEN
+
+
+def test_failure_before_first_chunk_uses_fallback(monkeypatch, breaker):
+    _use_model(monkeypatch, _Model([], fail=True))
+    assert list(ProviderLLM(_Fallback()).stream("prompt")) == ["fallback report"]
+    assert breaker.state == OPEN
+
+
+def test_client_disconnect_still_records_the_trial(monkeypatch, breaker):
+    _half_open(breaker)
+    _use_model(monkeypatch, _Model(["Hello", " world"]))
+
+    stream = ProviderLLM(_Fallback()).stream("prompt")
+    assert next(stream) == "Hello"
+    assert breaker.state == HALF_OPEN
+    stream.close()
+
+    # Without a record the trial would stay in flight and block every call
+    assert breaker.allow() is not None
+
+
+def test_report_stream_flags_truncated_report(monkeypatch, breaker):
+    _use_model(monkeypatch, _Model(["Partial"], fail=True))
+    monkeypatch.setattr(rag_pipeline, "report_llm", ProviderLLM(_Fallback()))
+    monkeypatch.setattr(rag_pipeline, "_report_prompt", lambda agent_outputs: "prompt")
+    monkeypatch.setattr(rag_pipeline, "validate_final_report", lambda report: report)
+
+    events = list(rag_pipeline.rag_enhanced_report_stream({}))
+    assert events[0] == {"type": "token", "text": "Partial"}
+    assert events[-1] == {"type": "report", "final_report": "fallback report", "truncated": True}
+
+
+def test_report_stream_complete_report(monkeypatch, breaker):
+    _use_model(monkeypatch, _Model(["Full", " report"]))
+    monkeypatch.setattr(rag_pipeline, "report_llm", ProviderLLM(_Fallback()))
+    monkeypatch.setattr(rag_pipeline, "_report_prompt", lambda agent_outputs: "prompt")
+    monkeypatch.setattr(rag_pipeline, "validate_final_report", lambda report: report)
+
+    events = list(rag_pipeline.rag_enhanced_report_stream({}))
+    assert events[-1] == {"type": "report", "final_report": "Full report", "truncated": False}
@@ -0,0 +1,127 @@
+# test_response_cache.py
+"""
+Tests for the two-tier LLM response cache.
+"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from llm1 import response_cache
+from llm1.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(path=str(tmp_path / "llm.sqlite3"), max_bytes=1024,
+                         memory_entries=8, ttl=60)
+
+
+def test_disk_tier_survives_restart(cache, tmp_path):
+    cache.put("k", "answer")
+    reopened = ResponseCache(path=str(tmp_path / "llm.sqlite3"), max_bytes=1024,
+                             memory_entries=8, ttl=60)
+    assert reopened.get("k") == "answer"
+    assert reopened.stats()["disk_hits"] == 1
+
+
+def test_entries_expire_after_ttl(cache, monkeypatch):
+    cache.put("k", "answer")
+    assert cache.get("k") == "answer"
+
+    later = time.time() + 61
+    monkeypatch.setattr(response_cache.time, "time", lambda: later)
+    assert cache.get("k") is None
+    count = cache._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    assert count == 0
+
+
+def test_disk_tier_evicts_least_recently_used_past_byte_budget(cache):
+    for i in range(3):
+        cache.put(f"k{i}", "x" * 300)
+        time.sleep(0.01)
+    # Reading k0 from disk makes k1 the least recently used
+    cache._memory.clear()
+    assert cache.get("k0") is not None
+    time.sleep(0.01)
+    cache.put("k3", "x" * 300)
+
+    keys = {row[0] for row in cache._conn.execute("SELECT key FROM responses")}
+    total = cache._conn.execute("SELECT SUM(size) FROM responses").fetchone()[0]
+    assert total <= cache.max_bytes
+    assert "k0" in keys and "k3" in keys
+    assert "k1" not in keys
+
+
+def test_memory_tier_is_bounded(cache):
+    for i in range(20):
+        cache.put(f"k{i}", "v")
+    assert cache.stats()["memory_entries"] == cache.memory_entries
+
+
+def test_concurrent_misses_share_one_call(cache):
+    calls = []
+    start = threading.Event()
+
+    def _compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return "answer"
+
+    results = []
+
+    def _caller():
+        start.wait()
+        results.append(cache.get_or_compute("k", _compute))
+
+    threads = [threading.Thread(target=_caller) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    start.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["answer"] * 6
+    assert len(calls) == 1
+
+
+def test_failed_call_propagates_and_is_not_cached(cache):
+    def _fail():
+        raise RuntimeError("provider down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("k", _fail)
+    assert cache.get("k") is None
+    assert cache.get_or_compute("k", lambda: "answer") == "answer"
+
+
+def test_disk_errors_do_not_lose_the_answer(cache, monkeypatch):
+    def _broken(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(cache, "_disk_put", _broken)
+    monkeypatch.setattr(cache, "_disk_get", _broken)
+
+    assert cache.get_or_compute("k", lambda: "answer") == "answer"
+    # Still served from the memory tier
+    assert cache.get("k") == "answer"
+    assert cache.get("other") is None
+
+
+def test_failed_init_is_not_retried(monkeypatch):
+    attempts = []
+
+    def _broken(*args, **kwargs):
+        attempts.append(1)
+        raise sqlite3.OperationalError("unable to open database file")
+
+    monkeypatch.setattr(response_cache, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(response_cache, "_cache_instance", None)
+    monkeypatch.setattr(response_cache, "_cache_failed", False)
+    monkeypatch.setattr(response_cache, "ResponseCache", _broken)
+
+    assert response_cache.get_response_cache() is None
+    assert response_cache.get_response_cache() is None
+    assert len(attempts) == 1
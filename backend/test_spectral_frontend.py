@@ -0,0 +1,50 @@
+# test_spectral_frontend.py
+"""
+Tests for the shared spectral front-end.
+"""
+
+import numpy as np
+
+from audio_context import AudioContext
+import numpy_features  # registers the acoustic features
+from spectral_frontend import SpectralFrontEnd, short_lag_autocorrelation
+
+SR = 16000
+
+
+def _front_end(samples):
+    return SpectralFrontEnd.of(AudioContext.from_samples(np.asarray(samples, dtype=np.float32), SR))
+
+
+def test_trim_keeps_digital_silence_whole():
+    assert _front_end(np.zeros(SR)).trim_bounds(top_db=20) == (0, SR)
+
+
+def test_trim_keeps_constant_signal_whole():
+    assert _front_end(np.full(SR, 0.1)).trim_bounds(top_db=20) == (0, SR)
+
+
+def test_trim_cuts_leading_and_trailing_silence():
+    t = np.arange(SR) / SR
+    tone = 0.5 * np.sin(2 * np.pi * 220 * t)
+    samples = np.concatenate([np.zeros(SR), tone, np.zeros(SR)])
+
+    start, end = _front_end(samples).trim_bounds(top_db=20)
+    assert abs(start - SR) <= 0.128 * SR
+    assert abs(end - 2 * SR) <= 0.128 * SR
+
+
+def test_autocorrelation_is_double_precision():
+    frames = _front_end(np.random.default_rng(0).standard_normal(SR)).frames(0.04)
+    assert short_lag_autocorrelation(frames[:16].astype(np.float64)).dtype == np.float64
+    assert next(_front_end(np.zeros(SR)).blocks(0.04)).dtype == np.float64
+
+
+def test_only_per_frame_results_are_memoised():
+    ctx = AudioContext.from_samples(np.random.default_rng(0).standard_normal(10 * SR).astype(np.float32), SR)
+    SpectralFrontEnd.of(ctx).extract("acoustic")
+
+    n_frames = len(SpectralFrontEnd.of(ctx).frames(numpy_features.FRAME_SEC))
+    arrays = [value for value in ctx._memo.values() if isinstance(value, np.ndarray)]
+    assert arrays
+    assert all(array.ndim == 1 and len(array) <= n_frames for array in arrays)
@@ -0,0 +1,72 @@
+# test_speech_features.py
+"""
+Tests for openSMILE feature extraction on in-memory signals.
+"""
+
+import wave
+
+import numpy as np
+import pytest
+
+pytest.importorskip("opensmile")
+
+import speech_features
+from audio_context import AudioContext
+from speech_features import EGEMAPS_INDEX, extract_egemaps, get_feature
+
+SR = 16000
+
+
+def _voice(seconds=2.0):
+    """A vibrato tone with harmonics, loud enough for every eGeMAPS functional."""
+    t = np.arange(int(seconds * SR)) / SR
+    f0 = 180 + 20 * np.sin(2 * np.pi * 3 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / SR
+    y = sum(np.sin(k * phase) / k for k in range(1, 6))
+    return (0.3 * y / np.abs(y).max()).astype(np.float32)
+
+
+def test_column_map_covers_every_functional():
+    assert list(EGEMAPS_INDEX) == speech_features.smile.feature_names
+    assert list(EGEMAPS_INDEX.values()) == list(range(len(EGEMAPS_INDEX)))
+
+
+def test_in_memory_vector_matches_the_file_api(tmp_path):
+    samples = _voice()
+    path = tmp_path / "voice.wav"
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SR)
+        wf.writeframes((samples * 32767).astype(np.int16).tobytes())
+
+    vector = extract_egemaps(AudioContext.from_samples(samples, SR))
+    # The pandas path the extractor replaced, on the same (16-bit) signal
+    frame = speech_features.smile.process_file(str(path))
+
+    assert vector.shape == (len(EGEMAPS_INDEX),)
+    for name in ("F0semitoneFrom27.5Hz_sma3nz_amean", "loudness_sma3_amean", "jitterLocal_sma3nz_amean"):
+        assert get_feature(vector, [name]) == pytest.approx(frame[name].iloc[0], rel=1e-3, abs=1e-4)
+
+
+def test_vector_is_extracted_once_per_context(monkeypatch):
+    calls = []
+    smile = speech_features.smile
+
+    def _counting(signal, sampling_rate):
+        calls.append(len(signal))
+        return smile(signal, sampling_rate)
+
+    monkeypatch.setattr(speech_features, "smile", _counting)
+    ctx = AudioContext.from_samples(_voice(1.0), SR)
+
+    assert extract_egemaps(ctx) is extract_egemaps(ctx)
+    assert calls == [SR]
+
+
+def test_get_feature_falls_back_through_candidates():
+    vector = np.arange(len(EGEMAPS_INDEX), dtype=np.float64)
+    name = "loudness_sma3_amean"
+
+    assert get_feature(vector, ["not_a_feature", name]) == EGEMAPS_INDEX[name]
+    assert get_feature(vector, ["not_a_feature"], default=-1.0) == -1.0
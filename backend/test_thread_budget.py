@@ -0,0 +1,66 @@
+# test_thread_budget.py
+"""
+Tests for the CPU thread governor.
+"""
+
+import threading
+import time
+
+from thread_budget import EXTRACTOR_THREADS, ThreadGovernor
+from speech_config import VAD_THREADS
+
+
+def test_lone_request_gets_whole_remainder():
+    governor = ThreadGovernor(total=16)
+    with governor.request() as threads:
+        assert threads["whisper"] == 16 - VAD_THREADS - EXTRACTOR_THREADS
+        assert threads["total"] == 16
+
+
+def test_whisper_counts_come_from_fixed_tiers():
+    governor = ThreadGovernor(total=16, tiers=4)
+    tiers = set(governor.whisper_tiers())
+    assert len(tiers) <= 4
+    for budget in range(1, 40):
+        assert governor.allocate(budget)["whisper"] in tiers
+
+
+def test_tier_cap_bounds_model_copies():
+    governor = ThreadGovernor(total=16, tiers=2)
+    assert governor.whisper_tiers() == [14, 7]
+    counts = {governor.allocate(budget)["whisper"] for budget in range(1, 40)}
+    assert counts <= {14, 7}
+
+
+def test_no_whisper_threads_without_transcription():
+    governor = ThreadGovernor(total=4)
+    with governor.request(whisper=False) as threads:
+        assert threads["whisper"] == 0
+        assert threads["total"] == VAD_THREADS + EXTRACTOR_THREADS
+        assert governor.available == 4 - VAD_THREADS - EXTRACTOR_THREADS
+
+
+def test_concurrent_requests_never_oversubscribe():
+    governor = ThreadGovernor(total=8)
+    peak = {"reserved": 0}
+    lock = threading.Lock()
+    current = {"reserved": 0}
+
+    def _request():
+        with governor.request() as threads:
+            with lock:
+                current["reserved"] += threads["total"]
+                peak["reserved"] = max(peak["reserved"], current["reserved"])
+            time.sleep(0.01)
+            with lock:
+                current["reserved"] -= threads["total"]
+
+    workers = [threading.Thread(target=_request) for _ in range(12)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert peak["reserved"] <= governor.total
+    assert governor.in_flight == 0
+    assert governor.available == governor.total
@@ -0,0 +1,100 @@
+# test_tiered_transcription.py
+"""
+Tests for two-tier speculative transcription.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import speech_to_text
+from audio_context import AudioContext
+from speech_config import WHISPER_MODEL_SIZE, WHISPER_PREVIEW_MODEL_SIZE
+from thread_budget import ThreadGovernor
+
+
+class _FakeWhisper:
+    """Stands in for both tiers: a few segments per model, `delay` apart."""
+
+    def __init__(self, preview_segments=3, preview_delay=0.01, final_delay=0.01, preview_error=None):
+        self.plan = {
+            WHISPER_PREVIEW_MODEL_SIZE: (preview_segments, preview_delay),
+            WHISPER_MODEL_SIZE: (2, final_delay),
+        }
+        self.preview_error = preview_error
+        self.log = []
+        self.threads = {}
+        self._lock = threading.Lock()
+
+    def _event(self, *event):
+        with self._lock:
+            self.log.append(event)
+
+    def __call__(self, ctx, batched, batch_size, model_size, compute_type, parallel=None,
+                 cpu_threads=0):
+        self.threads[model_size] = cpu_threads
+        tier = "preview" if model_size == WHISPER_PREVIEW_MODEL_SIZE else "final"
+        count, delay = self.plan[model_size]
+        self._event("start", tier)
+        if tier == "preview" and self.preview_error:
+            raise self.preview_error
+        for i in range(count):
+            time.sleep(delay)
+            self._event("segment", tier)
+            yield SimpleNamespace(text=f"{tier} {i}", start=float(i), end=i + 1.0)
+
+
+@pytest.fixture
+def governor(monkeypatch):
+    governor = ThreadGovernor(total=8)
+    monkeypatch.setattr(speech_to_text, "get_thread_governor", lambda: governor)
+    monkeypatch.setattr(speech_to_text, "get_transcription_cache", lambda: None)
+    monkeypatch.setattr(speech_to_text, "WHISPER_PREVIEW_INTERVAL_SEC", 0)
+    return governor
+
+
+def _run(monkeypatch, fake):
+    monkeypatch.setattr(speech_to_text, "_start_transcription", fake)
+    ctx = AudioContext.from_samples(np.zeros(16000, dtype=np.float32))
+    return list(speech_to_text.transcribe_tiered(ctx))
+
+
+def test_preview_comes_first_and_final_last(monkeypatch, governor):
+    fake = _FakeWhisper()
+    results = _run(monkeypatch, fake)
+
+    tiers = [tier for tier, _ in results]
+    assert tiers[0] == "preview" and tiers[-1] == "final"
+    assert "final" not in tiers[:-1]
+    assert results[-1][1]["transcript"] == "final 0 final 1"
+    assert results[0][1]["transcript"] == "preview 0"
+
+
+def test_final_tier_starts_after_the_first_preview_segment(monkeypatch, governor):
+    fake = _FakeWhisper()
+    _run(monkeypatch, fake)
+    assert fake.log.index(("start", "final")) > fake.log.index(("segment", "preview"))
+
+
+def test_tiers_share_the_request_budget(monkeypatch, governor):
+    fake = _FakeWhisper()
+    _run(monkeypatch, fake)
+    assert sum(fake.threads.values()) <= 8
+    assert governor.available == governor.total
+
+
+def test_preview_stops_once_final_is_ready(monkeypatch, governor):
+    fake = _FakeWhisper(preview_segments=100, preview_delay=0.02, final_delay=0.001)
+    results = _run(monkeypatch, fake)
+
+    assert results[-1][0] == "final"
+    assert len(results) - 1 < 100
+
+
+def test_preview_failure_still_yields_final(monkeypatch, governor):
+    fake = _FakeWhisper(preview_error=RuntimeError("preview model missing"))
+    results = _run(monkeypatch, fake)
+    assert [tier for tier, _ in results] == ["final"]
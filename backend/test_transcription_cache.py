@@ -0,0 +1,110 @@
+# test_transcription_cache.py
+"""
+Tests for the persistent transcription cache and how transcription uses it.
+"""
+
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import speech_to_text
+import transcription_cache
+from audio_context import AudioContext
+from speech_config import WHISPER_BATCHED_MIN_DURATION, WHISPER_PARALLEL_MIN_DURATION
+from transcription_cache import TranscriptionCache, make_cache_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TranscriptionCache(path=str(tmp_path / "transcripts.sqlite3"), max_bytes=1024)
+
+
+def _keys(cache):
+    return {row[0] for row in cache._conn.execute("SELECT key FROM transcripts")}
+
+
+def test_round_trip(cache):
+    cache.put("k", {"segments": [{"text": "hello", "start": 0.0, "end": 0.5}]})
+    assert cache.get("k") == {"segments": [{"text": "hello", "start": 0.0, "end": 0.5}]}
+    assert cache.get("missing") is None
+
+
+def test_evicts_least_recently_used_past_byte_budget(cache):
+    for i in range(3):
+        cache.put(f"k{i}", "x" * 300)
+    cache.get("k0")
+    cache.put("k3", "x" * 300)
+
+    assert _keys(cache) == {"k0", "k2", "k3"}
+    total = cache._conn.execute("SELECT SUM(size) FROM transcripts").fetchone()[0]
+    assert total <= cache.max_bytes
+
+
+def test_oversized_value_is_not_stored(cache):
+    cache.put("big", "x" * 2048)
+    assert cache.get("big") is None
+
+
+class _BrokenCache:
+    def get(self, key):
+        raise sqlite3.OperationalError("database is locked")
+
+    def put(self, key, value):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_transcription_survives_cache_errors(monkeypatch):
+    segments = [SimpleNamespace(text="hello there", start=0.0, end=1.0)]
+    monkeypatch.setattr(speech_to_text, "get_transcription_cache", lambda: _BrokenCache())
+    monkeypatch.setattr(speech_to_text, "_start_transcription", lambda *args: iter(segments))
+
+    ctx = AudioContext.from_samples(np.zeros(16000, dtype=np.float32))
+    accumulator = speech_to_text.TranscriptAccumulator()
+    events = list(speech_to_text.iter_transcription(ctx, accumulator=accumulator))
+
+    assert [event["segment"]["text"] for event in events] == ["hello there"]
+    assert accumulator.to_dict()["transcript"] == "hello there"
+
+
+def test_key_separates_transcription_modes():
+    audio = np.zeros(160, dtype=np.float32)
+    keys = {make_cache_key(audio, "small", "int8", "en", mode)
+            for mode in ("sequential", "batched", "parallel")}
+    assert len(keys) == 3
+
+
+def test_mode_follows_duration_and_overrides():
+    mode = speech_to_text.transcription_mode
+    assert mode(WHISPER_BATCHED_MIN_DURATION - 1) == "sequential"
+    assert mode(WHISPER_BATCHED_MIN_DURATION) == "batched"
+    assert mode(WHISPER_PARALLEL_MIN_DURATION) == "parallel"
+    assert mode(WHISPER_PARALLEL_MIN_DURATION, batched=True, parallel=False) == "batched"
+    assert mode(1, batched=False, parallel=False) == "sequential"
+
+
+def test_singleton_is_created_once(monkeypatch):
+    created = []
+
+    class _SlowCache:
+        def __init__(self):
+            time.sleep(0.02)
+            created.append(self)
+
+    monkeypatch.setattr(transcription_cache, "TRANSCRIPT_CACHE_ENABLED", True)
+    monkeypatch.setattr(transcription_cache, "TranscriptionCache", _SlowCache)
+    monkeypatch.setattr(transcription_cache, "_cache_instance", None)
+
+    caches = []
+    threads = [threading.Thread(target=lambda: caches.append(transcription_cache.get_transcription_cache()))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(cache is created[0] for cache in caches)
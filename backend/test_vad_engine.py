@@ -0,0 +1,120 @@
+# test_vad_engine.py
+"""
+Tests for the Silero VAD engine against Silero's reference post-processing.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import vad_engine
+from vad_engine import (
+    MIN_SILENCE_DURATION_MS,
+    MIN_SPEECH_DURATION_MS,
+    SPEECH_PAD_MS,
+    THRESHOLD,
+    WINDOW_SAMPLES,
+    VADEngine,
+    VADResult,
+)
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "temp_audio.webm")
+
+
+@pytest.fixture(scope="module")
+def clip():
+    pytest.importorskip("onnxruntime")
+    from utils.audio_loader import load_audio
+
+    samples, _ = load_audio(FIXTURE)
+    return samples
+
+
+def _reference_timestamps(samples):
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    return get_speech_timestamps(samples, VadOptions(
+        threshold=THRESHOLD,
+        min_speech_duration_ms=MIN_SPEECH_DURATION_MS,
+        min_silence_duration_ms=MIN_SILENCE_DURATION_MS,
+        speech_pad_ms=SPEECH_PAD_MS,
+    ))
+
+
+def test_onnx_engine_matches_reference(clip):
+    result = VADEngine(backend="onnx", threads=1).analyze(clip)
+    reference = _reference_timestamps(clip)
+
+    assert reference
+    assert result.to_timestamps() == reference
+
+
+def test_onnx_state_is_carried_across_batches(clip, monkeypatch):
+    engine = VADEngine(backend="onnx", threads=1)
+    whole = engine.speech_timestamps(clip)
+
+    monkeypatch.setattr(vad_engine, "ONNX_BATCH_WINDOWS", 7)
+    assert engine.speech_timestamps(clip) == whole
+
+
+def test_vad_result_round_trips_timestamps():
+    timestamps = [{"start": 512, "end": 16000}, {"start": 20480, "end": 32000}]
+    result = VADResult.from_timestamps(timestamps, 48000)
+
+    assert result.to_timestamps() == timestamps
+    assert result.speech_time == pytest.approx((15488 + 11520) / 16000)
+    assert result.pause_ratio == pytest.approx(1 - result.speech_time / 3)
+
+
+class _FakeJit:
+    def __init__(self):
+        self.calls = 0
+
+    def speech_probs(self, audio):
+        self.calls += 1
+        # Speech in the second half of the recording
+        probs = np.zeros(len(audio) // WINDOW_SAMPLES, dtype=np.float32)
+        probs[len(probs) // 2:] = 0.9
+        return probs
+
+
+def test_falls_back_to_jit_without_onnxruntime(monkeypatch):
+    def _no_onnx(threads):
+        raise ImportError("No module named 'onnxruntime'")
+
+    monkeypatch.setattr(vad_engine, "_OnnxSilero", _no_onnx)
+    monkeypatch.setattr(vad_engine, "_JitSilero", _FakeJit)
+
+    engine = VADEngine(backend="onnx", threads=1)
+    assert engine.backend == "jit"
+
+    timestamps = engine.speech_timestamps(np.zeros(WINDOW_SAMPLES * 100, dtype=np.float32))
+    assert engine._model.calls == 1
+    assert timestamps == [{"start": WINDOW_SAMPLES * 50 - 480, "end": WINDOW_SAMPLES * 100}]
+
+
+def test_jit_scores_one_window_at_a_time():
+    torch = pytest.importorskip("torch")
+
+    class _Model:
+        def __init__(self):
+            self.windows = []
+            self.resets = 0
+
+        def reset_states(self):
+            self.resets += 1
+
+        def __call__(self, window, sample_rate):
+            self.windows.append(len(window))
+            return torch.tensor(0.7)
+
+    jit = vad_engine._JitSilero.__new__(vad_engine._JitSilero)
+    jit._torch = torch
+    jit.model = _Model()
+    jit._lock = vad_engine.threading.Lock()
+
+    probs = jit.speech_probs(np.zeros(WINDOW_SAMPLES * 4, dtype=np.float32))
+    np.testing.assert_allclose(probs, [0.7] * 4)
+    assert jit.model.windows == [WINDOW_SAMPLES] * 4
+    assert jit.model.resets == 2
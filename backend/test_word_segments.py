@@ -0,0 +1,81 @@
+# test_word_segments.py
+"""
+Tests for the columnar word timings and the public transcription shape.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+import speech_to_text
+from audio_context import AudioContext
+from utils.word_segments import WordSegments
+
+WORDS = [
+    {"word": "Hello", "start": 0.0, "end": 0.4},
+    {"word": "there,", "start": 0.4, "end": 0.9},
+    {"word": "world.", "start": 1.5, "end": 2.0},
+]
+
+
+def test_from_list_round_trip():
+    words = WordSegments.from_list(WORDS)
+    assert len(words) == 3
+    assert words.to_list() == WORDS
+    assert list(words) == WORDS
+    assert words[-1] == WORDS[-1]
+
+
+def test_round_trip_across_appended_segments():
+    words = WordSegments()
+    words.append_segment(0.0, 1.0, ["one", "two"])
+    words.append_segment(1.0, 2.5, ["three", "four", "five"])
+
+    rebuilt = WordSegments.from_list(words.to_list())
+    assert rebuilt.words == ["one", "two", "three", "four", "five"]
+    np.testing.assert_array_equal(rebuilt.starts, words.starts)
+    np.testing.assert_array_equal(rebuilt.ends, words.ends)
+
+
+def test_of_passes_columnar_through():
+    words = WordSegments.from_list(WORDS)
+    assert WordSegments.of(words) is words
+    assert WordSegments.of(WORDS).to_list() == WORDS
+
+
+def test_index_at():
+    words = WordSegments.from_list(WORDS)
+    np.testing.assert_array_equal(
+        words.index_at(np.array([-0.1, 0.0, 0.5, 1.2, 1.5, 9.0])),
+        [-1, 0, 1, 1, 2, 2],
+    )
+
+
+def test_count_between():
+    words = WordSegments.from_list(WORDS)
+    assert words.count_between(0.0, 2.0) == 3
+    assert words.count_between(0.0, 0.4) == 1
+    assert words.count_between(0.41, 1.5) == 0
+    assert words.count_between(0.4, 1.6) == 2
+    assert WordSegments().count_between(0.0, 1.0) == 0
+
+
+def test_ends_with_any():
+    words = WordSegments.from_list(WORDS)
+    np.testing.assert_array_equal(words.ends_with_any(".?!"), [False, False, True])
+
+
+def test_transcribe_audio_returns_word_dicts(monkeypatch):
+    segments = [SimpleNamespace(text="hello there", start=0.0, end=1.0)]
+    monkeypatch.setattr(speech_to_text, "_start_transcription", lambda *args: iter(segments))
+    ctx = AudioContext.from_samples(np.zeros(16000, dtype=np.float32))
+
+    data = speech_to_text.transcribe_audio(ctx, use_cache=False)
+    assert data["word_segments"] == [
+        {"word": "hello", "start": 0.0, "end": 0.5},
+        {"word": "there", "start": 0.5, "end": 1.0},
+    ]
+
+    columnar = speech_to_text.transcribe_audio(ctx, use_cache=False, columnar=True)
+    assert isinstance(columnar["word_segments"], WordSegments)
+    assert columnar["word_segments"].to_list() == data["word_segments"]
@@ -0,0 +1,168 @@
+# thread_budget.py
+"""
+CPU Thread Governor.
+
+CTranslate2 (Whisper), torch (TorchScript Silero VAD), ONNX Runtime and the
+BLAS pools behind numpy/librosa each size their thread pools to the whole
+machine by default. With several requests in flight that oversubscribes the
+CPU many times over and latency collapses.
+
+The governor owns one global thread budget (CPU_THREAD_BUDGET, default all
+cores). Each request in the CPU-heavy feature stage reserves threads from it
+for Whisper, VAD and the single openSMILE / numpy extractor thread, and gives
+them back when it is done. A request that finds too few threads free waits
+for one to finish, so the reservations never add up to more than the budget.
+Whisper thread counts are taken from a small fixed set of tiers (the whole
+remainder, then a half, a quarter, an eighth of it), because every distinct
+count is a separately loaded model; WHISPER_THREAD_TIERS caps how many tiers,
+and so how many resident copies of each model, there can be. A request that
+does not transcribe (its transcription was passed in) reserves no Whisper
+threads.
+"""
+
+import logging
+import os
+import sys
+import threading
+from contextlib import contextmanager
+
+from speech_config import CPU_THREAD_BUDGET, VAD_THREADS, WHISPER_THREAD_TIERS
+
+try:
+    from threadpoolctl import threadpool_limits
+    THREADPOOLCTL_AVAILABLE = True
+except ImportError:
+    THREADPOOLCTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# openSMILE (or the numpy extractor) runs on one thread; not configurable,
+# but reserved so Whisper does not take that core
+EXTRACTOR_THREADS = 1
+
+# Whisper thread tiers: the full remainder divided by 1, 2, 4, 8 (the first
+# WHISPER_THREAD_TIERS of them)
+WHISPER_TIER_DIVISORS = (1, 2, 4, 8)
+
+# Library pools that otherwise default to one thread per core
+_POOL_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+class ThreadGovernor:
+    """Reserves threads of a global CPU budget for concurrent requests and stages."""
+
+    def __init__(self, total=CPU_THREAD_BUDGET, tiers=WHISPER_THREAD_TIERS):
+        self.total = total or os.cpu_count() or 1
+        self.tier_divisors = WHISPER_TIER_DIVISORS[:max(1, tiers)]
+        self._in_flight = 0
+        self._reserved = 0
+        self._cond = threading.Condition()
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    @property
+    def available(self):
+        """Threads not reserved by a request in flight."""
+        return self.total - self._reserved
+
+    def whisper_tiers(self):
+        """The fixed Whisper thread counts, largest first."""
+        top = max(1, self.total - VAD_THREADS - EXTRACTOR_THREADS)
+        return sorted({max(1, top // d) for d in self.tier_divisors}, reverse=True)
+
+    def request_budget(self):
+        """Threads a new request gets now: an equal share, capped at what is free."""
+        return max(1, min(self.total // (self._in_flight + 1), self.available))
+
+    def allocate(self, budget=None, features=True, whisper=True):
+        """
+        Per-stage thread counts for a request.
+
+        Args:
+            budget: Threads for the request; defaults to `request_budget()`.
+            features: Include the VAD and extractor threads; False for a
+                transcription-only request.
+            whisper: Include Whisper threads; False when the request's
+                transcription already exists.
+
+        Returns:
+            dict with `whisper` (a tier, or 0) and `vad` thread counts and
+            their `total` including the extractor thread.
+        """
+        budget = min(budget or self.request_budget(), self.total)
+        vad = VAD_THREADS if features else 0
+        extractor = EXTRACTOR_THREADS if features else 0
+        if whisper:
+            tiers = self.whisper_tiers()
+            whisper = next((t for t in tiers if t <= budget - vad - extractor), tiers[-1])
+        else:
+            whisper = 0
+        return {
+            "whisper": whisper,
+            "vad": vad,
+            "total": whisper + vad + extractor,
+        }
+
+    @contextmanager
+    def request(self, budget=None, features=True, whisper=True):
+        """
+        Reserve threads for a request while it runs; yields its allocation.
+        Blocks while other requests hold too much of the budget (a request
+        is always admitted when none is in flight).
+        """
+        with self._cond:
+            while True:
+                allocation = self.allocate(budget, features, whisper)
+                if self._in_flight == 0 or allocation["total"] <= self.available:
+                    break
+                self._cond.wait()
+            self._in_flight += 1
+            self._reserved += allocation["total"]
+        try:
+            yield allocation
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._reserved -= allocation["total"]
+                self._cond.notify_all()
+
+    def configure_torch(self, torch):
+        """Cap torch's process-wide pools to the VAD share."""
+        torch.set_num_threads(VAD_THREADS)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Only settable before torch runs its first parallel op
+            pass
+
+    def configure_process(self):
+        """
+        Pin library thread pools to one thread each; the stages that need
+        more (Whisper, VAD) are given explicit counts by the governor.
+        Best called before numpy / ctranslate2 / torch are first imported;
+        BLAS / OpenMP pools that are already loaded are capped through
+        threadpoolctl when it is installed.
+        """
+        for var in _POOL_ENV_VARS:
+            os.environ.setdefault(var, "1")
+        if "numpy" in sys.modules and THREADPOOLCTL_AVAILABLE:
+            threadpool_limits(limits=1)
+        if "torch" in sys.modules:
+            self.configure_torch(sys.modules["torch"])
+        logger.info(f"Thread budget: {self.total} threads")
+
+
+# Singleton instance for easy access
+_governor_instance = None
+_governor_lock = threading.Lock()
+
+
+def get_thread_governor():
+    """Get or create the process-wide thread governor."""
+    global _governor_instance
+    with _governor_lock:
+        if _governor_instance is None:
+            _governor_instance = ThreadGovernor()
+    return _governor_instance
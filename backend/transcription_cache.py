@@ -0,0 +1,127 @@
+# transcription_cache.py
+"""
+Persistent transcription cache.
+
+Stores Whisper segments in a local SQLite database keyed by a hash of the
+decoded PCM samples plus the model configuration and transcription mode
+(sequential, batched or parallel segment differently), so re-analysing unchanged
+audio (prompt tweaks, eval re-runs, report A/B tests) skips transcription.
+Least-recently-used entries are evicted once the cache exceeds its size limit.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from speech_config import (
+    TRANSCRIPT_CACHE_ENABLED,
+    TRANSCRIPT_CACHE_PATH,
+    TRANSCRIPT_CACHE_MAX_BYTES,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(audio, model_size, compute_type, language, mode):
+    """Build a cache key from decoded PCM samples, the model config and the transcription mode."""
+    digest = hashlib.sha256(audio.tobytes()).hexdigest()
+    return f"{digest}:{model_size}:{compute_type}:{language}:{mode}"
+
+
+class TranscriptionCache:
+    """SQLite-backed key/value store with LRU eviction and a byte budget."""
+
+    def __init__(self, path=TRANSCRIPT_CACHE_PATH, max_bytes=TRANSCRIPT_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS transcripts ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_last_access ON transcripts(last_access)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        """Return the cached value for `key`, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM transcripts WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE transcripts SET last_access = ? WHERE key = ?",
+                (time.time(), key)
+            )
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        """Store a JSON-serialisable value and evict old entries if needed."""
+        payload = json.dumps(value)
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts (key, value, size, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, payload, size, time.time())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM transcripts"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM transcripts ORDER BY last_access ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM transcripts WHERE key = ?", (key,))
+            total -= size
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM transcripts")
+            self._conn.commit()
+
+
+# Singleton instance for easy access
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+
+def get_transcription_cache():
+    """Get or create the transcription cache, or None if caching is disabled."""
+    global _cache_instance
+    if not TRANSCRIPT_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache_instance is None:
+            try:
+                _cache_instance = TranscriptionCache()
+            except Exception as e:
+                logger.warning(f"Transcription cache unavailable ({e}), continuing without it")
+                return None
+    return _cache_instance
@@ -40,3 +40,13 @@ def load_audio(path, target_sr=16000):
         logger.warning(f"PyAV loading failed/unavailable for {path} ({e}). Falling back to librosa.load...")
         # librosa.load will use soundfile or audioread fallback
         return librosa.load(path, sr=target_sr, mono=True)
+
+
+def resample_audio(samples, orig_sr, target_sr=16000):
+    """Mono float32 `samples` at `orig_sr` resampled to `target_sr` (unchanged when equal)."""
+    samples = np.asarray(samples, dtype=np.float32)
+    if samples.ndim != 1:
+        raise ValueError(f"Expected mono samples, got shape {samples.shape}")
+    if orig_sr == target_sr:
+        return samples
+    return librosa.resample(samples, orig_sr=orig_sr, target_sr=target_sr).astype(np.float32)
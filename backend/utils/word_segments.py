@@ -0,0 +1,154 @@
+import numpy as np
+
+
+class WordSegments:
+    """
+    Columnar word-level timings.
+
+    Stores start/end times as float arrays and the words as one string plus
+    an offsets array, instead of one {"word", "start", "end"} dict per word.
+    Supports `len()`, indexing and iteration (yielding the dict shape) and
+    serialises back to the original list-of-dicts JSON shape via `to_list()`.
+    """
+
+    def __init__(self, words=(), starts=(), ends=()):
+        # Pending per-segment chunks; consolidated lazily on first read
+        self._word_chunks = []
+        self._start_chunks = []
+        self._end_chunks = []
+        self._length = 0
+
+        self._text = ""
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._starts = np.zeros(0, dtype=np.float64)
+        self._ends = np.zeros(0, dtype=np.float64)
+
+        if len(words):
+            self._append(list(words), np.asarray(starts, dtype=np.float64),
+                         np.asarray(ends, dtype=np.float64))
+
+    @classmethod
+    def from_list(cls, items):
+        """Build from the list-of-dicts shape."""
+        return cls(
+            [w["word"] for w in items],
+            [w["start"] for w in items],
+            [w["end"] for w in items],
+        )
+
+    @classmethod
+    def of(cls, words):
+        """Wrap a list of dicts; WordSegments are passed through unchanged."""
+        return words if isinstance(words, cls) else cls.from_list(words)
+
+    def append_segment(self, start, end, words):
+        """
+        Add a segment's words with evenly spread timings, rounded to 10 ms.
+        Returns the new words as their own WordSegments.
+        """
+        if not words:
+            return WordSegments()
+
+        avg_word_time = (end - start) / len(words)
+        word_starts = start + np.arange(len(words)) * avg_word_time
+        starts = np.round(word_starts, 2)
+        ends = np.round(word_starts + avg_word_time, 2)
+
+        self._append(list(words), starts, ends)
+        return WordSegments(words, starts, ends)
+
+    def _append(self, words, starts, ends):
+        self._word_chunks.append(words)
+        self._start_chunks.append(starts)
+        self._end_chunks.append(ends)
+        self._length += len(words)
+
+    def _consolidate(self):
+        if not self._word_chunks:
+            return
+
+        words = [w for chunk in self._word_chunks for w in chunk]
+        lengths = np.fromiter((len(w) for w in words), dtype=np.int64, count=len(words))
+
+        self._offsets = np.concatenate(
+            (self._offsets, self._offsets[-1] + np.cumsum(lengths))
+        )
+        self._text += "".join(words)
+        self._starts = np.concatenate([self._starts] + self._start_chunks)
+        self._ends = np.concatenate([self._ends] + self._end_chunks)
+
+        self._word_chunks, self._start_chunks, self._end_chunks = [], [], []
+
+    # ---------------------------
+    # Vectorized accessors
+    # ---------------------------
+    @property
+    def starts(self):
+        self._consolidate()
+        return self._starts
+
+    @property
+    def ends(self):
+        self._consolidate()
+        return self._ends
+
+    @property
+    def durations(self):
+        return self.ends - self.starts
+
+    def word(self, i):
+        self._consolidate()
+        return self._text[self._offsets[i]:self._offsets[i + 1]]
+
+    @property
+    def words(self):
+        self._consolidate()
+        offsets = self._offsets.tolist()
+        return [self._text[a:b] for a, b in zip(offsets, offsets[1:])]
+
+    def ends_with_any(self, chars):
+        """Boolean array: whether each word's last character is one of `chars`."""
+        self._consolidate()
+        if not self._length:
+            return np.zeros(0, dtype=bool)
+        # One code point per character, so offsets index it directly
+        codes = np.frombuffer(self._text.encode("utf-32-le"), dtype=np.uint32)
+        last = codes[self._offsets[1:] - 1]
+        return np.isin(last, [ord(c) for c in chars])
+
+    def index_at(self, times):
+        """Index of the last word starting at or before each time (-1 if none)."""
+        return np.searchsorted(self.starts, times, side="right") - 1
+
+    def count_between(self, start, end):
+        """Number of words starting within [start, end)."""
+        starts = self.starts
+        return int(np.searchsorted(starts, end, side="left") - np.searchsorted(starts, start, side="left"))
+
+    # ---------------------------
+    # Sequence protocol / serialisation
+    # ---------------------------
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError("word index out of range")
+        self._consolidate()
+        return {"word": self.word(i), "start": float(self._starts[i]), "end": float(self._ends[i])}
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def to_list(self):
+        """Serialise to the list of {"word", "start", "end"} dicts."""
+        self._consolidate()
+        return [
+            {"word": w, "start": s, "end": e}
+            for w, s, e in zip(self.words, self._starts.tolist(), self._ends.tolist())
+        ]
+
+    def __repr__(self):
+        return f"WordSegments({self._length} words)"
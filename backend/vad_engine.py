@@ -0,0 +1,278 @@
+# vad_engine.py
+"""
+Silero VAD engine.
+
+Runs Silero VAD through a persistent ONNX Runtime session that scores every
+512-sample window of a recording in large batches (the encoder runs over the
+whole batch at once, the recurrent state is carried across batches), instead
+of calling the model once per window from Python. Intra-op threads are capped
+so VAD never competes with Whisper for the whole machine.
+
+Falls back to the TorchScript model from torch.hub / the offline bundle when
+onnxruntime is not installed. Both backends apply Silero's own
+`get_speech_timestamps` post-processing with its default parameters, so
+callers get the same {"start", "end"} sample timestamps as before.
+"""
+
+import logging
+import os
+import threading
+
+import numpy as np
+
+from speech_config import VAD_BACKEND, VAD_THREADS
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+WINDOW_SAMPLES = 512
+CONTEXT_SAMPLES = 64
+ONNX_BATCH_WINDOWS = 10000
+
+# Silero's get_speech_timestamps defaults
+THRESHOLD = 0.5
+MIN_SPEECH_DURATION_MS = 250
+MIN_SILENCE_DURATION_MS = 100
+SPEECH_PAD_MS = 30
+
+
+class _OnnxSilero:
+    """Batched-window Silero VAD on ONNX Runtime (model shipped with faster-whisper)."""
+
+    def __init__(self, threads):
+        import onnxruntime
+        from faster_whisper.utils import get_assets_path
+
+        opts = onnxruntime.SessionOptions()
+        opts.inter_op_num_threads = 1
+        opts.intra_op_num_threads = threads
+        opts.log_severity_level = 4
+
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(get_assets_path(), "silero_vad_v6.onnx"),
+            providers=["CPUExecutionProvider"],
+            sess_options=opts,
+        )
+        self._lock = threading.Lock()
+
+    def speech_probs(self, audio):
+        windows = audio.reshape(-1, WINDOW_SAMPLES)
+
+        # Each window is preceded by the last 64 samples of the previous one
+        context = np.roll(windows[:, -CONTEXT_SAMPLES:], 1, axis=0)
+        context[0] = 0
+        batch = np.concatenate([context, windows], axis=1).astype(np.float32)
+
+        h = np.zeros((1, 1, 128), dtype=np.float32)
+        c = np.zeros((1, 1, 128), dtype=np.float32)
+        outputs = []
+        with self._lock:
+            for i in range(0, len(batch), ONNX_BATCH_WINDOWS):
+                out, h, c = self.session.run(
+                    None,
+                    {"input": batch[i:i + ONNX_BATCH_WINDOWS], "h": h, "c": c},
+                )
+                outputs.append(out)
+        return np.concatenate(outputs).reshape(-1)
+
+
+class _JitSilero:
+    """TorchScript Silero VAD, one window at a time."""
+
+    def __init__(self):
+        import torch
+        from model_bundle import load_silero_vad
+
+        from thread_budget import get_thread_governor
+
+        get_thread_governor().configure_torch(torch)
+        self._torch = torch
+        self.model, _ = load_silero_vad()
+        self._lock = threading.Lock()
+
+    def speech_probs(self, audio):
+        torch = self._torch
+        wav = torch.from_numpy(audio)
+        probs = []
+        with self._lock, torch.inference_mode():
+            self.model.reset_states()
+            for i in range(0, len(wav), WINDOW_SAMPLES):
+                probs.append(self.model(wav[i:i + WINDOW_SAMPLES], SAMPLE_RATE).item())
+            self.model.reset_states()
+        return np.asarray(probs, dtype=np.float32)
+
+
+def _probs_to_timestamps(speech_probs, audio_length_samples):
+    """Silero's get_speech_timestamps state machine over precomputed probabilities."""
+    threshold = THRESHOLD
+    neg_threshold = max(threshold - 0.15, 0.01)
+    min_speech_samples = SAMPLE_RATE * MIN_SPEECH_DURATION_MS / 1000
+    min_silence_samples = SAMPLE_RATE * MIN_SILENCE_DURATION_MS / 1000
+    speech_pad_samples = SAMPLE_RATE * SPEECH_PAD_MS / 1000
+
+    triggered = False
+    speeches = []
+    current_speech = {}
+    temp_end = 0
+
+    for i, speech_prob in enumerate(speech_probs.tolist()):
+        if speech_prob >= threshold and temp_end:
+            temp_end = 0
+
+        if speech_prob >= threshold and not triggered:
+            triggered = True
+            current_speech["start"] = WINDOW_SAMPLES * i
+            continue
+
+        if speech_prob < neg_threshold and triggered:
+            if not temp_end:
+                temp_end = WINDOW_SAMPLES * i
+            if WINDOW_SAMPLES * i - temp_end < min_silence_samples:
+                continue
+            current_speech["end"] = temp_end
+            if current_speech["end"] - current_speech["start"] > min_speech_samples:
+                speeches.append(current_speech)
+            current_speech = {}
+            temp_end = 0
+            triggered = False
+
+    if current_speech and audio_length_samples - current_speech["start"] > min_speech_samples:
+        current_speech["end"] = audio_length_samples
+        speeches.append(current_speech)
+
+    for i, speech in enumerate(speeches):
+        if i == 0:
+            speech["start"] = int(max(0, speech["start"] - speech_pad_samples))
+        if i != len(speeches) - 1:
+            silence_duration = speeches[i + 1]["start"] - speech["end"]
+            if silence_duration < 2 * speech_pad_samples:
+                speech["end"] += int(silence_duration // 2)
+                speeches[i + 1]["start"] = int(max(0, speeches[i + 1]["start"] - silence_duration // 2))
+            else:
+                speech["end"] = int(min(audio_length_samples, speech["end"] + speech_pad_samples))
+                speeches[i + 1]["start"] = int(max(0, speeches[i + 1]["start"] - speech_pad_samples))
+        else:
+            speech["end"] = int(min(audio_length_samples, speech["end"] + speech_pad_samples))
+
+    return speeches
+
+
+class VADResult:
+    """
+    Speech segments of one recording as numpy arrays of seconds.
+
+    Computed once per request (see `AudioContext.vad`) and shared by pause
+    statistics, transcription gating and long-audio chunking.
+    """
+
+    def __init__(self, starts, ends, duration, sample_rate=SAMPLE_RATE):
+        self.starts = np.asarray(starts, dtype=np.float64)
+        self.ends = np.asarray(ends, dtype=np.float64)
+        self.duration = duration
+        self.sample_rate = sample_rate
+
+    @classmethod
+    def from_timestamps(cls, timestamps, total_samples, sample_rate=SAMPLE_RATE):
+        """Build from Silero-style {"start", "end"} sample indices."""
+        starts = np.fromiter((t["start"] for t in timestamps), dtype=np.float64, count=len(timestamps))
+        ends = np.fromiter((t["end"] for t in timestamps), dtype=np.float64, count=len(timestamps))
+        return cls(starts / sample_rate, ends / sample_rate, total_samples / sample_rate, sample_rate)
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def speech_time(self):
+        return float(np.sum(self.ends - self.starts))
+
+    @property
+    def pause_time(self):
+        return max(self.duration - self.speech_time, 0)
+
+    @property
+    def pause_ratio(self):
+        return self.pause_time / self.duration if self.duration > 0 else 0
+
+    def to_timestamps(self):
+        """Silero-style list of {"start", "end"} sample indices."""
+        starts = np.round(self.starts * self.sample_rate).astype(np.int64).tolist()
+        ends = np.round(self.ends * self.sample_rate).astype(np.int64).tolist()
+        return [{"start": s, "end": e} for s, e in zip(starts, ends)]
+
+    def clip_timestamps(self, max_duration=30.0, pad=0.2):
+        """
+        Group consecutive speech segments into clips of at most `max_duration`
+        seconds (splitting longer segments), each padded by `pad` seconds.
+        Returns [{"start", "end"}] in seconds, the shape faster-whisper's
+        batched pipeline accepts as `clip_timestamps`.
+        """
+        clips = []
+        for start, end in zip(self.starts.tolist(), self.ends.tolist()):
+            start = max(0.0, start - pad)
+            end = min(self.duration, end + pad)
+            if clips and end - clips[-1]["start"] <= max_duration:
+                clips[-1]["end"] = max(clips[-1]["end"], end)
+                continue
+            if clips:
+                start = max(start, clips[-1]["end"])
+            while end - start > max_duration:
+                clips.append({"start": start, "end": start + max_duration})
+                start += max_duration
+            clips.append({"start": start, "end": end})
+        return clips
+
+
+class VADEngine:
+    """Persistent Silero VAD session shared across requests."""
+
+    def __init__(self, backend=VAD_BACKEND, threads=VAD_THREADS):
+        self.backend = backend
+        if backend == "onnx":
+            try:
+                self._model = _OnnxSilero(threads)
+            except ImportError as e:
+                logger.warning(f"onnxruntime unavailable ({e}), using TorchScript Silero VAD")
+                self.backend = "jit"
+        if self.backend == "jit":
+            # torch's intra-op pool is process-wide; the thread governor caps it
+            self._model = _JitSilero()
+
+    def speech_timestamps(self, audio):
+        """
+        Speech segments of 16 kHz mono audio.
+
+        Returns:
+            List of {"start", "end"} sample indices, as Silero's
+            get_speech_timestamps returns them.
+        """
+        audio = np.asarray(audio, dtype=np.float32)
+        if len(audio) == 0:
+            return []
+
+        # Silero VAD expects values in [-1, 1] range
+        peak = np.abs(audio).max()
+        if peak > 1.0:
+            audio = audio / peak
+
+        pad = -len(audio) % WINDOW_SAMPLES
+        padded = np.pad(audio, (0, pad)) if pad else audio
+        probs = self._model.speech_probs(padded)
+        return _probs_to_timestamps(probs, len(audio))
+
+    def analyze(self, audio):
+        """Speech segments of 16 kHz mono audio as a `VADResult`."""
+        return VADResult.from_timestamps(self.speech_timestamps(audio), len(audio))
+
+
+# Singleton instance for easy access
+_engine_instance = None
+_engine_lock = threading.Lock()
+
+
+def get_vad_engine():
+    """Get or create the shared VAD engine."""
+    global _engine_instance
+    with _engine_lock:
+        if _engine_instance is None:
+            _engine_instance = VADEngine()
+    return _engine_instance
@@ -20,3 +20,102 @@ export async function analyzeAudio(file: File) {
   }
   return res.json();
 }
+
+/**
+ * Two-tier analysis: `onResult` is called with previews (the fast model's
+ * transcript so far and preliminary metrics) as they grow, then with the
+ * full analysis. Each result's `tiers` field marks which tier every field
+ * came from.
+ */
+export async function analyzeAudioTiered(
+  file: File,
+  onResult: (result: Record<string, unknown>) => void
+) {
+  const formData = new FormData();
+  formData.append("file", file);
+
+  const res = await fetch("http://127.0.0.1:8000/analyze/tiered", {
+    method: "POST",
+    body: formData,
+  });
+
+  if (!res.ok || !res.body) {
+    throw new Error(`Analysis failed (HTTP ${res.status}: ${res.statusText})`);
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let last: Record<string, unknown> | null = null;
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let newline = buffer.indexOf("\n");
+    while (newline !== -1) {
+      const line = buffer.slice(0, newline).trim();
+      buffer = buffer.slice(newline + 1);
+      if (line) {
+        const result = JSON.parse(line);
+        if (result.error) throw new Error(result.error);
+        last = result;
+        onResult(result);
+      }
+      newline = buffer.indexOf("\n");
+    }
+  }
+  return last;
+}
+
+/**
+ * Analysis with a streamed report: `onAnalysis` is called once with every
+ * result field except `final_report`, then `onToken` with each piece of the
+ * report as the LLM writes it. Resolves with the validated final report.
+ * If the LLM failed mid-report the tokens stop short and the resolved report
+ * is the complete fallback report, to be shown in place of the tokens.
+ */
+export async function analyzeAudioStream(
+  file: File,
+  onAnalysis: (result: Record<string, unknown>) => void,
+  onToken: (text: string) => void
+): Promise<string> {
+  const formData = new FormData();
+  formData.append("file", file);
+
+  const res = await fetch("http://127.0.0.1:8000/analyze/stream", {
+    method: "POST",
+    body: formData,
+  });
+
+  if (!res.ok || !res.body) {
+    throw new Error(`Analysis failed (HTTP ${res.status}: ${res.statusText})`);
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let report = "";
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let newline = buffer.indexOf("\n");
+    while (newline !== -1) {
+      const line = buffer.slice(0, newline).trim();
+      buffer = buffer.slice(newline + 1);
+      if (line) {
+        const { type, ...event } = JSON.parse(line);
+        if (type === "error") throw new Error(event.detail);
+        if (type === "analysis") onAnalysis(event);
+        if (type === "token") onToken(event.text);
+        if (type === "report") report = event.final_report;
+      }
+      newline = buffer.indexOf("\n");
+    }
+  }
+  return report;
+}
@@ -6,6 +6,17 @@ export interface SpeechMetrics {
   [key: string]: number | string | undefined;
 }
 
+export interface ProsodyWindows {
+  window_sec: number;
+  start: number[];
+  loudness: (number | null)[];
+  pitch_mean: (number | null)[];
+  pitch_std: (number | null)[];
+  jitter: (number | null)[];
+  shimmer: (number | null)[];
+  pause_ratio: (number | null)[];
+}
+
 export interface AgentResult {
   analysis?: string;
   findings?: string;
@@ -19,5 +30,6 @@ export interface AnalysisResult {
   confidence_label: string;
   final_report: string;
   speech_metrics: SpeechMetrics;
+  prosody?: ProsodyWindows;
   agent_results: Record<string, AgentResult | string>;
 }